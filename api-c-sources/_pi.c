@@ -28,8 +28,13 @@
 #if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
 #  ifdef _MSC_VER
 #    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
-#      define Py_LIMITED_API
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
 #    endif
+
 #    include <pyconfig.h>
      /* sanity-check: Py_LIMITED_API will cause crashes if any of these
         are also defined.  Normally, the Python file PC/pyconfig.h does not
@@ -49,7 +54,11 @@
 #  else
 #    include <pyconfig.h>
 #    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
-#      define Py_LIMITED_API
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
 #    endif
 #  endif
 #endif
@@ -59,6 +68,9 @@
 extern "C" {
 #endif
 #include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
 
 /* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
    beginning of C sources generated by CFFI's ffi.set_source(). */
@@ -308,13 +320,9 @@ static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
 #ifndef PYPY_VERSION
 
 
-#if PY_MAJOR_VERSION >= 3
-# define PyInt_FromLong PyLong_FromLong
-#endif
-
 #define _cffi_from_c_double PyFloat_FromDouble
 #define _cffi_from_c_float PyFloat_FromDouble
-#define _cffi_from_c_long PyInt_FromLong
+#define _cffi_from_c_long PyLong_FromLong
 #define _cffi_from_c_ulong PyLong_FromUnsignedLong
 #define _cffi_from_c_longlong PyLong_FromLongLong
 #define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
@@ -326,12 +334,12 @@ static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
 #define _cffi_from_c_int(x, type)                                        \
     (((type)-1) > 0 ? /* unsigned */                                     \
         (sizeof(type) < sizeof(long) ?                                   \
-            PyInt_FromLong((long)x) :                                    \
+            PyLong_FromLong((long)x) :                                   \
          sizeof(type) == sizeof(long) ?                                  \
             PyLong_FromUnsignedLong((unsigned long)x) :                  \
             PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
         (sizeof(type) <= sizeof(long) ?                                  \
-            PyInt_FromLong((long)x) :                                    \
+            PyLong_FromLong((long)x) :                                   \
             PyLong_FromLongLong((long long)x)))
 
 #define _cffi_to_c_int(o, type)                                          \
@@ -577,12 +585,173 @@ static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
 /************************************************************/
 
 static void *_cffi_types[] = {
-/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 3), // float()(int)
-/*  1 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
-/*  2 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
-/*  3 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 13), // float
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 29), // double()(int64_t, int, uint64_t)
+/*  1 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23), // int64_t
+/*  2 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/*  3 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24), // uint64_t
+/*  4 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  5 */ _CFFI_OP(_CFFI_OP_FUNCTION, 29), // double()(pi_estimator const *)
+/*  6 */ _CFFI_OP(_CFFI_OP_POINTER, 84), // pi_estimator const *
+/*  7 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  8 */ _CFFI_OP(_CFFI_OP_FUNCTION, 83), // float()(int)
+/*  9 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 10 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 11 */ _CFFI_OP(_CFFI_OP_FUNCTION, 83), // float()(int, uint64_t)
+/* 12 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 13 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 14 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 15 */ _CFFI_OP(_CFFI_OP_FUNCTION, 2), // int()(int64_t, char *, size_t)
+/* 16 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 17 */ _CFFI_OP(_CFFI_OP_POINTER, 82), // char *
+/* 18 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28), // size_t
+/* 19 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 20 */ _CFFI_OP(_CFFI_OP_FUNCTION, 1), // int64_t()(int64_t, double *, double *, uint8_t *, pi_sampler *)
+/* 21 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 22 */ _CFFI_OP(_CFFI_OP_POINTER, 29), // double *
+/* 23 */ _CFFI_OP(_CFFI_OP_NOOP, 22),
+/* 24 */ _CFFI_OP(_CFFI_OP_POINTER, 89), // uint8_t *
+/* 25 */ _CFFI_OP(_CFFI_OP_POINTER, 87), // pi_sampler *
+/* 26 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 27 */ _CFFI_OP(_CFFI_OP_FUNCTION, 85), // pi_interval()(pi_estimator const *, double)
+/* 28 */ _CFFI_OP(_CFFI_OP_NOOP, 6),
+/* 29 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14), // double
+/* 30 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 31 */ _CFFI_OP(_CFFI_OP_FUNCTION, 86), // pi_result()(int64_t)
+/* 32 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 33 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 34 */ _CFFI_OP(_CFFI_OP_FUNCTION, 86), // pi_result()(int64_t, pi_qmc_sequence, int, uint64_t)
+/* 35 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 36 */ _CFFI_OP(_CFFI_OP_ENUM, 0), // pi_qmc_sequence
+/* 37 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 38 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 39 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 40 */ _CFFI_OP(_CFFI_OP_FUNCTION, 86), // pi_result()(int64_t, uint64_t)
+/* 41 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 42 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 43 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 44 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // pi_until_result()(double, double, int64_t)
+/* 45 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14),
+/* 46 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14),
+/* 47 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 48 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 49 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // pi_until_result()(double, double, int64_t, uint64_t)
+/* 50 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14),
+/* 51 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14),
+/* 52 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 53 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 54 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 55 */ _CFFI_OP(_CFFI_OP_FUNCTION, 90), // void()(int64_t const *, double *, size_t)
+/* 56 */ _CFFI_OP(_CFFI_OP_POINTER, 1), // int64_t const *
+/* 57 */ _CFFI_OP(_CFFI_OP_NOOP, 22),
+/* 58 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 59 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 60 */ _CFFI_OP(_CFFI_OP_FUNCTION, 90), // void()(int64_t const *, double *, size_t, uint64_t)
+/* 61 */ _CFFI_OP(_CFFI_OP_NOOP, 56),
+/* 62 */ _CFFI_OP(_CFFI_OP_NOOP, 22),
+/* 63 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 64 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 65 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 66 */ _CFFI_OP(_CFFI_OP_FUNCTION, 90), // void()(pi_estimator *, int64_t)
+/* 67 */ _CFFI_OP(_CFFI_OP_POINTER, 84), // pi_estimator *
+/* 68 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23),
+/* 69 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 70 */ _CFFI_OP(_CFFI_OP_FUNCTION, 90), // void()(pi_estimator *, pi_estimator const *)
+/* 71 */ _CFFI_OP(_CFFI_OP_NOOP, 67),
+/* 72 */ _CFFI_OP(_CFFI_OP_NOOP, 6),
+/* 73 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 74 */ _CFFI_OP(_CFFI_OP_FUNCTION, 90), // void()(pi_estimator *, uint64_t)
+/* 75 */ _CFFI_OP(_CFFI_OP_NOOP, 67),
+/* 76 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 77 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 78 */ _CFFI_OP(_CFFI_OP_FUNCTION, 90), // void()(pi_sampler *, uint64_t)
+/* 79 */ _CFFI_OP(_CFFI_OP_NOOP, 25),
+/* 80 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24),
+/* 81 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 82 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 83 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 13), // float
+/* 84 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // pi_estimator
+/* 85 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // pi_interval
+/* 86 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // pi_result
+/* 87 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 3), // pi_sampler
+/* 88 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 4), // pi_until_result
+/* 89 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 18), // uint8_t
+/* 90 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
 };
 
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_typedef_pi_estimator(pi_estimator *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->hits) | 0);  /* check that 'pi_estimator.hits' is an integer */
+  (void)((p->samples) | 0);  /* check that 'pi_estimator.samples' is an integer */
+  (void)((p->seed) | 0);  /* check that 'pi_estimator.seed' is an integer */
+  (void)((p->streams) | 0);  /* check that 'pi_estimator.streams' is an integer */
+}
+struct _cffi_align_typedef_pi_estimator { char x; pi_estimator y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_typedef_pi_interval(pi_interval *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { double *tmp = &p->estimate; (void)tmp; }
+  { double *tmp = &p->half_width; (void)tmp; }
+  { double *tmp = &p->low; (void)tmp; }
+  { double *tmp = &p->high; (void)tmp; }
+}
+struct _cffi_align_typedef_pi_interval { char x; pi_interval y; };
+
+static int _cffi_const_PI_QMC_SOBOL(unsigned long long *o)
+{
+  int n = (PI_QMC_SOBOL) <= 0;
+  *o = (unsigned long long)((PI_QMC_SOBOL) | 0);  /* check that PI_QMC_SOBOL is an integer */
+  return n;
+}
+
+static int _cffi_const_PI_QMC_HALTON(unsigned long long *o)
+{
+  int n = (PI_QMC_HALTON) <= 0;
+  *o = (unsigned long long)((PI_QMC_HALTON) | 0);  /* check that PI_QMC_HALTON is an integer */
+  return n;
+}
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_typedef_pi_result(pi_result *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->hits) | 0);  /* check that 'pi_result.hits' is an integer */
+  (void)((p->samples) | 0);  /* check that 'pi_result.samples' is an integer */
+  { double *tmp = &p->estimate; (void)tmp; }
+}
+struct _cffi_align_typedef_pi_result { char x; pi_result y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_typedef_pi_sampler(pi_sampler *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->s0) | 0);  /* check that 'pi_sampler.s0' is an integer */
+  (void)((p->s1) | 0);  /* check that 'pi_sampler.s1' is an integer */
+  (void)((p->hits) | 0);  /* check that 'pi_sampler.hits' is an integer */
+  (void)((p->samples) | 0);  /* check that 'pi_sampler.samples' is an integer */
+}
+struct _cffi_align_typedef_pi_sampler { char x; pi_sampler y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_typedef_pi_until_result(pi_until_result *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->hits) | 0);  /* check that 'pi_until_result.hits' is an integer */
+  (void)((p->samples) | 0);  /* check that 'pi_until_result.samples' is an integer */
+  { double *tmp = &p->estimate; (void)tmp; }
+  { double *tmp = &p->half_width; (void)tmp; }
+  (void)((p->converged) | 0);  /* check that 'pi_until_result.converged' is an integer */
+}
+struct _cffi_align_typedef_pi_until_result { char x; pi_until_result y; };
+
 static float _cffi_d_pi_approx(int x0)
 {
   return pi_approx(x0);
@@ -613,23 +782,1073 @@ _cffi_f_pi_approx(PyObject *self, PyObject *arg0)
 #  define _cffi_f_pi_approx _cffi_d_pi_approx
 #endif
 
+static pi_result _cffi_d_pi_approx64(int64_t x0)
+{
+  return pi_approx64(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx64(PyObject *self, PyObject *arg0)
+{
+  int64_t x0;
+  pi_result result;
+  PyObject *pyresult;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx64(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(86));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx64(pi_result *result, int64_t x0)
+{
+  { *result = pi_approx64(x0); }
+}
+#endif
+
+static pi_result _cffi_d_pi_approx64_seeded(int64_t x0, uint64_t x1)
+{
+  return pi_approx64_seeded(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx64_seeded(PyObject *self, PyObject *args)
+{
+  int64_t x0;
+  uint64_t x1;
+  pi_result result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx64_seeded", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, uint64_t);
+  if (x1 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx64_seeded(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(86));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx64_seeded(pi_result *result, int64_t x0, uint64_t x1)
+{
+  { *result = pi_approx64_seeded(x0, x1); }
+}
+#endif
+
+static void _cffi_d_pi_approx_batch(int64_t const * x0, double * x1, size_t x2)
+{
+  pi_approx_batch(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_batch(PyObject *self, PyObject *args)
+{
+  int64_t const * x0;
+  double * x1;
+  size_t x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_batch", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(56), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (int64_t const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(56), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { pi_approx_batch(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_pi_approx_batch _cffi_d_pi_approx_batch
+#endif
+
+static void _cffi_d_pi_approx_batch_seeded(int64_t const * x0, double * x1, size_t x2, uint64_t x3)
+{
+  pi_approx_batch_seeded(x0, x1, x2, x3);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_batch_seeded(PyObject *self, PyObject *args)
+{
+  int64_t const * x0;
+  double * x1;
+  size_t x2;
+  uint64_t x3;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_batch_seeded", 4, 4, &arg0, &arg1, &arg2, &arg3))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(56), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (int64_t const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(56), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, uint64_t);
+  if (x3 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { pi_approx_batch_seeded(x0, x1, x2, x3); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_pi_approx_batch_seeded _cffi_d_pi_approx_batch_seeded
+#endif
+
+static pi_result _cffi_d_pi_approx_for(int64_t x0)
+{
+  return pi_approx_for(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_for(PyObject *self, PyObject *arg0)
+{
+  int64_t x0;
+  pi_result result;
+  PyObject *pyresult;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_for(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(86));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx_for(pi_result *result, int64_t x0)
+{
+  { *result = pi_approx_for(x0); }
+}
+#endif
+
+static pi_result _cffi_d_pi_approx_for_seeded(int64_t x0, uint64_t x1)
+{
+  return pi_approx_for_seeded(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_for_seeded(PyObject *self, PyObject *args)
+{
+  int64_t x0;
+  uint64_t x1;
+  pi_result result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_for_seeded", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, uint64_t);
+  if (x1 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_for_seeded(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(86));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx_for_seeded(pi_result *result, int64_t x0, uint64_t x1)
+{
+  { *result = pi_approx_for_seeded(x0, x1); }
+}
+#endif
+
+static double _cffi_d_pi_approx_parallel(int64_t x0, int x1, uint64_t x2)
+{
+  return pi_approx_parallel(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_parallel(PyObject *self, PyObject *args)
+{
+  int64_t x0;
+  int x1;
+  uint64_t x2;
+  double result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_parallel", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, int);
+  if (x1 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, uint64_t);
+  if (x2 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_parallel(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_double(result);
+  return pyresult;
+}
+#else
+#  define _cffi_f_pi_approx_parallel _cffi_d_pi_approx_parallel
+#endif
+
+static pi_result _cffi_d_pi_approx_qmc(int64_t x0, pi_qmc_sequence x1, int x2, uint64_t x3)
+{
+  return pi_approx_qmc(x0, x1, x2, x3);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_qmc(PyObject *self, PyObject *args)
+{
+  int64_t x0;
+  pi_qmc_sequence x1;
+  int x2;
+  uint64_t x3;
+  pi_result result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_qmc", 4, 4, &arg0, &arg1, &arg2, &arg3))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  if (_cffi_to_c((char *)&x1, _cffi_type(36), arg1) < 0)
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, int);
+  if (x2 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, uint64_t);
+  if (x3 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_qmc(x0, x1, x2, x3); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(86));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx_qmc(pi_result *result, int64_t x0, pi_qmc_sequence x1, int x2, uint64_t x3)
+{
+  { *result = pi_approx_qmc(x0, x1, x2, x3); }
+}
+#endif
+
+static float _cffi_d_pi_approx_seeded(int x0, uint64_t x1)
+{
+  return pi_approx_seeded(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_seeded(PyObject *self, PyObject *args)
+{
+  int x0;
+  uint64_t x1;
+  float result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_seeded", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, uint64_t);
+  if (x1 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_seeded(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_float(result);
+  return pyresult;
+}
+#else
+#  define _cffi_f_pi_approx_seeded _cffi_d_pi_approx_seeded
+#endif
+
+static pi_until_result _cffi_d_pi_approx_until(double x0, double x1, int64_t x2)
+{
+  return pi_approx_until(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_until(PyObject *self, PyObject *args)
+{
+  double x0;
+  double x1;
+  int64_t x2;
+  pi_until_result result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_until", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  x0 = (double)_cffi_to_c_double(arg0);
+  if (x0 == (double)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = (double)_cffi_to_c_double(arg1);
+  if (x1 == (double)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, int64_t);
+  if (x2 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_until(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(88));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx_until(pi_until_result *result, double x0, double x1, int64_t x2)
+{
+  { *result = pi_approx_until(x0, x1, x2); }
+}
+#endif
+
+static pi_until_result _cffi_d_pi_approx_until_seeded(double x0, double x1, int64_t x2, uint64_t x3)
+{
+  return pi_approx_until_seeded(x0, x1, x2, x3);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_approx_until_seeded(PyObject *self, PyObject *args)
+{
+  double x0;
+  double x1;
+  int64_t x2;
+  uint64_t x3;
+  pi_until_result result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+
+  if (!PyArg_UnpackTuple(args, "pi_approx_until_seeded", 4, 4, &arg0, &arg1, &arg2, &arg3))
+    return NULL;
+
+  x0 = (double)_cffi_to_c_double(arg0);
+  if (x0 == (double)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = (double)_cffi_to_c_double(arg1);
+  if (x1 == (double)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, int64_t);
+  if (x2 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, uint64_t);
+  if (x3 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_approx_until_seeded(x0, x1, x2, x3); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(88));
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_approx_until_seeded(pi_until_result *result, double x0, double x1, int64_t x2, uint64_t x3)
+{
+  { *result = pi_approx_until_seeded(x0, x1, x2, x3); }
+}
+#endif
+
+static void _cffi_d_pi_estimator_add_samples(pi_estimator * x0, int64_t x1)
+{
+  pi_estimator_add_samples(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_estimator_add_samples(PyObject *self, PyObject *args)
+{
+  pi_estimator * x0;
+  int64_t x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_estimator_add_samples", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(67), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (pi_estimator *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(67), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, int64_t);
+  if (x1 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { pi_estimator_add_samples(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_pi_estimator_add_samples _cffi_d_pi_estimator_add_samples
+#endif
+
+static double _cffi_d_pi_estimator_estimate(pi_estimator const * x0)
+{
+  return pi_estimator_estimate(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_estimator_estimate(PyObject *self, PyObject *arg0)
+{
+  pi_estimator const * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  double result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(6), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (pi_estimator const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(6), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_estimator_estimate(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_double(result);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_pi_estimator_estimate _cffi_d_pi_estimator_estimate
+#endif
+
+static void _cffi_d_pi_estimator_init(pi_estimator * x0, uint64_t x1)
+{
+  pi_estimator_init(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_estimator_init(PyObject *self, PyObject *args)
+{
+  pi_estimator * x0;
+  uint64_t x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_estimator_init", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(67), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (pi_estimator *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(67), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, uint64_t);
+  if (x1 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { pi_estimator_init(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_pi_estimator_init _cffi_d_pi_estimator_init
+#endif
+
+static pi_interval _cffi_d_pi_estimator_interval(pi_estimator const * x0, double x1)
+{
+  return pi_estimator_interval(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_estimator_interval(PyObject *self, PyObject *args)
+{
+  pi_estimator const * x0;
+  double x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  pi_interval result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_estimator_interval", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(6), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (pi_estimator const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(6), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = (double)_cffi_to_c_double(arg1);
+  if (x1 == (double)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_estimator_interval(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_struct((char *)&result, _cffi_type(85));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+static void _cffi_f_pi_estimator_interval(pi_interval *result, pi_estimator const * x0, double x1)
+{
+  { *result = pi_estimator_interval(x0, x1); }
+}
+#endif
+
+static void _cffi_d_pi_estimator_merge(pi_estimator * x0, pi_estimator const * x1)
+{
+  pi_estimator_merge(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_estimator_merge(PyObject *self, PyObject *args)
+{
+  pi_estimator * x0;
+  pi_estimator const * x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_estimator_merge", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(67), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (pi_estimator *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(67), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(6), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (pi_estimator const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(6), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { pi_estimator_merge(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_pi_estimator_merge _cffi_d_pi_estimator_merge
+#endif
+
+static int64_t _cffi_d_pi_sample_points(int64_t x0, double * x1, double * x2, uint8_t * x3, pi_sampler * x4)
+{
+  return pi_sample_points(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_sample_points(PyObject *self, PyObject *args)
+{
+  int64_t x0;
+  double * x1;
+  double * x2;
+  uint8_t * x3;
+  pi_sampler * x4;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int64_t result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "pi_sample_points", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg2, (char **)&x2);
+  if (datasize != 0) {
+    x2 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg2, (char **)&x2,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(24), arg3, (char **)&x3);
+  if (datasize != 0) {
+    x3 = ((size_t)datasize) <= 640 ? (uint8_t *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(24), arg3, (char **)&x3,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(25), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (pi_sampler *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(25), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_sample_points(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int64_t);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_pi_sample_points _cffi_d_pi_sample_points
+#endif
+
+static void _cffi_d_pi_sampler_init(pi_sampler * x0, uint64_t x1)
+{
+  pi_sampler_init(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_sampler_init(PyObject *self, PyObject *args)
+{
+  pi_sampler * x0;
+  uint64_t x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "pi_sampler_init", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(25), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (pi_sampler *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(25), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, uint64_t);
+  if (x1 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { pi_sampler_init(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_pi_sampler_init _cffi_d_pi_sampler_init
+#endif
+
+static int _cffi_d_pi_series_digits(int64_t x0, char * x1, size_t x2)
+{
+  return pi_series_digits(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_pi_series_digits(PyObject *self, PyObject *args)
+{
+  int64_t x0;
+  char * x1;
+  size_t x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "pi_series_digits", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int64_t);
+  if (x0 == (int64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(17), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (char *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(17), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = pi_series_digits(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_pi_series_digits _cffi_d_pi_series_digits
+#endif
+
+static int _cffi_const_PI_SERIES_MAX_DIGITS(unsigned long long *o)
+{
+  int n = (PI_SERIES_MAX_DIGITS) <= 0;
+  *o = (unsigned long long)((PI_SERIES_MAX_DIGITS) | 0);  /* check that PI_SERIES_MAX_DIGITS is an integer */
+  if (!_cffi_check_int(*o, n, 5000000U))
+    n |= 2;
+  return n;
+}
+
 static const struct _cffi_global_s _cffi_globals[] = {
-  { "pi_approx", (void *)_cffi_f_pi_approx, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 0), (void *)_cffi_d_pi_approx },
+  { "PI_QMC_HALTON", (void *)_cffi_const_PI_QMC_HALTON, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PI_QMC_SOBOL", (void *)_cffi_const_PI_QMC_SOBOL, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PI_SERIES_MAX_DIGITS", (void *)_cffi_const_PI_SERIES_MAX_DIGITS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "pi_approx", (void *)_cffi_f_pi_approx, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 8), (void *)_cffi_d_pi_approx },
+  { "pi_approx64", (void *)_cffi_f_pi_approx64, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 31), (void *)_cffi_d_pi_approx64 },
+  { "pi_approx64_seeded", (void *)_cffi_f_pi_approx64_seeded, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 40), (void *)_cffi_d_pi_approx64_seeded },
+  { "pi_approx_batch", (void *)_cffi_f_pi_approx_batch, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 55), (void *)_cffi_d_pi_approx_batch },
+  { "pi_approx_batch_seeded", (void *)_cffi_f_pi_approx_batch_seeded, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 60), (void *)_cffi_d_pi_approx_batch_seeded },
+  { "pi_approx_for", (void *)_cffi_f_pi_approx_for, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 31), (void *)_cffi_d_pi_approx_for },
+  { "pi_approx_for_seeded", (void *)_cffi_f_pi_approx_for_seeded, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 40), (void *)_cffi_d_pi_approx_for_seeded },
+  { "pi_approx_parallel", (void *)_cffi_f_pi_approx_parallel, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 0), (void *)_cffi_d_pi_approx_parallel },
+  { "pi_approx_qmc", (void *)_cffi_f_pi_approx_qmc, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 34), (void *)_cffi_d_pi_approx_qmc },
+  { "pi_approx_seeded", (void *)_cffi_f_pi_approx_seeded, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 11), (void *)_cffi_d_pi_approx_seeded },
+  { "pi_approx_until", (void *)_cffi_f_pi_approx_until, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 44), (void *)_cffi_d_pi_approx_until },
+  { "pi_approx_until_seeded", (void *)_cffi_f_pi_approx_until_seeded, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 49), (void *)_cffi_d_pi_approx_until_seeded },
+  { "pi_estimator_add_samples", (void *)_cffi_f_pi_estimator_add_samples, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 66), (void *)_cffi_d_pi_estimator_add_samples },
+  { "pi_estimator_estimate", (void *)_cffi_f_pi_estimator_estimate, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 5), (void *)_cffi_d_pi_estimator_estimate },
+  { "pi_estimator_init", (void *)_cffi_f_pi_estimator_init, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 74), (void *)_cffi_d_pi_estimator_init },
+  { "pi_estimator_interval", (void *)_cffi_f_pi_estimator_interval, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 27), (void *)_cffi_d_pi_estimator_interval },
+  { "pi_estimator_merge", (void *)_cffi_f_pi_estimator_merge, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 70), (void *)_cffi_d_pi_estimator_merge },
+  { "pi_sample_points", (void *)_cffi_f_pi_sample_points, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 20), (void *)_cffi_d_pi_sample_points },
+  { "pi_sampler_init", (void *)_cffi_f_pi_sampler_init, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 78), (void *)_cffi_d_pi_sampler_init },
+  { "pi_series_digits", (void *)_cffi_f_pi_series_digits, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 15), (void *)_cffi_d_pi_series_digits },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "hits", offsetof(pi_estimator, hits),
+            sizeof(((pi_estimator *)0)->hits),
+            _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "samples", offsetof(pi_estimator, samples),
+               sizeof(((pi_estimator *)0)->samples),
+               _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "seed", offsetof(pi_estimator, seed),
+            sizeof(((pi_estimator *)0)->seed),
+            _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "streams", offsetof(pi_estimator, streams),
+               sizeof(((pi_estimator *)0)->streams),
+               _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "estimate", offsetof(pi_interval, estimate),
+                sizeof(((pi_interval *)0)->estimate),
+                _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "half_width", offsetof(pi_interval, half_width),
+                  sizeof(((pi_interval *)0)->half_width),
+                  _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "low", offsetof(pi_interval, low),
+           sizeof(((pi_interval *)0)->low),
+           _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "high", offsetof(pi_interval, high),
+            sizeof(((pi_interval *)0)->high),
+            _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "hits", offsetof(pi_result, hits),
+            sizeof(((pi_result *)0)->hits),
+            _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "samples", offsetof(pi_result, samples),
+               sizeof(((pi_result *)0)->samples),
+               _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "estimate", offsetof(pi_result, estimate),
+                sizeof(((pi_result *)0)->estimate),
+                _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "s0", offsetof(pi_sampler, s0),
+          sizeof(((pi_sampler *)0)->s0),
+          _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "s1", offsetof(pi_sampler, s1),
+          sizeof(((pi_sampler *)0)->s1),
+          _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "hits", offsetof(pi_sampler, hits),
+            sizeof(((pi_sampler *)0)->hits),
+            _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "samples", offsetof(pi_sampler, samples),
+               sizeof(((pi_sampler *)0)->samples),
+               _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "hits", offsetof(pi_until_result, hits),
+            sizeof(((pi_until_result *)0)->hits),
+            _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "samples", offsetof(pi_until_result, samples),
+               sizeof(((pi_until_result *)0)->samples),
+               _CFFI_OP(_CFFI_OP_NOOP, 1) },
+  { "estimate", offsetof(pi_until_result, estimate),
+                sizeof(((pi_until_result *)0)->estimate),
+                _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "half_width", offsetof(pi_until_result, half_width),
+                  sizeof(((pi_until_result *)0)->half_width),
+                  _CFFI_OP(_CFFI_OP_NOOP, 29) },
+  { "converged", offsetof(pi_until_result, converged),
+                 sizeof(((pi_until_result *)0)->converged),
+                 _CFFI_OP(_CFFI_OP_NOOP, 2) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "$pi_estimator", 84, _CFFI_F_CHECK_FIELDS,
+    sizeof(pi_estimator), offsetof(struct _cffi_align_typedef_pi_estimator, y), 0, 4 },
+  { "$pi_interval", 85, _CFFI_F_CHECK_FIELDS,
+    sizeof(pi_interval), offsetof(struct _cffi_align_typedef_pi_interval, y), 4, 4 },
+  { "$pi_result", 86, _CFFI_F_CHECK_FIELDS,
+    sizeof(pi_result), offsetof(struct _cffi_align_typedef_pi_result, y), 8, 3 },
+  { "$pi_sampler", 87, _CFFI_F_CHECK_FIELDS,
+    sizeof(pi_sampler), offsetof(struct _cffi_align_typedef_pi_sampler, y), 11, 4 },
+  { "$pi_until_result", 88, _CFFI_F_CHECK_FIELDS,
+    sizeof(pi_until_result), offsetof(struct _cffi_align_typedef_pi_until_result, y), 15, 5 },
+};
+
+static const struct _cffi_enum_s _cffi_enums[] = {
+  { "$pi_qmc_sequence", 36, _cffi_prim_int(sizeof(pi_qmc_sequence), ((pi_qmc_sequence)-1) <= 0),
+    "PI_QMC_SOBOL,PI_QMC_HALTON" },
+};
+
+static const struct _cffi_typename_s _cffi_typenames[] = {
+  { "pi_estimator", 84 },
+  { "pi_interval", 85 },
+  { "pi_qmc_sequence", 36 },
+  { "pi_result", 86 },
+  { "pi_sampler", 87 },
+  { "pi_until_result", 88 },
 };
 
 static const struct _cffi_type_context_s _cffi_type_context = {
   _cffi_types,
   _cffi_globals,
-  NULL,  /* no fields */
-  NULL,  /* no struct_unions */
-  NULL,  /* no enums */
-  NULL,  /* no typenames */
-  1,  /* num_globals */
-  0,  /* num_struct_unions */
-  0,  /* num_enums */
-  0,  /* num_typenames */
+  _cffi_fields,
+  _cffi_struct_unions,
+  _cffi_enums,
+  _cffi_typenames,
+  23,  /* num_globals */
+  5,  /* num_struct_unions */
+  1,  /* num_enums */
+  6,  /* num_typenames */
   NULL,  /* no includes */
-  4,  /* num_types */
+  91,  /* num_types */
   0,  /* flags */
 };
 
@@ -643,30 +1862,18 @@ _cffi_pypyinit__pi(const void *p[])
 {
     p[0] = (const void *)0x2601;
     p[1] = &_cffi_type_context;
-#if PY_MAJOR_VERSION >= 3
     return NULL;
-#endif
 }
 #  ifdef _MSC_VER
      PyMODINIT_FUNC
-#  if PY_MAJOR_VERSION >= 3
      PyInit__pi(void) { return NULL; }
-#  else
-     init_pi(void) { }
-#  endif
 #  endif
-#elif PY_MAJOR_VERSION >= 3
+#else
 PyMODINIT_FUNC
 PyInit__pi(void)
 {
   return _cffi_init("_pi", 0x2601, &_cffi_type_context);
 }
-#else
-PyMODINIT_FUNC
-init_pi(void)
-{
-  _cffi_init("_pi", 0x2601, &_cffi_type_context);
-}
 #endif
 
 #ifdef __GNUC__
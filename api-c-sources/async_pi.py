@@ -0,0 +1,173 @@
+"""
+asyncio front end for the Pi approximation C extensions.
+A long estimate is split into bounded chunks that run on an executor, so
+the event loop stays responsive, progress can be reported, and a cancelled
+task stops at the next chunk boundary instead of running to the end.
+For requests with a latency budget, pi_approx_within samples for as long
+as the budget allows instead of for a fixed n.
+"""
+
+import asyncio
+import secrets
+import time
+from collections import namedtuple
+
+from distributed_pi import chunk_seed
+
+AsyncProgress = namedtuple("AsyncProgress", ["hits", "samples", "total", "estimate"])
+BudgetResult = namedtuple("BudgetResult", ["hits", "samples", "estimate", "elapsed"])
+
+
+def _default_lib():
+    from _pi import lib
+    return lib
+
+
+def _run_chunk(lib, n, seed):
+    return lib.pi_approx64_seeded(n, seed).hits
+
+
+async def iter_pi_approx(n, chunk_size=1_000_000, seed=None, executor=None,
+                         concurrency=1, limiter=None, lib=None):
+    """Asynchronously yield an AsyncProgress snapshot after every chunk.
+
+    Each chunk is one pi_approx64_seeded call of at most chunk_size
+    samples, run with loop.run_in_executor on executor (the loop's
+    default thread pool when None; CFFI releases the GIL during the
+    call). At most concurrency chunks of this run are in flight at a
+    time, and limiter, an asyncio.Semaphore shared between requests,
+    caps the number of chunks running across all of them. lib selects
+    the extension, e.g. _pi.lib or _pi_cffi.lib; any module exposing
+    pi_approx64_seeded works. Chunk i is seeded from (seed, i), so a run
+    with the same seed and chunk_size is reproducible.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if lib is None:
+        lib = _default_lib()
+    if seed is None:
+        seed = secrets.randbits(64)
+
+    loop = asyncio.get_running_loop()
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+
+    async def run(index, size):
+        if limiter is None:
+            return await loop.run_in_executor(executor, _run_chunk, lib, size, chunk_seed(seed, index))
+        async with limiter:
+            return await loop.run_in_executor(executor, _run_chunk, lib, size, chunk_seed(seed, index))
+
+    pending = {}
+    next_index = 0
+    hits = 0
+    done = 0
+    try:
+        while next_index < len(sizes) or pending:
+            while next_index < len(sizes) and len(pending) < concurrency:
+                task = asyncio.ensure_future(run(next_index, sizes[next_index]))
+                pending[task] = sizes[next_index]
+                next_index += 1
+
+            finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                hits += task.result()
+                done += pending.pop(task)
+            yield AsyncProgress(hits, done, n, 4 * hits / done)
+    finally:
+        # Cancellation (or an early exit) lands here between chunks: drop
+        # the chunks that have not finished yet
+        for task in pending:
+            task.cancel()
+
+
+async def pi_approx_async(n, chunk_size=1_000_000, seed=None, executor=None,
+                          concurrency=1, limiter=None, lib=None, progress=None):
+    """Estimate Pi from n samples without blocking the event loop.
+
+    Takes the same arguments as iter_pi_approx, plus progress, a callable
+    invoked with each AsyncProgress snapshot. Returns the final snapshot,
+    whose hits and samples are exact.
+    """
+    result = None
+    async for result in iter_pi_approx(n, chunk_size, seed, executor, concurrency, limiter, lib):
+        if progress is not None:
+            progress(result)
+    return result
+
+
+def _run_for(lib, deadline_ns, seed):
+    # The C budget is what is left of the deadline when the executor gets
+    # to the call, so time spent queued counts against it
+    return lib.pi_approx_for_seeded(deadline_ns - time.monotonic_ns(), seed)
+
+
+async def pi_approx_within(budget, seed=None, executor=None, limiter=None, lib=None):
+    """Best estimate of Pi that fits in budget seconds.
+
+    One pi_approx_for_seeded call samples on executor until the deadline,
+    which is fixed when the coroutine starts: waiting for limiter (an
+    asyncio.Semaphore shared between requests) or for a free executor
+    thread uses up budget too. Returns a BudgetResult with the exact hits
+    and samples and the elapsed seconds; samples is 0 (and the estimate
+    0.0) if the budget was gone before sampling could start. lib must be
+    _pi.lib (the default): the main-mode libraries have no
+    pi_approx_for_seeded, and TypeError is raised for them. How many
+    samples fit depends on timing, so unlike the other entry points a seed
+    does not make the result reproducible.
+    """
+    if budget < 0:
+        raise ValueError("budget must be non-negative")
+    start = time.monotonic_ns()
+    deadline = start + int(budget * 1e9)
+    if lib is None:
+        lib = _default_lib()
+    if not hasattr(lib, "pi_approx_for_seeded"):
+        raise TypeError("lib has no pi_approx_for_seeded; only the _pi extension supports latency budgets")
+    if seed is None:
+        seed = secrets.randbits(64)
+
+    loop = asyncio.get_running_loop()
+    if limiter is None:
+        result = await loop.run_in_executor(executor, _run_for, lib, deadline, seed)
+    else:
+        async with limiter:
+            result = await loop.run_in_executor(executor, _run_for, lib, deadline, seed)
+    return BudgetResult(result.hits, result.samples, result.estimate, (time.monotonic_ns() - start) / 1e9)
+
+
+async def _demo():
+    print("Async Pi Approximation")
+    print("=" * 40)
+
+    def report(snapshot):
+        print(f"  {snapshot.samples:>11,} / {snapshot.total:,} samples | Pi ≈ {snapshot.estimate:.6f}")
+
+    result = await pi_approx_async(20_000_000, chunk_size=4_000_000, seed=42, progress=report)
+    print(f"Final: Pi ≈ {result.estimate:.9f} from {result.samples:,} samples")
+
+    # A latency budget instead of a sample count: accuracy grows with it
+    for budget in (0.001, 0.01, 0.1):
+        result = await pi_approx_within(budget, seed=42)
+        print(f"Budget {budget * 1000:5.0f} ms: Pi ≈ {result.estimate:.6f} from {result.samples:>10,} samples "
+              f"in {result.elapsed * 1000:.1f} ms")
+
+    # A task can be cancelled while it runs; it stops after the current chunk
+    task = asyncio.ensure_future(pi_approx_async(10**10, chunk_size=1_000_000))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        print("Long-running estimate cancelled cleanly")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_demo())
+    except ImportError:
+        print("Error: The C extension is not built yet.")
+        print("Please run: python pi_extension_build.py")
@@ -48,6 +48,15 @@ def test_extension():
             
             print(f"{description:12s}: {iterations:6d} iterations → Pi ≈ {approx:.6f} ({accuracy:.2f}% accurate)")
         
+        # Instead of guessing n, let the library sample until the
+        # 95% confidence interval is narrower than the tolerance
+        from _pi.lib import pi_approx_until
+        
+        print("\nAdaptive precision (95% confidence):")
+        for tolerance in [0.01, 0.001]:
+            result = pi_approx_until(tolerance, 0.95, 10**9)
+            print(f"Tolerance {tolerance:6.3f}: Pi ≈ {result.estimate:.6f} ± {result.half_width:.6f} using {result.samples} samples")
+        
         print("✓ All tests completed successfully!")
         return True
         
@@ -0,0 +1,97 @@
+"""
+Process-pool driver for large Pi approximations.
+One estimate is split into fixed-size chunks that run on a
+ProcessPoolExecutor. Each worker calls the compiled _pi extension with its
+own seed and sends back only its integer hit count, which the driver adds
+up exactly.
+"""
+
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DistributedResult = namedtuple("DistributedResult", ["hits", "samples", "estimate", "chunks"])
+
+_MASK64 = (1 << 64) - 1
+
+
+def chunk_seed(master_seed, index):
+    """Derive the seed of chunk index from the master seed (splitmix64)."""
+    z = (master_seed ^ (index * 0xD1B54A32D192ED03)) & _MASK64
+    z = (z + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _count_hits(n, seed):
+    """Worker entry point: run one chunk and return its hit count."""
+    from _pi.lib import pi_approx64_seeded
+    return pi_approx64_seeded(n, seed).hits
+
+
+def estimate_pi(n, chunk_size=10_000_000, workers=None, seed=0, progress=None, executor=None):
+    """Estimate Pi from n samples spread over a pool of processes.
+
+    n is split into chunks of chunk_size samples (the last one may be
+    shorter); chunk i is seeded from (seed, i), so the result depends only
+    on n, chunk_size and seed, not on the number of workers or the order
+    in which chunks finish. progress, if given, is called as
+    progress(samples_done, n) after each chunk. An existing executor can
+    be passed in to reuse its processes; otherwise a ProcessPoolExecutor
+    with the given number of workers (default: one per CPU) is created.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            pool.submit(_count_hits, size, chunk_seed(seed, index)): size
+            for index, size in enumerate(sizes)
+        }
+        hits = 0
+        done = 0
+        for future in as_completed(futures):
+            hits += future.result()
+            done += futures[future]
+            if progress is not None:
+                progress(done, n)
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+
+    return DistributedResult(hits, n, 4 * hits / n, len(sizes))
+
+
+def main():
+    print("Distributed Pi Approximation")
+    print("=" * 40)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000_000
+    workers = os.cpu_count()
+
+    def report(done, total):
+        print(f"\r  {done:,} / {total:,} samples ({100 * done / total:5.1f}%)", end="", flush=True)
+
+    start = time.perf_counter()
+    result = estimate_pi(n, chunk_size=10_000_000, seed=42, progress=report)
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(f"Workers: {workers} | Chunks: {result.chunks} | Time: {elapsed:.2f}s")
+    print(f"Hits: {result.hits:,} of {result.samples:,}")
+    print(f"Pi ≈ {result.estimate:.9f} | Error: {abs(result.estimate - 3.141592653589793):.9f}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ImportError:
+        print("Error: The C extension is not built yet.")
+        print("Please run: python pi_extension_build.py")
@@ -1,6 +1,20 @@
 /* filename: pi.c*/
+#if !defined(_WIN32) && !defined(_POSIX_C_SOURCE)
+#define _POSIX_C_SOURCE 200112L
+#endif
+
 #include <stdlib.h>
+#include <string.h>
 #include <math.h>
+#include "pi.h"
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <pthread.h>
+#include <time.h>
+#include <unistd.h>
+#endif
 
 /* Returns a very crude approximation of Pi
    given a int: a number of iteration */
@@ -17,3 +31,602 @@ float pi_approx(int n){
       sum++; }
 
   return 4*(float)sum/(float)n; }
+
+/* Private xorshift128+ generator.  Each call keeps its own state on the
+   stack, so concurrent callers never share (or lock) libc's rand(). */
+typedef struct { uint64_t s0, s1; } pi_rng;
+
+static uint64_t splitmix64(uint64_t *x){
+
+  uint64_t z = (*x += 0x9E3779B97F4A7C15ULL);
+  z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+  z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+  return z ^ (z >> 31); }
+
+static void pi_rng_seed(pi_rng *r, uint64_t seed){
+
+  r->s0 = splitmix64(&seed);
+  r->s1 = splitmix64(&seed); }
+
+static uint64_t pi_rng_next(pi_rng *r){
+
+  uint64_t s1 = r->s0;
+  const uint64_t s0 = r->s1;
+  r->s0 = s0;
+  s1 ^= s1 << 23;
+  r->s1 = s1 ^ s0 ^ (s1 >> 17) ^ (s0 >> 26);
+  return r->s1 + s0; }
+
+/* Uniform double in [0, 1) taken from the top 52 bits */
+static double pi_rng_unit(pi_rng *r){
+
+  uint64_t bits = (pi_rng_next(r) >> 12) | 0x3FF0000000000000ULL;
+  double d;
+  memcpy(&d, &bits, sizeof d);
+  return d - 1.0; }
+
+/* Counts the points of the unit square that land inside the quarter
+   circle; comparing x*x+y*y against 1 needs no sqrt */
+static int64_t pi_count_hits(pi_rng *r, int64_t n){
+
+  int64_t i, hits = 0;
+  double x, y;
+
+  for(i=0;i<n;i++){
+
+    x = pi_rng_unit(r);
+    y = pi_rng_unit(r);
+
+    hits += (x*x + y*y < 1.0); }
+
+  return hits; }
+
+/* Reentrant variant of pi_approx: the same seed always gives the same
+   result, and calls from several threads run fully in parallel */
+float pi_approx_seeded(int n, uint64_t seed){
+
+  pi_rng r;
+
+  pi_rng_seed(&r, seed);
+
+  return 4*(float)pi_count_hits(&r, n)/(float)n; }
+
+/* Integer hit and sample counters plus the estimate in full double
+   precision; the counters are exact however large n gets */
+static pi_result pi_make_result(int64_t hits, int64_t n){
+
+  pi_result result;
+
+  result.hits = hits;
+  result.samples = n > 0 ? n : 0;
+  result.estimate = n > 0 ? 4*(double)hits/(double)n : 0.0;
+  return result; }
+
+/* Seed for the unseeded 64-bit entry points.  It is drawn from rand(),
+   so srand() still controls them, with four rand() calls per run
+   instead of two per sample */
+static uint64_t pi_rand_seed(void){
+
+  uint64_t seed = 0;
+  int i;
+
+  for(i=0;i<4;i++)
+    seed = (seed << 16) ^ (uint64_t)rand();
+
+  return seed; }
+
+/* 64-bit counterpart of pi_approx: n is not capped at INT_MAX and the
+   result is neither counted in a double nor rounded to a float */
+pi_result pi_approx64(int64_t n){
+
+  return pi_approx64_seeded(n, pi_rand_seed()); }
+
+pi_result pi_approx64_seeded(int64_t n, uint64_t seed){
+
+  pi_rng r;
+
+  if (n <= 0)
+    return pi_make_result(0, 0);
+
+  pi_rng_seed(&r, seed);
+
+  return pi_make_result(pi_count_hits(&r, n), n); }
+
+/* pi_approx_parallel draws its samples in fixed-size blocks, each with
+   its own stream seeded from (seed, block index).  The estimate therefore
+   depends only on n and seed, never on how many threads shared the work */
+#define PI_BLOCK_SIZE 1048576
+#define PI_MAX_THREADS 256
+
+typedef struct {
+  uint64_t seed;
+  int64_t n;
+  int64_t first_block, block_step;
+  int64_t hits;
+} pi_worker;
+
+static uint64_t pi_block_seed(uint64_t seed, int64_t block){
+
+  uint64_t x = seed ^ ((uint64_t)block * 0xD1B54A32D192ED03ULL);
+  return splitmix64(&x); }
+
+static void pi_worker_run(pi_worker *w){
+
+  int64_t b, len, nblocks = (w->n + PI_BLOCK_SIZE - 1) / PI_BLOCK_SIZE;
+  pi_rng r;
+
+  w->hits = 0;
+
+  for(b=w->first_block;b<nblocks;b+=w->block_step){
+
+    len = w->n - b*PI_BLOCK_SIZE;
+    if (len > PI_BLOCK_SIZE)
+      len = PI_BLOCK_SIZE;
+
+    pi_rng_seed(&r, pi_block_seed(w->seed, b));
+    w->hits += pi_count_hits(&r, len); } }
+
+#ifdef _WIN32
+static DWORD WINAPI pi_worker_main(LPVOID arg){
+
+  pi_worker_run((pi_worker *)arg);
+  return 0; }
+
+static int pi_cpu_count(void){
+
+  SYSTEM_INFO info;
+  GetSystemInfo(&info);
+  return (int)info.dwNumberOfProcessors; }
+#else
+static void *pi_worker_main(void *arg){
+
+  pi_worker_run((pi_worker *)arg);
+  return NULL; }
+
+static int pi_cpu_count(void){
+
+  long count = sysconf(_SC_NPROCESSORS_ONLN);
+  return count > 0 ? (int)count : 1; }
+#endif
+
+/* Splits n samples across native threads (threads <= 0 means one per
+   CPU) and adds up the exact hit counts.  The calling thread does its
+   share of the work; a thread that cannot be started runs inline */
+double pi_approx_parallel(int64_t n, int threads, uint64_t seed){
+
+  pi_worker workers[PI_MAX_THREADS];
+#ifdef _WIN32
+  HANDLE handles[PI_MAX_THREADS];
+#else
+  pthread_t handles[PI_MAX_THREADS];
+#endif
+  int started[PI_MAX_THREADS];
+  int64_t nblocks = (n + PI_BLOCK_SIZE - 1) / PI_BLOCK_SIZE, hits = 0;
+  int t;
+
+  if (n <= 0)
+    return 0.0;
+
+  if (threads <= 0)
+    threads = pi_cpu_count();
+  if (threads > PI_MAX_THREADS)
+    threads = PI_MAX_THREADS;
+  if (threads > nblocks)
+    threads = (int)nblocks;
+
+  for(t=0;t<threads;t++){
+
+    workers[t].seed = seed;
+    workers[t].n = n;
+    workers[t].first_block = t;
+    workers[t].block_step = threads;
+    workers[t].hits = 0;
+    started[t] = 0; }
+
+  for(t=1;t<threads;t++){
+#ifdef _WIN32
+    handles[t] = CreateThread(NULL, 0, pi_worker_main, &workers[t], 0, NULL);
+    started[t] = handles[t] != NULL;
+#else
+    started[t] = pthread_create(&handles[t], NULL, pi_worker_main, &workers[t]) == 0;
+#endif
+    if (!started[t])
+      pi_worker_run(&workers[t]); }
+
+  pi_worker_run(&workers[0]);
+
+  for(t=0;t<threads;t++){
+
+    if (started[t]){
+#ifdef _WIN32
+      WaitForSingleObject(handles[t], INFINITE);
+      CloseHandle(handles[t]);
+#else
+      pthread_join(handles[t], NULL);
+#endif
+    }
+
+    hits += workers[t].hits; }
+
+  return 4*(double)hits/(double)n; }
+
+/* Computes count independent estimates in one call, so many small runs
+   pay for a single crossing of the FFI boundary.  Estimate i uses the
+   stream of block i, so a seeded batch is reproducible item by item */
+void pi_approx_batch_seeded(const int64_t *ns, double *out, size_t count, uint64_t seed){
+
+  pi_rng r;
+  size_t i;
+
+  for(i=0;i<count;i++){
+
+    if (ns[i] <= 0){
+      out[i] = 0.0;
+      continue; }
+
+    pi_rng_seed(&r, pi_block_seed(seed, (int64_t)i));
+    out[i] = 4*(double)pi_count_hits(&r, ns[i])/(double)ns[i]; } }
+
+void pi_approx_batch(const int64_t *ns, double *out, size_t count){
+
+  pi_approx_batch_seeded(ns, out, count, pi_rand_seed()); }
+
+/* Inverse of the standard normal CDF (Acklam's rational approximation,
+   relative error below 1.2e-9), used to turn a confidence level into
+   the z factor of an interval */
+static double pi_normal_quantile(double p){
+
+  static const double a[] = {-3.969683028665376e+01, 2.209460984245205e+02,
+                             -2.759285104469687e+02, 1.383577518672690e+02,
+                             -3.066479806614716e+01, 2.506628277459239e+00};
+  static const double b[] = {-5.447609879822406e+01, 1.615858368580409e+02,
+                             -1.556989798598866e+02, 6.680131188771972e+01,
+                             -1.328068155288572e+01};
+  static const double c[] = {-7.784894002430293e-03, -3.223964580411365e-01,
+                             -2.400758277161838e+00, -2.549732539343734e+00,
+                              4.374664141464968e+00, 2.938163982698783e+00};
+  static const double d[] = { 7.784695709041462e-03, 3.224671290700398e-01,
+                              2.445134137142996e+00, 3.754408661907416e+00};
+  double q, r;
+
+  if (p <= 0.0)
+    return -HUGE_VAL;
+  if (p >= 1.0)
+    return HUGE_VAL;
+
+  if (p < 0.02425){
+    q = sqrt(-2*log(p));
+    return (((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) /
+           ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1); }
+
+  if (p > 1 - 0.02425){
+    q = sqrt(-2*log(1-p));
+    return -(((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) /
+            ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1); }
+
+  q = p - 0.5;
+  r = q*q;
+  return (((((a[0]*r+a[1])*r+a[2])*r+a[3])*r+a[4])*r+a[5])*q /
+         (((((b[0]*r+b[1])*r+b[2])*r+b[3])*r+b[4])*r+1); }
+
+/* Two-sided normal interval around 4*hits/samples: each sample is a
+   Bernoulli trial, so the standard error is 4*sqrt(p*(1-p)/samples) */
+static pi_interval pi_make_interval(int64_t hits, int64_t samples, double confidence){
+
+  pi_interval interval;
+  double p, z;
+
+  if (samples <= 0){
+    interval.estimate = 0.0;
+    interval.half_width = HUGE_VAL;
+    interval.low = -HUGE_VAL;
+    interval.high = HUGE_VAL;
+    return interval; }
+
+  p = (double)hits/(double)samples;
+  z = pi_normal_quantile(0.5 + confidence/2);
+
+  interval.estimate = 4*p;
+  interval.half_width = z*4*sqrt(p*(1-p)/(double)samples);
+  interval.low = interval.estimate - interval.half_width;
+  interval.high = interval.estimate + interval.half_width;
+  return interval; }
+
+/* Incremental estimator: exact integer counters that can be extended
+   with more samples at any time, and merged with estimators from other
+   threads or machines.  Every add_samples call draws from a fresh stream
+   (seed, stream index), so a run is reproducible from its seed */
+void pi_estimator_init(pi_estimator *state, uint64_t seed){
+
+  state->hits = 0;
+  state->samples = 0;
+  state->seed = seed;
+  state->streams = 0; }
+
+void pi_estimator_add_samples(pi_estimator *state, int64_t n){
+
+  pi_rng r;
+
+  if (n <= 0)
+    return;
+
+  pi_rng_seed(&r, pi_block_seed(state->seed, state->streams++));
+  state->hits += pi_count_hits(&r, n);
+  state->samples += n; }
+
+/* Adds the counters of b into a; b is left untouched */
+void pi_estimator_merge(pi_estimator *a, const pi_estimator *b){
+
+  a->hits += b->hits;
+  a->samples += b->samples; }
+
+double pi_estimator_estimate(const pi_estimator *state){
+
+  return pi_make_result(state->hits, state->samples).estimate; }
+
+pi_interval pi_estimator_interval(const pi_estimator *state, double confidence){
+
+  return pi_make_interval(state->hits, state->samples, confidence); }
+
+/* Adaptive precision: samples in chunks until the half-width of the
+   confidence interval drops to tolerance, or max_samples is reached.
+   The Bernoulli variance p*(1-p) is known exactly from the running
+   counters, so each chunk is sized to what the current variance says
+   is still missing (at least PI_UNTIL_MIN_CHUNK, at most doubling the
+   run so far so that a poor early variance cannot overshoot far) */
+#define PI_UNTIL_MIN_CHUNK 16384
+
+pi_until_result pi_approx_until_seeded(double tolerance, double confidence, int64_t max_samples, uint64_t seed){
+
+  pi_until_result result;
+  pi_estimator state;
+  pi_interval interval;
+  double p, missing, z = pi_normal_quantile(0.5 + confidence/2);
+  int64_t chunk = PI_UNTIL_MIN_CHUNK;
+
+  pi_estimator_init(&state, seed);
+  interval = pi_make_interval(0, 0, confidence);
+
+  while (state.samples < max_samples){
+
+    if (chunk > max_samples - state.samples)
+      chunk = max_samples - state.samples;
+
+    pi_estimator_add_samples(&state, chunk);
+    interval = pi_make_interval(state.hits, state.samples, confidence);
+
+    if (interval.half_width <= tolerance)
+      break;
+
+    p = (double)state.hits/(double)state.samples;
+    missing = 16*z*z*p*(1-p)/(tolerance*tolerance) - (double)state.samples;
+
+    if (missing < PI_UNTIL_MIN_CHUNK)
+      chunk = PI_UNTIL_MIN_CHUNK;
+    else if (missing > (double)state.samples)
+      chunk = state.samples;
+    else
+      chunk = (int64_t)ceil(missing); }
+
+  result.hits = state.hits;
+  result.samples = state.samples;
+  result.estimate = interval.estimate;
+  result.half_width = interval.half_width;
+  result.converged = interval.half_width <= tolerance;
+  return result; }
+
+pi_until_result pi_approx_until(double tolerance, double confidence, int64_t max_samples){
+
+  return pi_approx_until_seeded(tolerance, confidence, max_samples, pi_rand_seed()); }
+
+/* Monotonic clock in nanoseconds */
+static int64_t pi_now_ns(void){
+
+#ifdef _WIN32
+  static LARGE_INTEGER frequency;
+  LARGE_INTEGER now;
+
+  if (frequency.QuadPart == 0)
+    QueryPerformanceFrequency(&frequency);
+  QueryPerformanceCounter(&now);
+  return (now.QuadPart / frequency.QuadPart) * 1000000000LL +
+         (now.QuadPart % frequency.QuadPart) * 1000000000LL / frequency.QuadPart;
+#else
+  struct timespec now;
+
+  clock_gettime(CLOCK_MONOTONIC, &now);
+  return (int64_t)now.tv_sec * 1000000000LL + now.tv_nsec;
+#endif
+}
+
+/* Time-budgeted sampling: draws chunks until budget_ns nanoseconds of
+   the monotonic clock have passed.  After a small first chunk, each
+   chunk is sized from the sampling rate measured so far to take half
+   of the time left, so the run converges on the deadline without
+   crossing it by more than the timing noise of one chunk.  Once less
+   than PI_FOR_MIN_CHUNK samples' worth of time is left the run stops:
+   the clock reads would cost more than the samples are worth */
+#define PI_FOR_MIN_CHUNK 256
+#define PI_FOR_FIRST_CHUNK 256
+
+pi_result pi_approx_for_seeded(int64_t budget_ns, uint64_t seed){
+
+  pi_estimator state;
+  int64_t start = pi_now_ns(), now, deadline, chunk = PI_FOR_FIRST_CHUNK;
+  double rate;
+
+  pi_estimator_init(&state, seed);
+
+  if (budget_ns <= 0)
+    return pi_make_result(0, 0);
+
+  deadline = budget_ns > INT64_MAX - start ? INT64_MAX : start + budget_ns;
+
+  for(;;){
+
+    pi_estimator_add_samples(&state, chunk);
+
+    now = pi_now_ns();
+    if (now >= deadline)
+      break;
+
+    /* samples per nanosecond, over the whole run so far */
+    rate = (double)state.samples / (double)(now - start > 0 ? now - start : 1);
+    chunk = (int64_t)(rate * (double)(deadline - now) / 2);
+
+    if (chunk < PI_FOR_MIN_CHUNK){
+      chunk = (int64_t)(rate * (double)(deadline - now));
+      if (chunk < PI_FOR_MIN_CHUNK)
+        break; } }
+
+  return pi_make_result(state.hits, state.samples); }
+
+pi_result pi_approx_for(int64_t budget_ns){
+
+  return pi_approx_for_seeded(budget_ns, pi_rand_seed()); }
+
+/* Quasi-Monte Carlo sampling.  Points come from a low-discrepancy
+   sequence instead of the generator, so the error shrinks close to 1/n
+   rather than 1/sqrt(n).  Sobol points use the 2-D direction numbers
+   (van der Corput in x, the x+1 polynomial in y) generated in Gray-code
+   order; Halton points use bases 2 and 3.  Scrambling randomizes the
+   sequence while keeping its uniformity: a random digital shift (XOR)
+   for Sobol, a random Cranley-Patterson rotation for Halton */
+static double pi_qmc_unit(uint64_t bits){
+
+  return (double)(bits >> 11) * (1.0 / 9007199254740992.0); }
+
+static int64_t pi_count_hits_sobol(int64_t n, int scramble, uint64_t seed){
+
+  uint64_t v0[64], v1[64], x0, x1;
+  int64_t i, hits = 0;
+  double x, y;
+  int k, c;
+
+  for(k=0;k<64;k++){
+
+    v0[k] = 1ULL << (63 - k);
+    v1[k] = k == 0 ? v0[0] : v1[k-1] ^ (v1[k-1] >> 1); }
+
+  x0 = scramble ? splitmix64(&seed) : 0;
+  x1 = scramble ? splitmix64(&seed) : 0;
+
+  for(i=0;i<n;i++){
+
+    x = pi_qmc_unit(x0);
+    y = pi_qmc_unit(x1);
+
+    hits += (x*x + y*y < 1.0);
+
+    /* next point: flip the direction of the lowest zero bit of i */
+    for(c=0;(uint64_t)i >> c & 1;c++)
+      ;
+    x0 ^= v0[c];
+    x1 ^= v1[c]; }
+
+  return hits; }
+
+/* Halton radical inverses are advanced incrementally, in exact integer
+   arithmetic: base 2 as a bit-reversed counter, base 3 as 40 ternary
+   digits scaled by 3^40 (just below 2^64) */
+#define PI_HALTON3_DIGITS 40
+
+static int64_t pi_count_hits_halton(int64_t n, int scramble, uint64_t seed){
+
+  uint64_t bits2 = 0, value3 = 0, mask, power3[PI_HALTON3_DIGITS];
+  unsigned char digits3[PI_HALTON3_DIGITS] = {0};
+  int64_t i, hits = 0;
+  double x, y, shift_x = 0.0, shift_y = 0.0, scale3;
+  int k;
+
+  for(k=PI_HALTON3_DIGITS-1,mask=1;k>=0;k--,mask*=3)
+    power3[k] = mask;
+  scale3 = 1.0 / ((double)power3[0] * 3.0);
+
+  if (scramble){
+    shift_x = pi_qmc_unit(splitmix64(&seed));
+    shift_y = pi_qmc_unit(splitmix64(&seed)); }
+
+  for(i=0;i<n;i++){
+
+    x = pi_qmc_unit(bits2) + shift_x;
+    y = (double)value3 * scale3 + shift_y;
+    if (x >= 1.0) x -= 1.0;
+    if (y >= 1.0) y -= 1.0;
+
+    hits += (x*x + y*y < 1.0);
+
+    /* add one to the index, carrying from the most significant bit
+       of the mirrored value downwards */
+    for(mask=1ULL<<63;bits2 & mask;mask>>=1)
+      bits2 ^= mask;
+    bits2 |= mask;
+
+    for(k=0;k<PI_HALTON3_DIGITS && digits3[k]==2;k++){
+      digits3[k] = 0;
+      value3 -= 2*power3[k]; }
+    if (k < PI_HALTON3_DIGITS){
+      digits3[k]++;
+      value3 += power3[k]; } }
+
+  return hits; }
+
+pi_result pi_approx_qmc(int64_t n, pi_qmc_sequence sequence, int scramble, uint64_t seed){
+
+  if (n <= 0)
+    return pi_make_result(0, 0);
+
+  if (sequence == PI_QMC_HALTON)
+    return pi_make_result(pi_count_hits_halton(n, scramble, seed), n);
+
+  return pi_make_result(pi_count_hits_sobol(n, scramble, seed), n); }
+
+/* Point export.  The sampler is a resumable stream: successive calls
+   continue where the last one stopped, so a long run can be exported in
+   fixed-size chunks.  Seeded like pi_approx64_seeded, it produces exactly
+   the points that function counts */
+void pi_sampler_init(pi_sampler *state, uint64_t seed){
+
+  pi_rng r;
+
+  pi_rng_seed(&r, seed);
+  state->s0 = r.s0;
+  state->s1 = r.s1;
+  state->hits = 0;
+  state->samples = 0; }
+
+/* Writes the next n points to xs, ys and inside (1 inside the quarter
+   circle, else 0); any of the three may be NULL to skip it.  Returns the
+   hits among these n points and adds them to the state's counters */
+int64_t pi_sample_points(int64_t n, double *xs, double *ys, uint8_t *inside, pi_sampler *state){
+
+  pi_rng r;
+  int64_t i, hits = 0;
+  double x, y;
+  int in;
+
+  if (n <= 0)
+    return 0;
+
+  r.s0 = state->s0;
+  r.s1 = state->s1;
+
+  for(i=0;i<n;i++){
+
+    x = pi_rng_unit(&r);
+    y = pi_rng_unit(&r);
+    in = x*x + y*y < 1.0;
+    hits += in;
+
+    if (xs)
+      xs[i] = x;
+    if (ys)
+      ys[i] = y;
+    if (inside)
+      inside[i] = (uint8_t)in; }
+
+  state->s0 = r.s0;
+  state->s1 = r.s1;
+  state->hits += hits;
+  state->samples += n;
+  return hits; }
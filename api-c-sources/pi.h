@@ -1,2 +1,83 @@
 /* filename: pi.h*/
+#ifndef PI_H
+#define PI_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+/* Exact outcome of a 64-bit run */
+typedef struct {
+  int64_t hits;
+  int64_t samples;
+  double estimate;
+} pi_result;
+
+/* Confidence interval around an estimate */
+typedef struct {
+  double estimate;
+  double half_width;
+  double low;
+  double high;
+} pi_interval;
+
+/* Incremental, mergeable estimator state */
+typedef struct {
+  int64_t hits;
+  int64_t samples;
+  uint64_t seed;
+  int64_t streams;
+} pi_estimator;
+
+/* Outcome of an adaptive-precision run */
+typedef struct {
+  int64_t hits;
+  int64_t samples;
+  double estimate;
+  double half_width;
+  int converged;
+} pi_until_result;
+
+/* Low-discrepancy sequences for pi_approx_qmc */
+typedef enum {
+  PI_QMC_SOBOL = 0,
+  PI_QMC_HALTON = 1
+} pi_qmc_sequence;
+
+/* Resumable point stream for pi_sample_points */
+typedef struct {
+  uint64_t s0, s1;
+  int64_t hits;
+  int64_t samples;
+} pi_sampler;
+
+/* Largest digit count accepted by pi_series_digits */
+#define PI_SERIES_MAX_DIGITS 5000000
+
 float pi_approx(int n);
+float pi_approx_seeded(int n, uint64_t seed);
+double pi_approx_parallel(int64_t n, int threads, uint64_t seed);
+pi_result pi_approx64(int64_t n);
+pi_result pi_approx64_seeded(int64_t n, uint64_t seed);
+void pi_approx_batch(const int64_t *ns, double *out, size_t count);
+void pi_approx_batch_seeded(const int64_t *ns, double *out, size_t count, uint64_t seed);
+
+void pi_estimator_init(pi_estimator *state, uint64_t seed);
+void pi_estimator_add_samples(pi_estimator *state, int64_t n);
+void pi_estimator_merge(pi_estimator *a, const pi_estimator *b);
+double pi_estimator_estimate(const pi_estimator *state);
+pi_interval pi_estimator_interval(const pi_estimator *state, double confidence);
+
+pi_until_result pi_approx_until(double tolerance, double confidence, int64_t max_samples);
+pi_until_result pi_approx_until_seeded(double tolerance, double confidence, int64_t max_samples, uint64_t seed);
+
+pi_result pi_approx_for(int64_t budget_ns);
+pi_result pi_approx_for_seeded(int64_t budget_ns, uint64_t seed);
+
+pi_result pi_approx_qmc(int64_t n, pi_qmc_sequence sequence, int scramble, uint64_t seed);
+
+int pi_series_digits(int64_t digits, char *out, size_t out_size);
+
+void pi_sampler_init(pi_sampler *state, uint64_t seed);
+int64_t pi_sample_points(int64_t n, double *xs, double *ys, uint8_t *inside, pi_sampler *state);
+
+#endif /* PI_H */
@@ -0,0 +1,159 @@
+"""
+Memoizing cache in front of pi_wrapper.compute_pi.
+A seeded Monte Carlo or QMC run and every series computation always give
+the same answer for the same arguments, so their results can be kept: in
+a bounded in-memory LRU, and optionally in an SQLite file that survives
+restarts. Concurrent identical requests are computed only once.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+from pi_wrapper import ENGINES, compute_pi
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "disk_hits", "misses", "uncached", "currsize", "maxsize"])
+
+
+class PiCache:
+    """Cache of compute_pi results keyed on (engine, n, seed).
+
+    maxsize bounds the in-memory LRU (None for no bound). path names an
+    SQLite file used as a second level: results are written through to it
+    and looked up there after an in-memory miss, so they persist across
+    processes and restarts. Results that depend on fresh randomness
+    (Monte Carlo or scrambled QMC without a seed) are never cached.
+
+    While one thread computes a key, other threads asking for the same key
+    wait for that result instead of starting their own computation.
+    """
+
+    def __init__(self, maxsize=128, path=None, compute=compute_pi):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be non-negative or None")
+        self.maxsize = maxsize
+        self.path = path
+        self._compute = compute
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._hits = self._disk_hits = self._misses = self._uncached = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(engine="monte_carlo", n=1_000_000, digits=50, seed=None, sequence="sobol"):
+        """Return the cache key for a compute_pi call, or None if it is not cacheable."""
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+        if engine == "series":
+            return ("series", digits, None)
+        if seed is None:
+            return None
+        if engine == "qmc":
+            return ("qmc", n, seed, sequence)
+        return (engine, n, seed)
+
+    def compute(self, engine="monte_carlo", n=1_000_000, digits=50, seed=None, sequence="sobol"):
+        """compute_pi with the same arguments, answered from the cache when possible."""
+        key = self.make_key(engine, n, digits, seed, sequence)
+        if key is None:
+            with self._lock:
+                self._uncached += 1
+            return self._compute(engine, n=n, digits=digits, seed=seed, sequence=sequence)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            # Single flight: wait for the thread already computing this key
+            return future.result()
+
+        try:
+            value, from_disk = self._load(key)
+            if not from_disk:
+                value = self._compute(engine, n=n, digits=digits, seed=seed, sequence=sequence)
+                self._store(key, value)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if from_disk:
+                self._disk_hits += 1
+            else:
+                self._misses += 1
+            self._remember(key, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def _remember(self, key, value):
+        if self.maxsize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        with self._lock:
+            if self._db is None:
+                return None, False
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (json.dumps(key),)).fetchone()
+        if row is None:
+            return None, False
+        return json.loads(row[0]), True
+
+    def _store(self, key, value):
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (json.dumps(key), json.dumps(value)))
+                self._db.commit()
+
+    def cache_info(self):
+        """Hit and miss counters in the style of functools.lru_cache.
+
+        hits are answered from memory, disk_hits from the on-disk store,
+        misses were computed, and uncached counts calls that could not be
+        cached because they were not seeded.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._disk_hits, self._misses, self._uncached,
+                             len(self._entries), self.maxsize)
+
+    def cache_clear(self, disk=False):
+        """Empty the in-memory cache and reset the counters; disk=True also empties the store."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = self._uncached = 0
+            if disk and self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self):
+        """Close the on-disk store, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
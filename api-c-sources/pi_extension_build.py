@@ -4,22 +4,89 @@ import os
 
 ffibuilder = FFI()
 
-ffibuilder.cdef("float pi_approx(int n);")
+ffibuilder.cdef("""
+    typedef struct {
+        int64_t hits;
+        int64_t samples;
+        double estimate;
+    } pi_result;
+
+    typedef struct {
+        double estimate;
+        double half_width;
+        double low;
+        double high;
+    } pi_interval;
+
+    typedef struct {
+        int64_t hits;
+        int64_t samples;
+        uint64_t seed;
+        int64_t streams;
+    } pi_estimator;
+
+    typedef struct {
+        int64_t hits;
+        int64_t samples;
+        double estimate;
+        double half_width;
+        int converged;
+    } pi_until_result;
+
+    typedef enum {
+        PI_QMC_SOBOL = 0,
+        PI_QMC_HALTON = 1
+    } pi_qmc_sequence;
+
+    typedef struct {
+        uint64_t s0, s1;
+        int64_t hits;
+        int64_t samples;
+    } pi_sampler;
+
+    #define PI_SERIES_MAX_DIGITS 5000000
+
+    float pi_approx(int n);
+    float pi_approx_seeded(int n, uint64_t seed);
+    double pi_approx_parallel(int64_t n, int threads, uint64_t seed);
+    pi_result pi_approx64(int64_t n);
+    pi_result pi_approx64_seeded(int64_t n, uint64_t seed);
+    void pi_approx_batch(const int64_t *ns, double *out, size_t count);
+    void pi_approx_batch_seeded(const int64_t *ns, double *out, size_t count, uint64_t seed);
+
+    void pi_estimator_init(pi_estimator *state, uint64_t seed);
+    void pi_estimator_add_samples(pi_estimator *state, int64_t n);
+    void pi_estimator_merge(pi_estimator *a, const pi_estimator *b);
+    double pi_estimator_estimate(const pi_estimator *state);
+    pi_interval pi_estimator_interval(const pi_estimator *state, double confidence);
+
+    pi_until_result pi_approx_until(double tolerance, double confidence, int64_t max_samples);
+    pi_until_result pi_approx_until_seeded(double tolerance, double confidence, int64_t max_samples, uint64_t seed);
+    pi_result pi_approx_for(int64_t budget_ns);
+    pi_result pi_approx_for_seeded(int64_t budget_ns, uint64_t seed);
+
+    pi_result pi_approx_qmc(int64_t n, pi_qmc_sequence sequence, int scramble, uint64_t seed);
+
+    int pi_series_digits(int64_t digits, char *out, size_t out_size);
+
+    void pi_sampler_init(pi_sampler *state, uint64_t seed);
+    int64_t pi_sample_points(int64_t n, double *xs, double *ys, uint8_t *inside, pi_sampler *state);
+""")
 
 # Windows-specific configuration
 libraries = []
 if sys.platform == "win32":
-    # On Windows, math functions are built into the C runtime
+    # On Windows, math and thread functions are built into the C runtime
     libraries = []
 else:
-    # On Unix-like systems, link with the math library
-    libraries = ['m']
+    # On Unix-like systems, link with the math and threads libraries
+    libraries = ['m', 'pthread']
 
 ffibuilder.set_source("_pi",  # name of the output C extension
 """
     #include "pi.h"
 """,
-    sources=['pi.c'],   # includes pi.c as additional sources
+    sources=['pi.c', 'pi_series.c'],   # includes pi.c and pi_series.c as additional sources
     libraries=libraries)  # platform-specific libraries
 
 if __name__ == "__main__":
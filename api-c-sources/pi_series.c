@@ -0,0 +1,540 @@
+/* filename: pi_series.c - exact decimal digits of Pi (Chudnovsky series) */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+
+#include "pi.h"
+
+/* Export marker of the main-mode DLL build; empty in this build */
+#define PI_API
+
+/* Unlike the Monte Carlo kernels, this engine is deterministic: it sums
+   the Chudnovsky series by binary splitting, which gives about 14.18
+   correct digits per term.  The arithmetic uses a small arbitrary
+   precision integer type with base 10^9 limbs, so the final digits need
+   no base conversion.  Multiplication is Karatsuba above a cutoff and
+   everything else is built from multiplications */
+#define PI_BN_BASE 1000000000u
+#define PI_BN_DIGITS 9
+#define PI_KARATSUBA_CUTOFF 32
+#define PI_SERIES_GUARD 18    /* extra digits absorbing rounding */
+
+typedef struct {
+  uint32_t *d;    /* limbs, least significant first */
+  size_t n;       /* limbs in use, 0 for zero */
+  size_t cap;
+  int neg;
+} pi_bn;
+
+static void bn_init(pi_bn *a){
+
+  a->d = NULL;
+  a->n = a->cap = 0;
+  a->neg = 0; }
+
+static void bn_free(pi_bn *a){
+
+  free(a->d);
+  bn_init(a); }
+
+static void bn_swap(pi_bn *a, pi_bn *b){
+
+  pi_bn t = *a;
+  *a = *b;
+  *b = t; }
+
+static int bn_reserve(pi_bn *a, size_t cap){
+
+  uint32_t *d;
+
+  if (cap <= a->cap)
+    return 0;
+
+  d = (uint32_t *)realloc(a->d, cap * sizeof *d);
+  if (!d)
+    return -1;
+
+  a->d = d;
+  a->cap = cap;
+  return 0; }
+
+static size_t mag_len(const uint32_t *a, size_t n){
+
+  while (n && !a[n-1])
+    n--;
+  return n; }
+
+static void bn_trim(pi_bn *a){
+
+  a->n = mag_len(a->d, a->n);
+  if (!a->n)
+    a->neg = 0; }
+
+static int bn_set_u64(pi_bn *a, uint64_t v){
+
+  if (bn_reserve(a, 3))
+    return -1;
+
+  a->n = 0;
+  a->neg = 0;
+  while (v){
+    a->d[a->n++] = (uint32_t)(v % PI_BN_BASE);
+    v /= PI_BN_BASE; }
+  return 0; }
+
+/* a * B^k, or a / B^k (k limbs dropped) when k is negative */
+static int bn_shift(pi_bn *r, const pi_bn *a, long k){
+
+  size_t n;
+
+  if (k >= 0){
+    n = a->n ? a->n + (size_t)k : 0;
+    if (bn_reserve(r, n + 1))
+      return -1;
+    memmove(r->d + k, a->d, a->n * sizeof *a->d);
+    memset(r->d, 0, (size_t)k * sizeof *a->d); }
+  else {
+    n = a->n > (size_t)-k ? a->n - (size_t)-k : 0;
+    if (bn_reserve(r, n + 1))
+      return -1;
+    memmove(r->d, a->d + (size_t)-k, n * sizeof *a->d); }
+
+  r->n = n;
+  r->neg = a->neg;
+  bn_trim(r);
+  return 0; }
+
+static int mag_cmp(const uint32_t *a, size_t an, const uint32_t *b, size_t bn){
+
+  an = mag_len(a, an);
+  bn = mag_len(b, bn);
+
+  if (an != bn)
+    return an < bn ? -1 : 1;
+
+  while (an--)
+    if (a[an] != b[an])
+      return a[an] < b[an] ? -1 : 1;
+
+  return 0; }
+
+/* The carry and borrow loops below are written without branches on the
+   carry, which is unpredictable, and propagate it past b separately */
+
+/* r[0..an] = a + b, with an >= bn; r may alias a */
+static void mag_add(uint32_t *r, const uint32_t *a, size_t an, const uint32_t *b, size_t bn){
+
+  uint32_t carry = 0, s;
+  size_t i;
+
+  for(i=0;i<bn;i++){
+    s = a[i] + b[i] + carry;
+    carry = s >= PI_BN_BASE;
+    r[i] = s - carry * PI_BN_BASE; }
+
+  for(;i<an;i++){
+    s = a[i] + carry;
+    carry = s >= PI_BN_BASE;
+    r[i] = s - carry * PI_BN_BASE; }
+
+  r[an] = carry; }
+
+/* a += b in place, a having room for the carry (an >= bn) */
+static void mag_add_into(uint32_t *a, size_t an, const uint32_t *b, size_t bn){
+
+  uint32_t carry = 0, s;
+  size_t i;
+
+  for(i=0;i<bn;i++){
+    s = a[i] + b[i] + carry;
+    carry = s >= PI_BN_BASE;
+    a[i] = s - carry * PI_BN_BASE; }
+
+  for(;carry && i<an;i++){
+    carry = a[i] == PI_BN_BASE - 1;
+    a[i] = carry ? 0 : a[i] + 1; } }
+
+/* a -= b in place, requires a >= b */
+static void mag_sub_into(uint32_t *a, size_t an, const uint32_t *b, size_t bn){
+
+  uint32_t borrow = 0, s;
+  size_t i;
+
+  for(i=0;i<bn;i++){
+    s = a[i] + PI_BN_BASE - b[i] - borrow;
+    borrow = s < PI_BN_BASE;
+    a[i] = s - (1 - borrow) * PI_BN_BASE; }
+
+  for(;borrow && i<an;i++){
+    borrow = a[i] == 0;
+    a[i] = borrow ? PI_BN_BASE - 1 : a[i] - 1; } }
+
+static void mag_mul_school(uint32_t *r, const uint32_t *a, size_t an, const uint32_t *b, size_t bn){
+
+  uint64_t t, carry;
+  size_t i, j;
+
+  memset(r, 0, (an + bn) * sizeof *r);
+
+  for(i=0;i<an;i++){
+
+    if (!a[i])
+      continue;
+
+    carry = 0;
+    for(j=0;j<bn;j++){
+      t = (uint64_t)a[i] * b[j] + r[i+j] + carry;
+      r[i+j] = (uint32_t)(t % PI_BN_BASE);
+      carry = t / PI_BN_BASE; }
+
+    r[i+bn] = (uint32_t)carry; } }
+
+/* r[0..an+bn) = a * b; r must not overlap a or b */
+static int mag_mul(uint32_t *r, const uint32_t *a, size_t an, const uint32_t *b, size_t bn){
+
+  const uint32_t *swap;
+  uint32_t *tmp, *sa, *sb, *z1;
+  size_t full = an + bn, m, len, off, sn, san, sbn, z1n;
+
+  an = mag_len(a, an);
+  bn = mag_len(b, bn);
+  memset(r, 0, full * sizeof *r);
+
+  if (!an || !bn)
+    return 0;
+
+  if (an < bn){
+    swap = a; a = b; b = swap;
+    len = an; an = bn; bn = len; }
+
+  if (bn < PI_KARATSUBA_CUTOFF){
+    mag_mul_school(r, a, an, b, bn);
+    return 0; }
+
+  /* unbalanced operands: multiply bn-limb slices of a by b */
+  if (an >= 2*bn){
+
+    tmp = (uint32_t *)malloc(2 * bn * sizeof *tmp);
+    if (!tmp)
+      return -1;
+
+    for(off=0;off<an;off+=bn){
+      len = an - off < bn ? an - off : bn;
+      if (mag_mul(tmp, a + off, len, b, bn)){
+        free(tmp);
+        return -1; }
+      mag_add_into(r + off, full - off, tmp, len + bn); }
+
+    free(tmp);
+    return 0; }
+
+  /* Karatsuba: a = a1*B^m + a0, b = b1*B^m + b0, with b1 non-empty */
+  m = an / 2;
+  san = an - m + 1;
+  sbn = (m > bn - m ? m : bn - m) + 1;
+  z1n = san + sbn;
+
+  tmp = (uint32_t *)malloc((san + sbn + z1n) * sizeof *tmp);
+  if (!tmp)
+    return -1;
+  sa = tmp;
+  sb = sa + san;
+  z1 = sb + sbn;
+
+  if (mag_mul(r, a, m, b, m) ||
+      mag_mul(r + 2*m, a + m, an - m, b + m, bn - m)){
+    free(tmp);
+    return -1; }
+
+  mag_add(sa, a + m, an - m, a, m);
+  if (bn - m >= m)
+    mag_add(sb, b + m, bn - m, b, m);
+  else
+    mag_add(sb, b, m, b + m, bn - m);
+
+  if (mag_mul(z1, sa, san, sb, sbn)){
+    free(tmp);
+    return -1; }
+
+  /* z1 = (a0+a1)(b0+b1) - a0*b0 - a1*b1 */
+  mag_sub_into(z1, z1n, r, 2*m);
+  mag_sub_into(z1, z1n, r + 2*m, full - 2*m);
+
+  sn = mag_len(z1, z1n);
+  mag_add_into(r + m, full - m, z1, sn);
+
+  free(tmp);
+  return 0; }
+
+static int bn_mul(pi_bn *r, const pi_bn *a, const pi_bn *b){
+
+  uint32_t *d;
+  size_t n = a->n + b->n;
+  int neg = a->neg != b->neg;
+
+  if (!a->n || !b->n){
+    r->n = 0;
+    r->neg = 0;
+    return 0; }
+
+  d = (uint32_t *)malloc(n * sizeof *d);
+  if (!d || mag_mul(d, a->d, a->n, b->d, b->n)){
+    free(d);
+    return -1; }
+
+  free(r->d);
+  r->d = d;
+  r->n = n;
+  r->cap = n;
+  r->neg = neg;
+  bn_trim(r);
+  return 0; }
+
+static int bn_mul_u64(pi_bn *r, const pi_bn *a, uint64_t v){
+
+  pi_bn b;
+  int status;
+
+  bn_init(&b);
+  status = bn_set_u64(&b, v) || bn_mul(r, a, &b);
+  bn_free(&b);
+  return status ? -1 : 0; }
+
+/* Signed addition; r may alias a or b */
+static int bn_add(pi_bn *r, const pi_bn *a, const pi_bn *b){
+
+  const pi_bn *big = a, *small = b;
+  uint32_t *d;
+  size_t n;
+  int neg;
+
+  if (a->n < b->n || (a->neg != b->neg && mag_cmp(a->d, a->n, b->d, b->n) < 0)){
+    big = b;
+    small = a; }
+
+  n = big->n + 1;
+  d = (uint32_t *)malloc(n * sizeof *d);
+  if (!d)
+    return -1;
+
+  neg = big->neg;
+  if (a->neg == b->neg)
+    mag_add(d, big->d, big->n, small->d, small->n);
+  else {
+    memcpy(d, big->d, big->n * sizeof *d);
+    d[big->n] = 0;
+    mag_sub_into(d, n, small->d, small->n); }
+
+  free(r->d);
+  r->d = d;
+  r->n = n;
+  r->cap = n;
+  r->neg = neg;
+  bn_trim(r);
+  return 0; }
+
+/* a /= d in place; returns the remainder */
+static uint32_t mag_div_small(uint32_t *a, size_t n, uint32_t d){
+
+  uint64_t rem = 0, cur;
+
+  while (n--){
+    cur = rem * PI_BN_BASE + a[n];
+    a[n] = (uint32_t)(cur / d);
+    rem = cur % d; }
+
+  return (uint32_t)rem; }
+
+/* The square root and the final division use fixed-point Newton
+   iterations: a value v with p fractional limbs is held as the integer
+   v * B^p.  Each step doubles the precision, so the total cost is a few
+   multiplications at full size and no long division is ever needed */
+
+/* Precision for the next step: one limb short of doubling, so that the
+   few units of rounding error in y cannot compound from step to step */
+static size_t pi_newton_next(size_t p, size_t prec){
+
+  size_t next = p > 1 ? 2*p - 1 : 2;
+
+  return next < prec ? next : prec; }
+
+/* y += y * e / B^(2p), with e = B^(2p) - x (both sides at scale B^(2p)) */
+static int bn_newton_step(pi_bn *y, pi_bn *x, size_t p, uint32_t halve){
+
+  pi_bn one;
+  int status;
+
+  bn_init(&one);
+  x->neg = !x->neg && x->n;
+  status = bn_set_u64(&one, 1) || bn_shift(&one, &one, 2*(long)p) || bn_add(x, x, &one) ||
+           bn_mul(x, x, y) || bn_shift(x, x, -2*(long)p);
+  if (!status && halve){
+    mag_div_small(x->d, x->n, halve);
+    bn_trim(x); }
+  status = status || bn_add(y, y, x);
+  bn_free(&one);
+  return status ? -1 : 0; }
+
+/* r = B^(t->n + prec) / t, give or take a few units */
+static int bn_recip(pi_bn *r, const pi_bn *t, size_t prec){
+
+  pi_bn y, e;
+  double lead;
+  size_t p, next;
+  int status = -1;
+
+  /* 1/t from the leading limbs as a double is good for one limb */
+  lead = (t->d[t->n-1] + (t->n > 1 ? t->d[t->n-2] / (double)PI_BN_BASE : 0.0)) / PI_BN_BASE;
+
+  bn_init(&y);
+  bn_init(&e);
+  if (bn_set_u64(&y, (uint64_t)(PI_BN_BASE / lead)))
+    goto done;
+
+  for(p=1;p<prec;p=next){
+
+    next = pi_newton_next(p, prec);
+    if (bn_shift(&y, &y, (long)(next - p)) ||
+        bn_shift(&e, t, (long)next - (long)t->n) || bn_mul(&e, &e, &y) ||
+        bn_newton_step(&y, &e, next, 0))
+      goto done; }
+
+  bn_swap(r, &y);
+  status = 0;
+
+done:
+  bn_free(&y);
+  bn_free(&e);
+  return status; }
+
+/* r = sqrt(c) * B^prec, give or take a few units, for a small integer c.
+   Iterates on y = 1/sqrt(c), which needs no division, then uses
+   sqrt(c) = c * y */
+static int bn_sqrt_small(pi_bn *r, uint64_t c, size_t prec){
+
+  pi_bn y, e;
+  size_t p, next;
+  int status = -1;
+
+  bn_init(&y);
+  bn_init(&e);
+  if (bn_set_u64(&y, (uint64_t)(1e18 / sqrt((double)c))))
+    goto done;
+
+  prec++;
+  for(p=2;p<prec;p=next){
+
+    next = pi_newton_next(p, prec);
+    if (bn_shift(&y, &y, (long)(next - p)) ||
+        bn_mul(&e, &y, &y) || bn_mul_u64(&e, &e, c) ||
+        bn_newton_step(&y, &e, next, 2))
+      goto done; }
+
+  if (bn_mul_u64(&y, &y, c) || bn_shift(r, &y, -(long)(p - prec + 1)))
+    goto done;
+  status = 0;
+
+done:
+  bn_free(&y);
+  bn_free(&e);
+  return status; }
+
+/* Binary splitting over the terms [a, b) of the Chudnovsky series.
+   P is only needed by the left half of each split */
+static int pi_bs(int64_t a, int64_t b, pi_bn *P, pi_bn *Q, pi_bn *T, int need_p){
+
+  pi_bn p1, q1, t1, p2, q2, t2;
+  int64_t m;
+  int status = -1;
+
+  if (b - a == 1){
+
+    if (a == 0){
+      if (bn_set_u64(P, 1) || bn_set_u64(Q, 1))
+        return -1; }
+    else {
+      /* 10939058860032000 = 640320^3 / 24 */
+      if (bn_set_u64(P, (uint64_t)(6*a-5) * (uint64_t)(2*a-1) * (uint64_t)(6*a-1)) ||
+          bn_set_u64(Q, (uint64_t)a * (uint64_t)a * (uint64_t)a) ||
+          bn_mul_u64(Q, Q, 10939058860032000ULL))
+        return -1; }
+
+    if (bn_mul_u64(T, P, 13591409ULL + 545140134ULL * (uint64_t)a))
+      return -1;
+    T->neg = (a & 1) && T->n;
+    return 0; }
+
+  bn_init(&p1); bn_init(&q1); bn_init(&t1);
+  bn_init(&p2); bn_init(&q2); bn_init(&t2);
+
+  m = a + (b - a) / 2;
+  if (pi_bs(a, m, &p1, &q1, &t1, 1) || pi_bs(m, b, &p2, &q2, &t2, need_p))
+    goto done;
+
+  /* T = T1*Q2 + P1*T2, Q = Q1*Q2, P = P1*P2 */
+  if (bn_mul(&t1, &t1, &q2) || bn_mul(&t2, &p1, &t2) || bn_add(T, &t1, &t2) ||
+      bn_mul(Q, &q1, &q2) || (need_p && bn_mul(P, &p1, &p2)))
+    goto done;
+
+  status = 0;
+
+done:
+  bn_free(&p1); bn_free(&q1); bn_free(&t1);
+  bn_free(&p2); bn_free(&q2); bn_free(&t2);
+  return status; }
+
+/* Writes "3." followed by the first `digits` decimals of Pi and a NUL
+   into out, which must hold at least digits + 3 bytes.  Returns 0 on
+   success, -1 for invalid arguments and -2 when memory runs out */
+PI_API int pi_series_digits(int64_t digits, char *out, size_t out_size){
+
+  pi_bn P, Q, T, s;
+  size_t limbs, i, written;
+  int64_t terms;
+  long shift;
+  char block[PI_BN_DIGITS + 1];
+  int status = -2;
+
+  if (digits < 1 || digits > PI_SERIES_MAX_DIGITS || !out || out_size < (size_t)digits + 3)
+    return -1;
+
+  /* work with whole limbs of fixed-point precision plus guard digits */
+  limbs = ((size_t)digits + PI_SERIES_GUARD + PI_BN_DIGITS - 1) / PI_BN_DIGITS;
+  terms = (int64_t)((double)(limbs * PI_BN_DIGITS) / 14.181647462725477) + 2;
+
+  bn_init(&P); bn_init(&Q); bn_init(&T); bn_init(&s);
+
+  if (pi_bs(0, terms, &P, &Q, &T, 0))
+    goto done;
+
+  /* Q and T carry many more limbs than the result needs: keeping the top
+     limbs + 3 of each leaves their ratio accurate far below the last limb */
+  if (T.n > limbs + 3){
+    shift = (long)(T.n - limbs - 3);
+    if (bn_shift(&Q, &Q, -shift) || bn_shift(&T, &T, -shift))
+      goto done; }
+
+  /* with S = sqrt(10005) * B^(limbs+1) and R = B^(T.n+limbs+2) / T,
+     Pi * B^limbs = 426880 * S * Q * R / B^(T.n+limbs+3) */
+  shift = (long)(T.n + limbs + 3);
+  if (bn_sqrt_small(&s, 10005, limbs + 1) || bn_recip(&P, &T, limbs + 2) ||
+      bn_mul(&Q, &Q, &P) || bn_mul(&Q, &Q, &s) || bn_mul_u64(&Q, &Q, 426880) ||
+      bn_shift(&s, &Q, -shift))
+    goto done;
+
+  /* s now holds the limb 3 followed by `limbs` limbs of decimals */
+  out[0] = '3';
+  out[1] = '.';
+  for(written=0,i=limbs;i-->0 && written<(size_t)digits;){
+
+    sprintf(block, "%09u", (unsigned)(i < s.n ? s.d[i] : 0));
+    memcpy(out + 2 + written, block,
+           (size_t)digits - written < PI_BN_DIGITS ? (size_t)digits - written : PI_BN_DIGITS);
+    written += PI_BN_DIGITS; }
+  out[digits + 2] = '\0';
+  status = 0;
+
+done:
+  bn_free(&P); bn_free(&Q); bn_free(&T); bn_free(&s);
+  return status; }
@@ -0,0 +1,282 @@
+"""
+Python helpers around the Pi approximation C extension.
+These wrappers hide the CFFI buffer handling so callers can pass NumPy
+arrays or array.array objects straight to the C functions.
+"""
+
+import secrets
+from array import array
+from collections import namedtuple
+
+from _pi import ffi, lib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Buffer kinds accepted by _check_buffer: item size, formats, type name
+_BUFFER_KINDS = {
+    "i": (8, ("q", "l"), "int64"),
+    "f": (8, ("d",), "float64"),
+    "u8": (1, ("B", "?"), "uint8"),
+}
+
+
+def _check_buffer(obj, kind, name, writable=False):
+    """Return a memoryview of obj after checking its item type and layout.
+
+    kind is 'i' for int64 buffers, 'f' for float64 buffers and 'u8' for
+    uint8 (or bool) buffers.
+    """
+    view = memoryview(obj)
+    fmt = view.format.lstrip("@=<")
+    itemsize, expected, wanted = _BUFFER_KINDS[kind]
+    if view.itemsize != itemsize or fmt not in expected:
+        raise TypeError(f"{name} must be a buffer of {wanted} values, got format '{view.format}'")
+    if not view.c_contiguous:
+        raise ValueError(f"{name} must be C-contiguous")
+    if writable and view.readonly:
+        raise ValueError(f"{name} must be writable")
+    return view
+
+
+def _new_float64(count):
+    """Allocate a float64 result buffer, as a NumPy array when available."""
+    if np is not None:
+        return np.empty(count, dtype=np.float64)
+    return array("d", bytes(8 * count))
+
+
+def _new_uint8(count):
+    """Allocate a uint8 result buffer, as a NumPy array when available."""
+    if np is not None:
+        return np.empty(count, dtype=np.uint8)
+    return array("B", bytes(count))
+
+
+def pi_approx_batch(ns, out=None, seed=None):
+    """Compute one Pi estimate per sample count in ns with a single C call.
+
+    ns is any C-contiguous int64 buffer (a NumPy int64 array or an
+    array.array('q')). Results are written into out, a float64 buffer of
+    the same length, which is allocated when not given. Passing a seed
+    makes the whole batch reproducible. Returns out.
+    """
+    count = len(_check_buffer(ns, "i", "ns"))
+    if out is None:
+        out = _new_float64(count)
+    if len(_check_buffer(out, "f", "out", writable=True)) != count:
+        raise ValueError("out must have the same length as ns")
+
+    ns_ptr = ffi.from_buffer("int64_t[]", ns)
+    out_ptr = ffi.from_buffer("double[]", out, require_writable=True)
+    if seed is None:
+        lib.pi_approx_batch(ns_ptr, out_ptr, count)
+    else:
+        lib.pi_approx_batch_seeded(ns_ptr, out_ptr, count, seed)
+    return out
+
+
+def pi_approx_until(tolerance, confidence=0.95, max_samples=10**10, seed=None):
+    """Sample until the confidence interval half-width is at most tolerance.
+
+    Returns the C pi_until_result struct: estimate, half_width, hits,
+    samples (how many were actually drawn) and converged, which is false
+    when max_samples ran out first.
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+    if seed is None:
+        return lib.pi_approx_until(tolerance, confidence, max_samples)
+    return lib.pi_approx_until_seeded(tolerance, confidence, max_samples, seed)
+
+
+_QMC_SEQUENCES = {"sobol": lib.PI_QMC_SOBOL, "halton": lib.PI_QMC_HALTON}
+
+
+def pi_approx_qmc(n, sequence="sobol", scramble=True, seed=None):
+    """Quasi-Monte Carlo estimate of Pi from n low-discrepancy points.
+
+    sequence is 'sobol' or 'halton'. With scramble (the default) the
+    sequence is randomized from seed, so independent runs can be combined
+    or used to estimate the error; without it the result is fully
+    deterministic. Returns the C pi_result struct.
+    """
+    try:
+        kind = _QMC_SEQUENCES[sequence]
+    except KeyError:
+        raise ValueError(f"sequence must be one of {sorted(_QMC_SEQUENCES)}, got {sequence!r}") from None
+    if seed is None:
+        seed = secrets.randbits(64) if scramble else 0
+    return lib.pi_approx_qmc(n, kind, bool(scramble), seed)
+
+
+def pi_digits(digits, out=None):
+    """Exact decimal digits of Pi from the Chudnovsky series engine.
+
+    The C engine writes "3." followed by digits decimals and a NUL
+    terminator straight into out, any writable buffer of at least
+    digits + 3 bytes (a bytearray is allocated when not given), so large
+    results are not copied on the way back. Returns the digits as a str.
+    """
+    if not 1 <= digits <= lib.PI_SERIES_MAX_DIGITS:
+        raise ValueError(f"digits must be between 1 and {lib.PI_SERIES_MAX_DIGITS}")
+    if out is None:
+        out = bytearray(digits + 3)
+    view = memoryview(out).cast("B")
+    if view.readonly:
+        raise ValueError("out must be writable")
+    if len(view) < digits + 3:
+        raise ValueError(f"out must hold at least digits + 3 = {digits + 3} bytes")
+
+    status = lib.pi_series_digits(digits, ffi.from_buffer(out, require_writable=True), len(view))
+    if status == -2:
+        raise MemoryError("not enough memory for the series engine")
+    return bytes(view[:digits + 2]).decode("ascii")
+
+
+ENGINES = ("monte_carlo", "qmc", "series")
+
+
+def compute_pi(engine="monte_carlo", n=1_000_000, digits=50, seed=None, sequence="sobol"):
+    """Compute Pi with one of the engines in ENGINES.
+
+    'monte_carlo' and 'qmc' draw n sample points (QMC uses the given
+    sequence) and return the estimate as a float; seed makes them
+    reproducible. 'series' ignores n and seed and returns the first
+    digits decimals exactly, as a str.
+    """
+    if engine == "monte_carlo":
+        if seed is None:
+            return lib.pi_approx64(n).estimate
+        return lib.pi_approx64_seeded(n, seed).estimate
+    if engine == "qmc":
+        return pi_approx_qmc(n, sequence, seed=seed).estimate
+    if engine == "series":
+        return pi_digits(digits)
+    raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+
+
+def _head(buf, size):
+    """The first size items of buf, without copying."""
+    if buf is None or size == len(buf):
+        return buf
+    if np is not None and isinstance(buf, np.ndarray):
+        return buf[:size]
+    return memoryview(buf)[:size]
+
+
+SampleChunk = namedtuple("SampleChunk", ["xs", "ys", "inside", "hits", "samples"])
+
+
+def iter_sample_points(n, chunk_size=1_000_000, seed=None, xs=None, ys=None, inside=None):
+    """Stream n Monte Carlo sample points in chunks of at most chunk_size.
+
+    Yields a SampleChunk per chunk: the x and y coordinates (float64),
+    whether each point is inside the quarter circle (uint8), and the
+    running hits and samples totals. The points are written by C straight
+    into three buffers that are allocated once (or passed in as xs, ys
+    and inside, each holding at least chunk_size items) and reused for
+    every chunk, so memory stays constant however large n is. Copy what
+    you need to keep before asking for the next chunk. Pass a buffer as
+    False to skip filling it. With a seed, the points are exactly those
+    counted by pi_approx64_seeded(n, seed).
+    """
+    if n < 0:
+        raise ValueError("n must not be negative")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if seed is None:
+        seed = secrets.randbits(64)
+
+    buffers = []
+    for buf, kind, name, new in ((xs, "f", "xs", _new_float64), (ys, "f", "ys", _new_float64),
+                                 (inside, "u8", "inside", _new_uint8)):
+        if buf is False:
+            buffers.append((None, ffi.NULL))
+            continue
+        if buf is None:
+            buf = new(chunk_size)
+        if len(_check_buffer(buf, kind, name, writable=True)) < chunk_size:
+            raise ValueError(f"{name} must hold at least chunk_size items")
+        c_type = "double[]" if kind == "f" else "uint8_t[]"
+        buffers.append((buf, ffi.from_buffer(c_type, buf, require_writable=True)))
+
+    state = ffi.new("pi_sampler *")
+    lib.pi_sampler_init(state, seed)
+    (x_buf, x_ptr), (y_buf, y_ptr), (in_buf, in_ptr) = buffers
+    done = 0
+    while done < n:
+        size = min(chunk_size, n - done)
+        lib.pi_sample_points(size, x_ptr, y_ptr, in_ptr, state)
+        done += size
+        yield SampleChunk(*(_head(buf, size) for buf in (x_buf, y_buf, in_buf)), state.hits, state.samples)
+
+
+class PiEstimator:
+    """Incremental, mergeable Monte Carlo estimate backed by a C struct.
+
+    The hit and sample counters are exact integers, so a run can be
+    extended with add_samples() at any time, and estimators computed on
+    other threads or machines (with their own seeds) can be combined
+    exactly with merge(). Instances pickle, so they can be sent between
+    processes.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = secrets.randbits(64)
+        self._state = ffi.new("pi_estimator *")
+        lib.pi_estimator_init(self._state, seed)
+
+    @classmethod
+    def _from_counts(cls, hits, samples, seed, streams):
+        estimator = cls(seed)
+        estimator._state.hits = hits
+        estimator._state.samples = samples
+        estimator._state.streams = streams
+        return estimator
+
+    def __reduce__(self):
+        state = self._state
+        return (PiEstimator._from_counts, (state.hits, state.samples, state.seed, state.streams))
+
+    def __repr__(self):
+        return f"PiEstimator(hits={self.hits}, samples={self.samples}, estimate={self.estimate()})"
+
+    @property
+    def hits(self):
+        return self._state.hits
+
+    @property
+    def samples(self):
+        return self._state.samples
+
+    @property
+    def seed(self):
+        return self._state.seed
+
+    def add_samples(self, n):
+        """Draw n more samples into the running totals. Returns self."""
+        lib.pi_estimator_add_samples(self._state, n)
+        return self
+
+    def merge(self, other):
+        """Add the counters of other into this estimator. Returns self."""
+        lib.pi_estimator_merge(self._state, other._state)
+        return self
+
+    def estimate(self):
+        """Current estimate of Pi, 4 * hits / samples (0.0 before any sample)."""
+        return lib.pi_estimator_estimate(self._state)
+
+    def confidence_interval(self, confidence=0.95):
+        """Return the (low, high) normal confidence interval of the estimate."""
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("confidence must be between 0 and 1")
+        interval = lib.pi_estimator_interval(self._state, confidence)
+        return (interval.low, interval.high)
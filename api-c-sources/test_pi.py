@@ -44,12 +44,488 @@ def test_extension():
     
     return True
 
+def test_seeded_extension():
+    """Test that the seeded variant is reproducible."""
+    try:
+        from _pi.lib import pi_approx_seeded
+        
+        print("\nTesting seeded Pi approximation...")
+        
+        first = pi_approx_seeded(100000, 42)
+        second = pi_approx_seeded(100000, 42)
+        print(f"Seeded Pi approximation with 100000 iterations: {first}")
+        assert first == second, f"Expected identical results for the same seed, got {first} and {second}"
+        assert str(first).startswith("3.1"), f"Expected result to start with '3.1', got {first}"
+        
+        other = pi_approx_seeded(100000, 43)
+        print(f"Same run with another seed: {other}")
+        assert first != other, "Expected different seeds to give different results"
+        
+        print("All seeded tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_parallel_extension():
+    """Test that the multi-threaded variant is independent of the thread count."""
+    try:
+        from _pi.lib import pi_approx_parallel
+        
+        print("\nTesting parallel Pi approximation...")
+        
+        single = pi_approx_parallel(5000000, 1, 42)
+        multi = pi_approx_parallel(5000000, 4, 42)
+        print(f"Parallel Pi approximation with 5000000 iterations: {multi}")
+        assert single == multi, f"Expected the same result for 1 and 4 threads, got {single} and {multi}"
+        assert str(multi).startswith("3.14"), f"Expected result to start with '3.14', got {multi}"
+        
+        automatic = pi_approx_parallel(5000000, 0, 42)
+        assert automatic == multi, "Expected threads=0 (one per CPU) to give the same result"
+        
+        print("All parallel tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_64bit_extension():
+    """Test the 64-bit variant with exact counters."""
+    try:
+        from _pi.lib import pi_approx64, pi_approx64_seeded
+        
+        print("\nTesting 64-bit Pi approximation...")
+        
+        n = 3000000
+        result = pi_approx64_seeded(n, 42)
+        print(f"64-bit Pi approximation with {n} iterations: {result.estimate} ({result.hits} hits)")
+        assert result.samples == n, f"Expected {n} samples, got {result.samples}"
+        assert result.estimate == 4 * result.hits / n, "Expected the estimate to be exactly 4 * hits / samples"
+        assert str(result.estimate).startswith("3.14"), f"Expected result to start with '3.14', got {result.estimate}"
+        assert pi_approx64_seeded(n, 42).hits == result.hits, "Expected identical hit counts for the same seed"
+        
+        unseeded = pi_approx64(100000)
+        assert unseeded.samples == 100000, f"Expected 100000 samples, got {unseeded.samples}"
+        assert 0 <= unseeded.hits <= 100000, f"Hit count out of range: {unseeded.hits}"
+        
+        print("All 64-bit tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_batch_extension():
+    """Test computing many estimates with one call."""
+    try:
+        from array import array
+        from pi_wrapper import pi_approx_batch
+        
+        print("\nTesting batched Pi approximation...")
+        
+        ns = array('q', [1000, 5000, 10000, 0, 100000])
+        results = pi_approx_batch(ns, seed=42)
+        print(f"Batched Pi approximations: {list(results)}")
+        assert len(results) == len(ns), f"Expected {len(ns)} results, got {len(results)}"
+        assert results[3] == 0.0, f"Expected 0.0 for an empty run, got {results[3]}"
+        assert str(results[4]).startswith("3.1"), f"Expected result to start with '3.1', got {results[4]}"
+        
+        out = array('d', [0.0] * len(ns))
+        assert pi_approx_batch(ns, out, seed=42) is out, "Expected results to be written into out"
+        assert list(out) == list(results), "Expected identical results for the same seed"
+        
+        try:
+            pi_approx_batch(array('i', [1000]))
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Expected an int32 buffer to be rejected")
+        
+        print("All batch tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_estimator_extension():
+    """Test extending and merging estimator state."""
+    try:
+        import pickle
+        from pi_wrapper import PiEstimator
+        
+        print("\nTesting incremental Pi estimator...")
+        
+        first = PiEstimator(seed=1).add_samples(200000)
+        second = PiEstimator(seed=2).add_samples(300000)
+        hits = first.hits + second.hits
+        
+        first.merge(second)
+        print(f"Merged estimator: {first}")
+        assert first.samples == 500000, f"Expected 500000 samples, got {first.samples}"
+        assert first.hits == hits, f"Expected merged hits to be exactly {hits}, got {first.hits}"
+        assert first.estimate() == 4 * hits / 500000, "Expected the estimate to be exactly 4 * hits / samples"
+        
+        low, high = first.confidence_interval(0.99)
+        print(f"99% confidence interval: [{low:.6f}, {high:.6f}]")
+        assert low < first.estimate() < high, "Expected the estimate inside its interval"
+        assert low < 3.141592653589793 < high, "Expected Pi inside the 99% interval"
+        
+        copy = pickle.loads(pickle.dumps(first))
+        copy.add_samples(1000)
+        first.add_samples(1000)
+        assert copy.hits == first.hits, "Expected a pickled estimator to continue the same streams"
+        
+        print("All estimator tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_until_extension():
+    """Test the adaptive-precision mode."""
+    try:
+        from pi_wrapper import pi_approx_until
+        
+        print("\nTesting adaptive-precision Pi approximation...")
+        
+        result = pi_approx_until(0.001, 0.95, seed=42)
+        print(f"Pi ≈ {result.estimate:.6f} ± {result.half_width:.6f} after {result.samples} samples")
+        assert result.converged, "Expected the run to reach the tolerance"
+        assert result.half_width <= 0.001, f"Expected half-width <= 0.001, got {result.half_width}"
+        assert result.estimate == 4 * result.hits / result.samples, "Expected the estimate to match the counters"
+        
+        capped = pi_approx_until(0.00001, 0.95, max_samples=100000, seed=42)
+        assert capped.samples == 100000, f"Expected the run to stop at 100000 samples, got {capped.samples}"
+        assert not capped.converged, "Expected the capped run not to reach the tolerance"
+        
+        print("All adaptive-precision tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_distributed_extension():
+    """Test the process-pool driver."""
+    try:
+        from distributed_pi import estimate_pi
+        
+        print("\nTesting distributed Pi approximation...")
+        
+        updates = []
+        result = estimate_pi(2000000, chunk_size=300000, workers=2, seed=42,
+                             progress=lambda done, total: updates.append(done))
+        print(f"Distributed Pi approximation with 2000000 iterations: {result.estimate} ({result.chunks} chunks)")
+        assert result.samples == 2000000, f"Expected 2000000 samples, got {result.samples}"
+        assert result.chunks == 7, f"Expected 7 chunks, got {result.chunks}"
+        assert updates[-1] == 2000000, f"Expected the last progress update to cover all samples, got {updates}"
+        assert len(updates) == result.chunks, "Expected one progress update per chunk"
+        
+        again = estimate_pi(2000000, chunk_size=300000, workers=1, seed=42)
+        assert again.hits == result.hits, "Expected the same master seed to give the same hits with any worker count"
+        
+        print("All distributed tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_async_extension():
+    """Test the asyncio wrapper, including cancellation."""
+    try:
+        import asyncio
+        from _pi import lib
+        from async_pi import pi_approx_async
+
+        print("\nTesting async Pi approximation...")
+        
+        async def run():
+            snapshots = []
+            limiter = asyncio.Semaphore(2)
+            result = await pi_approx_async(1000000, chunk_size=150000, seed=42, concurrency=3,
+                                           limiter=limiter, progress=snapshots.append)
+            assert result.samples == 1000000, f"Expected 1000000 samples, got {result.samples}"
+            assert 1 <= len(snapshots) <= 7, f"Expected at most one snapshot per chunk, got {len(snapshots)}"
+            assert snapshots[-1] == result, "Expected the last snapshot to be the result"
+            
+            again = await pi_approx_async(1000000, chunk_size=150000, seed=42)
+            assert again.hits == result.hits, "Expected the same seed to give the same hits"
+
+            class SeededOnly:
+                pi_approx64_seeded = staticmethod(lib.pi_approx64_seeded)
+
+            seeded_only = await pi_approx_async(1000000, chunk_size=150000, seed=42, lib=SeededOnly())
+            assert seeded_only.hits == result.hits, "Expected a lib with only pi_approx64_seeded to work"
+
+            task = asyncio.ensure_future(pi_approx_async(10**10, chunk_size=100000))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            else:
+                raise AssertionError("Expected the task to be cancelled")
+            return result
+        
+        result = asyncio.run(run())
+        print(f"Async Pi approximation with 1000000 iterations: {result.estimate}")
+        print("All async tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_budget_extension():
+    """Test time-budgeted sampling in C and its async wrapper."""
+    try:
+        import asyncio
+        import time
+        from _pi import lib
+        from async_pi import pi_approx_within
+        
+        print("\nTesting time-budgeted Pi approximation...")
+        
+        start = time.monotonic()
+        result = lib.pi_approx_for_seeded(20000000, 42)
+        elapsed = time.monotonic() - start
+        assert result.samples > 0, "Expected samples within a 20 ms budget"
+        assert elapsed < 0.2, f"Expected to stop near the 20 ms deadline, took {elapsed:.3f}s"
+        assert abs(result.estimate - 3.14159265) < 0.05, f"Expected an estimate near Pi, got {result.estimate}"
+        assert result.estimate == 4 * result.hits / result.samples, "Expected the estimate to match the counters"
+        
+        shorter = lib.pi_approx_for_seeded(1000000, 42)
+        assert shorter.samples <= result.samples, "Expected a shorter budget to draw fewer samples"
+        
+        empty = lib.pi_approx_for(0)
+        assert empty.samples == 0 and empty.hits == 0, "Expected no samples for a zero budget"
+        
+        async def run():
+            limiter = asyncio.Semaphore(1)
+            return await asyncio.gather(pi_approx_within(0.01, seed=7, limiter=limiter),
+                                        pi_approx_within(0.01, seed=8, limiter=limiter))
+        
+        first, second = asyncio.run(run())
+        assert first.samples > 0, "Expected the first request to sample"
+        assert first.elapsed < 0.1 and second.elapsed < 0.1, "Expected both requests to respect the deadline"
+        assert second.samples < first.samples, "Expected the queued request to lose budget waiting"
+        
+        try:
+            asyncio.run(pi_approx_within(0.01, lib=object()))
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Expected a lib without pi_approx_for_seeded to be rejected")
+        print(f"20 ms budget: {result.samples} samples, Pi approx: {result.estimate}")
+        print("All time-budget tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_qmc_extension():
+    """Test the quasi-Monte Carlo sampling modes."""
+    try:
+        from pi_wrapper import pi_approx_qmc
+        
+        print("\nTesting quasi-Monte Carlo Pi approximation...")
+        
+        for sequence in ("sobol", "halton"):
+            result = pi_approx_qmc(1000000, sequence, scramble=False)
+            error = abs(result.estimate - 3.141592653589793)
+            print(f"{sequence:6s} with 1000000 points: {result.estimate} (error {error:.2e})")
+            assert error < 0.001, f"Expected {sequence} error below 0.001, got {error}"
+            
+            scrambled = pi_approx_qmc(100000, sequence, scramble=True, seed=7)
+            again = pi_approx_qmc(100000, sequence, scramble=True, seed=7)
+            assert scrambled.hits == again.hits, "Expected the same scramble seed to give the same hits"
+        
+        try:
+            pi_approx_qmc(1000, "random")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Expected an unknown sequence to be rejected")
+        
+        print("All quasi-Monte Carlo tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_series_extension():
+    """Test the Chudnovsky series engine against Machin's formula."""
+    try:
+        from pi_wrapper import compute_pi, pi_digits
+        
+        print("\nTesting the series (Chudnovsky) engine...")
+        
+        def arctan_inv(x, scale):
+            # arctan(1/x) * scale with plain integers
+            total = term = scale // x
+            k = 1
+            while term:
+                term //= x * x
+                k += 2
+                total += term // k if k % 4 == 1 else -(term // k)
+            return total
+        
+        digits = 1000
+        scale = 10 ** (digits + 10)
+        machin = str(4 * (4 * arctan_inv(5, scale) - arctan_inv(239, scale)))
+        expected = "3." + machin[1:digits + 1]
+        
+        result = pi_digits(digits)
+        print(f"First 50 digits: {result[:52]}")
+        assert result == expected, "Series digits differ from Machin's formula"
+        
+        buf = bytearray(digits + 3)
+        assert pi_digits(digits, buf) == expected and buf[-1] == 0, "Expected the digits in the caller buffer"
+        assert compute_pi("series", digits=20) == expected[:22], "Expected the series engine through compute_pi"
+        assert abs(compute_pi("qmc", n=100000, seed=1) - 3.14159) < 0.01, "Expected a QMC estimate near Pi"
+        
+        try:
+            pi_digits(10, bytearray(12))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Expected a too small buffer to be rejected")
+        
+        print("All series engine tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_cache_extension():
+    """Test the memoizing result cache."""
+    try:
+        import tempfile
+        import threading
+        import time
+        from pi_cache import PiCache
+        from pi_wrapper import compute_pi
+        
+        print("\nTesting the result cache...")
+        
+        cache = PiCache(maxsize=2)
+        first = cache.compute("monte_carlo", n=2000000, seed=42)
+        start = time.perf_counter()
+        again = cache.compute("monte_carlo", n=2000000, seed=42)
+        elapsed = time.perf_counter() - start
+        print(f"Cached estimate: {again} returned in {elapsed * 1e6:.1f} us")
+        assert first == again == compute_pi("monte_carlo", n=2000000, seed=42), "Expected the cached value"
+        
+        cache.compute("series", digits=100)
+        cache.compute("qmc", n=1000, seed=1)          # evicts the Monte Carlo entry
+        cache.compute("monte_carlo", n=1000)          # unseeded: never cached
+        info = cache.cache_info()
+        print(f"Cache info: {info}")
+        assert (info.hits, info.misses, info.uncached, info.currsize) == (1, 3, 1, 2), "Unexpected cache counters"
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pi_cache.sqlite")
+            with PiCache(path=path) as disk:
+                disk.compute("series", digits=200)
+            with PiCache(path=path) as disk:
+                assert disk.compute("series", digits=200) == compute_pi("series", digits=200)
+                assert disk.cache_info().disk_hits == 1, "Expected the result from the on-disk store"
+        
+        # Concurrent identical requests run the computation once
+        calls = []
+        
+        def slow_compute(*args, **kwargs):
+            calls.append(args)
+            time.sleep(0.05)
+            return 3.0
+        
+        shared = PiCache(compute=slow_compute)
+        threads = [threading.Thread(target=shared.compute, kwargs={"n": 10, "seed": 1}) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1, f"Expected one computation for 8 identical requests, got {len(calls)}"
+        
+        print("All result cache tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
+def test_sample_points_extension():
+    """Test streaming the sample points into preallocated buffers."""
+    try:
+        from array import array
+        from _pi import lib
+        from pi_wrapper import iter_sample_points
+        
+        print("\nTesting sample point export...")
+        
+        xs = array("d", bytes(8 * 1000))
+        chunks = 0
+        for chunk in iter_sample_points(2500, chunk_size=1000, seed=11, xs=xs):
+            chunks += 1
+            points = list(zip(chunk.xs, chunk.ys, chunk.inside))
+            assert all(0.0 <= x < 1.0 and 0.0 <= y < 1.0 for x, y, _ in points), "Expected points in the unit square"
+            assert all(inside == (x * x + y * y < 1.0) for x, y, inside in points), "Expected consistent inside flags"
+        
+        print(f"Streamed {chunk.samples} points in {chunks} chunks, {chunk.hits} inside")
+        assert chunks == 3 and chunk.samples == 2500, "Expected 3 chunks covering every sample"
+        assert chunk.hits == lib.pi_approx64_seeded(2500, 11).hits, "Expected the points of pi_approx64_seeded"
+        
+        only_flags = next(iter_sample_points(10, chunk_size=10, seed=1, xs=False, ys=False))
+        assert only_flags.xs is None and only_flags.ys is None and len(only_flags.inside) == 10
+        
+        print("All sample point tests passed!")
+        
+    except ImportError as e:
+        print(f"Error importing the extension: {e}")
+        print("Make sure to build the extension first by running: python pi_extension_build.py")
+        raise
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--test-only":
         # Only test, don't build
         test_extension()
+        test_seeded_extension()
+        test_parallel_extension()
+        test_64bit_extension()
+        test_batch_extension()
+        test_estimator_extension()
+        test_until_extension()
+        test_distributed_extension()
+        test_async_extension()
+        test_budget_extension()
+        test_qmc_extension()
+        test_series_extension()
+        test_cache_extension()
+        test_sample_points_extension()
     else:
         # Build and then test
         build_extension()
         print("\n" + "="*50)
         test_extension()
+        test_seeded_extension()
+        test_parallel_extension()
+        test_64bit_extension()
+        test_batch_extension()
+        test_estimator_extension()
+        test_until_extension()
+        test_distributed_extension()
+        test_async_extension()
+        test_budget_extension()
+        test_qmc_extension()
+        test_series_extension()
+        test_cache_extension()
+        test_sample_points_extension()
@@ -62,6 +62,106 @@ def demonstrate_array_operations():
     correct = all(buffer_out[i] == buffer_in[i] * multiplier for i in range(min(10, size)))
     print(f"Multiplication correct (first 10 elements): {correct}")
 
+def demonstrate_typed_sums():
+    """Demonstrate the typed, overflow-safe reductions."""
+    print("\n=== Typed Sums Demo ===")
+    
+    # int32 values whose total does not fit in 32 bits
+    values = [2**31 - 1] * 4
+    buffer_i32 = ffi.new("int32_t[]", values)
+    print(f"array_sum (32-bit total):     {lib.array_sum(ffi.cast('int *', buffer_i32), len(values))}")
+    print(f"array_sum_i32 (64-bit total): {lib.array_sum_i32(buffer_i32, len(values))}")
+    print(f"Python sum:                   {sum(values)}")
+    
+    # int64 sums flag results that do not fit
+    overflow = ffi.new("int *")
+    buffer_i64 = ffi.new("int64_t[]", [2**62] * 4)
+    lib.array_sum_i64(buffer_i64, 4, overflow)
+    print(f"\nSum of 4 x 2^62 overflows int64: {bool(overflow[0])}")
+    
+    # Pairwise float sums
+    size = 1000000
+    buffer_f64 = ffi.new("double[]", [0.1] * size)
+    print(f"\nSum of {size} x 0.1: {lib.array_sum_f64(buffer_f64, size)!r} (pairwise)")
+    print(f"Naive Python loop:  {sum([0.1] * size)!r}")
+
+def demonstrate_zero_copy():
+    """Demonstrate passing whole buffers to C without a Python loop."""
+    print("\n=== Zero-copy Buffers Demo ===")
+    import example_wrapper
+    from array import array
+    
+    size = 1000000
+    values = array("i", range(size))   # any buffer-protocol object works
+    
+    start_time = time.time()
+    total = example_wrapper.array_sum(values)
+    tripled = example_wrapper.array_multiply(values, 3)
+    c_time = time.time() - start_time
+    
+    print(f"Sum of {size} elements: {total} (no per-element copy)")
+    print(f"First 5 multiplied by 3: {[int(v) for v in tripled[:5]]} ({type(tripled).__name__} over C memory)")
+    print(f"C time for sum + multiply: {c_time:.6f}s")
+
+def demonstrate_fused_kernels():
+    """Demonstrate in-place and fused element-wise kernels."""
+    print("\n=== Fused Element-wise Demo ===")
+    import example_wrapper
+    from array import array
+    
+    size = 1000000
+    x = array("d", [i / size for i in range(size)])
+    y = array("d", [1.0]) * size
+    
+    start_time = time.time()
+    example_wrapper.axpy(2.0, x, y)                            # y += 2x, in place
+    example_wrapper.scale_add_clamp(y, 0.5, 0.0, 0.6, 1.2, out=y)    # one pass, no temporaries
+    c_time = time.time() - start_time
+    
+    print(f"clamp(0.5 * (1 + 2x), 0.6, 1.2) at x = 0, 0.5, 1: {y[0]}, {y[size // 2]}, {y[-1]}")
+    print(f"C time for axpy + scale_add_clamp over {size} elements: {c_time:.6f}s")
+
+def demonstrate_parallel():
+    """Demonstrate one call spreading a large array over every core."""
+    print("\n=== Multi-threaded Kernels Demo ===")
+    import example_wrapper
+    from array import array
+    
+    size = 10000000
+    values = array("d", [0.5]) * size
+    
+    timings = []
+    for threads in (1, 0):
+        previous = example_wrapper.set_threads(threads)
+        start_time = time.time()
+        total = example_wrapper.array_sum(values)
+        timings.append((example_wrapper.threads(), time.time() - start_time))
+        example_wrapper.set_threads(previous)
+    
+    print(f"Sum of {size} x 0.5: {total} (same result on any thread count)")
+    print(f"C time on 1 thread: {timings[0][1]:.6f}s")
+    print(f"C time on {timings[1][0]} thread(s), one per CPU: {timings[1][1]:.6f}s")
+    print(f"Arrays of at least {example_wrapper.parallel_threshold()} elements are split across threads")
+
+def demonstrate_stats_and_scans():
+    """Demonstrate one-pass summary statistics and prefix sums."""
+    print("\n=== Statistics and Prefix Sums Demo ===")
+    import example_wrapper
+    from array import array
+    
+    size = 1000000
+    values = array("d", (float(i % 1000) for i in range(size)))
+    
+    start_time = time.time()
+    stats = example_wrapper.array_stats(values)
+    c_time = time.time() - start_time
+    print(f"min {stats.min}, max {stats.max}, mean {stats.mean:.4f}, variance {stats.variance:.2f}")
+    print(f"C time for all four statistics in one pass: {c_time:.6f}s")
+    
+    counts = array("i", [3, 1, 4, 1, 5])
+    offsets = example_wrapper.prefix_sum(counts, exclusive=True)
+    print(f"Offsets of groups of sizes {list(counts)}: {[int(v) for v in offsets]} (exclusive scan)")
+
 def demonstrate_fibonacci():
     """Demonstrate fast fibonacci calculation."""
     print("\n=== Fibonacci Demo ===")
@@ -106,6 +206,11 @@ def main():
     
     try:
         demonstrate_array_operations()
+        demonstrate_typed_sums()
+        demonstrate_zero_copy()
+        demonstrate_fused_kernels()
+        demonstrate_parallel()
+        demonstrate_stats_and_scans()
         demonstrate_fibonacci()
         
         print("\n=== Summary ===")
@@ -4,6 +4,7 @@
 
 from cffi import FFI
 import os
+import sys
 
 ffibuilder = FFI()
 
@@ -12,25 +13,90 @@ ffibuilder.cdef("""
     int array_sum(int *buffer_in, int size);
     void array_multiply(int *buffer_in, int *buffer_out, int size, int multiplier);
     int fibonacci(int n);
+
+    // Typed reductions with size_t lengths
+    int64_t array_sum_i32(const int32_t *buffer_in, size_t size);
+    int64_t array_sum_i64(const int64_t *buffer_in, size_t size, int *overflow);
+    double array_sum_f32(const float *buffer_in, size_t size);
+    double array_sum_f64(const double *buffer_in, size_t size);
+
+    // In-place and fused element-wise kernels: one pass over memory
+    void array_multiply_inplace(int *buffer, size_t size, int multiplier);
+    void array_scale_f32(float *x, size_t size, float a);
+    void array_scale_f64(double *x, size_t size, double a);
+    void array_axpy_f32(float a, const float *x, float *y, size_t size);
+    void array_axpy_f64(double a, const double *x, double *y, size_t size);
+    void array_scale_add_clamp_f32(const float *x, float *out, size_t size,
+                                   float scale, float offset, float lo, float hi);
+    void array_scale_add_clamp_f64(const double *x, double *out, size_t size,
+                                   double scale, double offset, double lo, double hi);
+    void array_multiply_accumulate_f32(const float *a, const float *b, float *acc, size_t size);
+    void array_multiply_accumulate_f64(const double *a, const double *b, double *acc, size_t size);
+
+    // One-pass summary statistics: Welford's running mean and sum of
+    // squared deviations (m2), mergeable across chunks
+    typedef struct {
+        size_t count;
+        double min, max, mean;
+        double variance;    // population variance, m2 / count
+        double m2;          // sum of squared deviations from the mean
+    } array_stats;
+
+    array_stats array_stats_i32(const int32_t *buffer_in, size_t size);
+    array_stats array_stats_i64(const int64_t *buffer_in, size_t size);
+    array_stats array_stats_f32(const float *buffer_in, size_t size);
+    array_stats array_stats_f64(const double *buffer_in, size_t size);
+    void array_stats_merge(array_stats *into, const array_stats *other);
+
+    // Inclusive or exclusive prefix sums, in int64 or double
+    void array_scan_i32(const int32_t *buffer_in, int64_t *out, size_t size, int exclusive);
+    void array_scan_i64(const int64_t *buffer_in, int64_t *out, size_t size, int exclusive);
+    void array_scan_f32(const float *buffer_in, double *out, size_t size, int exclusive);
+    void array_scan_f64(const double *buffer_in, double *out, size_t size, int exclusive);
+
+    // Parallel execution settings for every array kernel above
+    int array_set_threads(int threads);
+    int array_threads(void);
+    size_t array_set_parallel_threshold(size_t size);
+    size_t array_parallel_threshold(void);
 """)
 
+# Optimize the kernels regardless of how Python itself was built: -O3 lets
+# GCC and Clang vectorize the multi-lane loops (MSVC does so at /O2)
+if sys.platform == "win32":
+    EXTRA_COMPILE_ARGS = ['/O2']
+else:
+    EXTRA_COMPILE_ARGS = ['-O3']
+
+# The array kernels run on native threads: Windows threads are part of the
+# C runtime, elsewhere link with pthreads
+LIBRARIES = [] if sys.platform == "win32" else ['pthread']
+
 # Set the source code - this C code will be compiled into the extension
 ffibuilder.set_source("_example",
 r"""
-    // Fast array sum implementation in C
-    static int array_sum(int *buffer_in, int size)
-    {
-        int sum = 0;
-        for (int i = 0; i < size; i++) {
-            sum += buffer_in[i];
-        }
-        return sum;
-    }
-    
+    #include <stdint.h>
+    #include <stddef.h>
+    #include <stdlib.h>
+    #include <math.h>
+
+    #ifdef _WIN32
+    #define WIN32_LEAN_AND_MEAN
+    #include <windows.h>
+    #else
+    #include <pthread.h>
+    #include <unistd.h>
+    #endif
+
+    // The array_* functions below are thin front ends: each one describes
+    // its work as a parallel_task and hands it to parallel_run (at the end
+    // of this file), which runs the single-threaded loop defined here on
+    // chunks of the input.
+
     // Array multiplication - multiply each element and store in output buffer
-    static void array_multiply(int *buffer_in, int *buffer_out, int size, int multiplier)
+    static void multiply_int(const int *buffer_in, int *buffer_out, size_t size, int multiplier)
     {
-        for (int i = 0; i < size; i++) {
+        for (size_t i = 0; i < size; i++) {
             buffer_out[i] = buffer_in[i] * multiplier;
         }
     }
@@ -48,7 +114,849 @@ r"""
         }
         return b;
     }
-""")
+
+    // Typed reductions.  The loops keep SUM_LANES independent
+    // accumulators so that the compiler can map them onto SIMD registers
+    // without reassociating anything itself: the results do not depend on
+    // the instruction set.
+    #define SUM_LANES 8
+
+    // int32 values summed into int64: exact for any array below 2^32
+    // elements, where even the extreme values cannot reach 2^63
+    static int64_t sum_i32(const int32_t *buffer_in, size_t size)
+    {
+        int64_t acc[SUM_LANES] = {0};
+        int64_t sum = 0;
+        size_t i = 0;
+
+        for (; i + SUM_LANES <= size; i += SUM_LANES) {
+            for (int j = 0; j < SUM_LANES; j++) {
+                acc[j] += buffer_in[i + j];
+            }
+        }
+        for (; i < size; i++) {
+            sum += buffer_in[i];
+        }
+        for (int j = 0; j < SUM_LANES; j++) {
+            sum += acc[j];
+        }
+        return sum;
+    }
+
+    // int64 values summed exactly in 128 bits: a low word plus a high
+    // word that collects carries and sign extensions.  The sum of the
+    // buffer is added to (*low, *high).
+    static void add_wide(uint64_t *low, int64_t *high, uint64_t lo, int64_t hi)
+    {
+        uint64_t s = *low + lo;
+        *high += hi + (int64_t)(s < *low);
+        *low = s;
+    }
+
+    static void sum_i64_wide(const int64_t *buffer_in, size_t size, uint64_t *low, int64_t *high)
+    {
+        uint64_t lo[SUM_LANES] = {0};
+        int64_t hi[SUM_LANES] = {0};
+        size_t i = 0;
+
+        for (; i + SUM_LANES <= size; i += SUM_LANES) {
+            for (int j = 0; j < SUM_LANES; j++) {
+                uint64_t s = lo[j] + (uint64_t)buffer_in[i + j];
+                hi[j] += (int64_t)(s < lo[j]) - (int64_t)(buffer_in[i + j] < 0);
+                lo[j] = s;
+            }
+        }
+        for (; i < size; i++) {
+            add_wide(low, high, (uint64_t)buffer_in[i], buffer_in[i] < 0 ? -1 : 0);
+        }
+        for (int j = 0; j < SUM_LANES; j++) {
+            add_wide(low, high, lo[j], hi[j]);
+        }
+    }
+
+    // Floating-point sums are pairwise: blocks of PAIRWISE_BLOCK values
+    // are summed across the lanes, and blocks are combined in a balanced
+    // tree, so the rounding error grows with log(n) instead of n.  float
+    // input is accumulated in double.
+    #define PAIRWISE_BLOCK 128
+
+    static size_t pairwise_split(size_t size)
+    {
+        return (size / 2) / SUM_LANES * SUM_LANES;
+    }
+
+    #define DEFINE_PAIRWISE_SUM(name, type)                                  \
+    static double name(const type *x, size_t size)                          \
+    {                                                                       \
+        if (size > PAIRWISE_BLOCK) {                                        \
+            size_t half = pairwise_split(size);                             \
+            return name(x, half) + name(x + half, size - half);             \
+        }                                                                   \
+        double acc[SUM_LANES] = {0};                                        \
+        double sum = 0;                                                     \
+        size_t i = 0;                                                       \
+        for (; i + SUM_LANES <= size; i += SUM_LANES) {                     \
+            for (int j = 0; j < SUM_LANES; j++) {                           \
+                acc[j] += (double)x[i + j];                                 \
+            }                                                               \
+        }                                                                   \
+        for (; i < size; i++) {                                             \
+            sum += (double)x[i];                                            \
+        }                                                                   \
+        return ((acc[0] + acc[1]) + (acc[2] + acc[3])) +                    \
+               ((acc[4] + acc[5]) + (acc[6] + acc[7])) + sum;               \
+    }
+
+    DEFINE_PAIRWISE_SUM(pairwise_sum_f32, float)
+    DEFINE_PAIRWISE_SUM(pairwise_sum_f64, double)
+
+    // array_multiply without the separate output buffer
+    static void multiply_inplace(int *buffer, size_t size, int multiplier)
+    {
+        for (size_t i = 0; i < size; i++) {
+            buffer[i] *= multiplier;
+        }
+    }
+
+    // Element-wise kernels that would otherwise take several passes (and
+    // temporaries) when chained from Python.  Each reads and writes every
+    // element once.  Output may be the same buffer as an input (in-place),
+    // since element i only depends on element i of the inputs.
+    //   scale:               x = a * x
+    //   axpy:                y = a * x + y
+    //   scale_add_clamp:     out = min(max(x * scale + offset, lo), hi)
+    //   multiply_accumulate: acc = acc + a * b
+    // Clamping keeps NaN as NaN.
+    #define DEFINE_ELEMENTWISE(suffix, type)                                 \
+    static void scale_##suffix(type *x, size_t size, type a)                \
+    {                                                                       \
+        for (size_t i = 0; i < size; i++) {                                 \
+            x[i] *= a;                                                      \
+        }                                                                   \
+    }                                                                       \
+    static void axpy_##suffix(type a, const type *x, type *y, size_t size)  \
+    {                                                                       \
+        for (size_t i = 0; i < size; i++) {                                 \
+            y[i] += a * x[i];                                               \
+        }                                                                   \
+    }                                                                       \
+    static void scale_add_clamp_##suffix(const type *x, type *out,          \
+            size_t size, type scale, type offset, type lo, type hi)         \
+    {                                                                       \
+        for (size_t i = 0; i < size; i++) {                                 \
+            type v = x[i] * scale + offset;                                 \
+            v = v < lo ? lo : v;                                            \
+            out[i] = v > hi ? hi : v;                                       \
+        }                                                                   \
+    }                                                                       \
+    static void multiply_accumulate_##suffix(const type *a,                 \
+            const type *b, type *acc, size_t size)                          \
+    {                                                                       \
+        for (size_t i = 0; i < size; i++) {                                 \
+            acc[i] += a[i] * b[i];                                          \
+        }                                                                   \
+    }
+
+    DEFINE_ELEMENTWISE(f32, float)
+    DEFINE_ELEMENTWISE(f64, double)
+
+    // Summary statistics.  Each of the SUM_LANES lanes runs Welford's
+    // update on every SUM_LANES-th value, so the division is shared by the
+    // lanes and the loop vectorizes; lanes, chunks and single values are
+    // then combined with Chan's formula for merging two (count, mean, m2)
+    // triples.  min and max propagate NaN, like the mean does.
+    typedef struct {
+        size_t count;
+        double min, max, mean;
+        double variance;
+        double m2;
+    } array_stats;
+
+    static void stats_merge(array_stats *into, const array_stats *other)
+    {
+        if (other->count == 0) {
+            return;
+        }
+        if (into->count == 0) {
+            *into = *other;
+            return;
+        }
+        double n = (double)into->count + (double)other->count;
+        double d = other->mean - into->mean;
+        into->mean += d * ((double)other->count / n);
+        into->m2 += other->m2 + d * d * ((double)into->count * (double)other->count / n);
+        into->min = other->min < into->min || other->min != other->min ? other->min : into->min;
+        into->max = other->max > into->max || other->max != other->max ? other->max : into->max;
+        into->count += other->count;
+    }
+
+    // Fills in the variance; every statistic of an empty array is NaN.
+    // The Welford updates turn infinite values into inf - inf = NaN, so
+    // mean and variance are then derived from min and max, as NumPy
+    // would give them: the mean is +-inf if infinities of one sign are
+    // present and NaN otherwise, and the variance is NaN.
+    static void stats_finish(array_stats *stats)
+    {
+        if (stats->count == 0) {
+            stats->min = stats->max = stats->mean = stats->variance = NAN;
+            stats->m2 = 0;
+            return;
+        }
+        if (isinf(stats->min) || isinf(stats->max) || stats->min != stats->min) {
+            if (stats->min != stats->min || (stats->min == -INFINITY && stats->max == INFINITY)) {
+                stats->mean = NAN;
+            } else {
+                stats->mean = stats->max == INFINITY ? INFINITY : -INFINITY;
+            }
+            stats->m2 = stats->variance = NAN;
+            return;
+        }
+        stats->variance = stats->m2 / (double)stats->count;
+    }
+
+    #define DEFINE_STATS(suffix, type)                                       \
+    static array_stats stats_##suffix(const type *x, size_t size)           \
+    {                                                                       \
+        double mean[SUM_LANES] = {0}, m2[SUM_LANES] = {0};                  \
+        double lo[SUM_LANES], hi[SUM_LANES];                                \
+        array_stats stats = {0};                                            \
+        size_t blocks = 0, i = 0;                                           \
+        for (int j = 0; j < SUM_LANES; j++) {                               \
+            lo[j] = INFINITY;                                               \
+            hi[j] = -INFINITY;                                              \
+        }                                                                   \
+        for (; i + SUM_LANES <= size; i += SUM_LANES) {                     \
+            double inv = 1.0 / (double)++blocks;                            \
+            for (int j = 0; j < SUM_LANES; j++) {                           \
+                double v = (double)x[i + j];                                \
+                double d = v - mean[j];                                     \
+                mean[j] += d * inv;                                         \
+                m2[j] += d * (v - mean[j]);                                 \
+                lo[j] = v < lo[j] || v != v ? v : lo[j];                    \
+                hi[j] = v > hi[j] || v != v ? v : hi[j];                    \
+            }                                                               \
+        }                                                                   \
+        for (int j = 0; j < SUM_LANES && blocks; j++) {                     \
+            array_stats lane = {blocks, lo[j], hi[j], mean[j], 0, m2[j]};   \
+            stats_merge(&stats, &lane);                                     \
+        }                                                                   \
+        for (; i < size; i++) {                                             \
+            double v = (double)x[i];                                        \
+            array_stats one = {1, v, v, v, 0, 0};                           \
+            stats_merge(&stats, &one);                                      \
+        }                                                                   \
+        return stats;                                                       \
+    }
+
+    DEFINE_STATS(i32, int32_t)
+    DEFINE_STATS(i64, int64_t)
+    DEFINE_STATS(f32, float)
+    DEFINE_STATS(f64, double)
+
+    // Prefix sums, SUM_LANES values at a time: three doubling steps
+    // (Hillis-Steele) give the running sums inside a block of 8, and only
+    // the block totals form a serial chain, instead of every value.
+    // Integers are summed modulo 2^64 in uint64_t, floats in double.
+    //
+    // scan_* works on one chunk: out[i] = carry + (sum of the chunk's
+    // values up to x[i], or up to x[i - 1] when exclusive), and it returns
+    // the chunk total, so chunks can be scanned independently once their
+    // carries are known.  With out NULL it only computes the total, with
+    // exactly the same additions.  out may be x itself when the types match.
+    #define DEFINE_SCAN(suffix, type, acc_type, out_type)                    \
+    static acc_type scan_##suffix(const type *x, out_type *out,             \
+            size_t size, acc_type carry, int exclusive)                     \
+    {                                                                       \
+        acc_type local = 0;                                                 \
+        size_t i = 0;                                                       \
+        for (; i + SUM_LANES <= size; i += SUM_LANES) {                     \
+            acc_type s[SUM_LANES], t[SUM_LANES];                            \
+            for (int j = 0; j < SUM_LANES; j++) {                           \
+                t[j] = (acc_type)x[i + j];                                  \
+            }                                                               \
+            for (int j = 0; j < SUM_LANES; j++) {                           \
+                s[j] = j >= 1 ? t[j] + t[j - 1] : t[j];                     \
+            }                                                               \
+            for (int j = 0; j < SUM_LANES; j++) {                           \
+                t[j] = j >= 2 ? s[j] + s[j - 2] : s[j];                     \
+            }                                                               \
+            for (int j = 0; j < SUM_LANES; j++) {                           \
+                s[j] = j >= 4 ? t[j] + t[j - 4] : t[j];                     \
+            }                                                               \
+            if (out && exclusive) {                                         \
+                out[i] = (out_type)(carry + local);                         \
+                for (int j = 1; j < SUM_LANES; j++) {                       \
+                    out[i + j] = (out_type)(carry + (local + s[j - 1]));    \
+                }                                                           \
+            } else if (out) {                                               \
+                for (int j = 0; j < SUM_LANES; j++) {                       \
+                    out[i + j] = (out_type)(carry + (local + s[j]));        \
+                }                                                           \
+            }                                                               \
+            local += s[SUM_LANES - 1];                                      \
+        }                                                                   \
+        for (; i < size; i++) {                                             \
+            acc_type v = (acc_type)x[i];                                    \
+            if (out) {                                                      \
+                acc_type before = exclusive ? local : local + v;            \
+                out[i] = (out_type)(carry + before);                        \
+            }                                                               \
+            local += v;                                                     \
+        }                                                                   \
+        return local;                                                       \
+    }
+
+    DEFINE_SCAN(i32, int32_t, uint64_t, int64_t)
+    DEFINE_SCAN(i64, int64_t, uint64_t, int64_t)
+    DEFINE_SCAN(f32, float, double, double)
+    DEFINE_SCAN(f64, double, double, double)
+
+    // Parallel execution.  Every array_* kernel cuts its input into
+    // PARALLEL_CHUNK-element chunks, small enough to stay in a core's L2
+    // cache, and worker t of n takes chunks t, t + n, t + 2n, ...  Arrays
+    // below the threshold (or a single chunk) run on the calling thread
+    // only.  Threads are started for the call and joined before it
+    // returns, and the calling thread does its share of the chunks.
+    //
+    // Results never depend on the number of threads: integer sums are
+    // exact in 128 bits, so partials may be added in any order, and
+    // floating-point sums follow the pairwise tree (see
+    // parallel_pairwise_sum).
+    #define PARALLEL_CHUNK 65536
+    #define PARALLEL_MAX_THREADS 256
+    #define PARALLEL_DEFAULT_THRESHOLD ((size_t)1 << 20)
+
+    // Settings shared by all calls; 0 threads means one per CPU
+    static volatile int parallel_threads = 0;
+    static volatile size_t parallel_threshold = PARALLEL_DEFAULT_THRESHOLD;
+
+    #ifdef __GNUC__
+    #define SETTING_LOAD(var) __atomic_load_n(&(var), __ATOMIC_RELAXED)
+    #define SETTING_STORE(var, value) __atomic_store_n(&(var), (value), __ATOMIC_RELAXED)
+    #else
+    // MSVC: aligned loads and stores of volatile words are atomic
+    #define SETTING_LOAD(var) (var)
+    #define SETTING_STORE(var, value) ((var) = (value))
+    #endif
+
+    typedef struct parallel_task parallel_task;
+    typedef struct parallel_worker parallel_worker;
+
+    struct parallel_worker
+    {
+        const parallel_task *task;
+        size_t first_chunk;
+        uint64_t low;       // exact 128-bit integer partial sum
+        int64_t high;
+    };
+
+    struct parallel_task
+    {
+        // Processes elements [begin, end), which make up chunk number chunk
+        void (*run)(const parallel_task *task, parallel_worker *worker,
+                    size_t chunk, size_t begin, size_t end);
+        const void *x, *y;
+        void *out;
+        double a, b, lo, hi;    // scalar arguments of the kernel
+        int multiplier;
+        int exclusive;          // for prefix sums
+        void *partials;         // one result per chunk, for reductions
+        const size_t *bounds;   // chunk c is [bounds[c], bounds[c + 1]) if set
+        size_t size, chunks;
+        size_t step;            // number of workers
+        uint64_t low;           // integer sum of all workers' partials
+        int64_t high;
+    };
+
+    #ifdef _WIN32
+    static int parallel_cpu_count(void)
+    {
+        SYSTEM_INFO info;
+        GetSystemInfo(&info);
+        return (int)info.dwNumberOfProcessors;
+    }
+    #else
+    static int parallel_cpu_count(void)
+    {
+        long count = sysconf(_SC_NPROCESSORS_ONLN);
+        return count > 0 ? (int)count : 1;
+    }
+    #endif
+
+    static size_t parallel_chunks(size_t size)
+    {
+        return (size + PARALLEL_CHUNK - 1) / PARALLEL_CHUNK;
+    }
+
+    // Number of threads a call on size elements uses
+    static int parallel_threads_for(size_t size)
+    {
+        int threads = SETTING_LOAD(parallel_threads);
+        size_t chunks = parallel_chunks(size);
+
+        if (size < SETTING_LOAD(parallel_threshold) || chunks < 2) {
+            return 1;
+        }
+        if (threads <= 0) {
+            threads = parallel_cpu_count();
+        }
+        if (threads > PARALLEL_MAX_THREADS) {
+            threads = PARALLEL_MAX_THREADS;
+        }
+        if ((size_t)threads > chunks) {
+            threads = (int)chunks;
+        }
+        return threads;
+    }
+
+    static void parallel_worker_run(parallel_worker *worker)
+    {
+        const parallel_task *task = worker->task;
+
+        for (size_t c = worker->first_chunk; c < task->chunks; c += task->step) {
+            size_t begin = c * PARALLEL_CHUNK;
+            size_t end = task->size - begin > PARALLEL_CHUNK ? begin + PARALLEL_CHUNK : task->size;
+            if (task->bounds) {
+                begin = task->bounds[c];
+                end = task->bounds[c + 1];
+            }
+            task->run(task, worker, c, begin, end);
+        }
+    }
+
+    #ifdef _WIN32
+    static DWORD WINAPI parallel_worker_main(LPVOID arg)
+    {
+        parallel_worker_run((parallel_worker *)arg);
+        return 0;
+    }
+    #else
+    static void *parallel_worker_main(void *arg)
+    {
+        parallel_worker_run((parallel_worker *)arg);
+        return NULL;
+    }
+    #endif
+
+    // Runs task on threads threads (from parallel_threads_for) and adds up
+    // the workers' integer partials into task->low and task->high.  A
+    // thread that cannot be started has its chunks run inline.
+    static void parallel_run(parallel_task *task, int threads)
+    {
+        parallel_worker workers[PARALLEL_MAX_THREADS];
+    #ifdef _WIN32
+        HANDLE handles[PARALLEL_MAX_THREADS];
+    #else
+        pthread_t handles[PARALLEL_MAX_THREADS];
+    #endif
+        int started[PARALLEL_MAX_THREADS];
+
+        if (threads < 1) {
+            threads = 1;
+        }
+        if (task->bounds == NULL) {
+            task->chunks = parallel_chunks(task->size);
+        }
+        task->step = (size_t)threads;
+        task->low = 0;
+        task->high = 0;
+
+        for (int t = 0; t < threads; t++) {
+            workers[t].task = task;
+            workers[t].first_chunk = (size_t)t;
+            workers[t].low = 0;
+            workers[t].high = 0;
+            started[t] = 0;
+        }
+        for (int t = 1; t < threads; t++) {
+    #ifdef _WIN32
+            handles[t] = CreateThread(NULL, 0, parallel_worker_main, &workers[t], 0, NULL);
+            started[t] = handles[t] != NULL;
+    #else
+            started[t] = pthread_create(&handles[t], NULL, parallel_worker_main, &workers[t]) == 0;
+    #endif
+            if (!started[t]) {
+                parallel_worker_run(&workers[t]);
+            }
+        }
+
+        parallel_worker_run(&workers[0]);
+
+        for (int t = 0; t < threads; t++) {
+            if (started[t]) {
+    #ifdef _WIN32
+                WaitForSingleObject(handles[t], INFINITE);
+                CloseHandle(handles[t]);
+    #else
+                pthread_join(handles[t], NULL);
+    #endif
+            }
+            add_wide(&task->low, &task->high, workers[t].low, workers[t].high);
+        }
+    }
+
+    // Runs task on as many threads as its size calls for
+    static void parallel_for(parallel_task *task)
+    {
+        parallel_run(task, parallel_threads_for(task->size));
+    }
+
+    static int array_set_threads(int threads)
+    {
+        int previous = SETTING_LOAD(parallel_threads);
+        SETTING_STORE(parallel_threads, threads > 0 ? threads : 0);
+        return previous;
+    }
+
+    // Threads used by a call on an array of at least the threshold
+    static int array_threads(void)
+    {
+        int threads = SETTING_LOAD(parallel_threads);
+        if (threads <= 0) {
+            threads = parallel_cpu_count();
+        }
+        return threads < PARALLEL_MAX_THREADS ? threads : PARALLEL_MAX_THREADS;
+    }
+
+    static size_t array_set_parallel_threshold(size_t size)
+    {
+        size_t previous = SETTING_LOAD(parallel_threshold);
+        SETTING_STORE(parallel_threshold, size);
+        return previous;
+    }
+
+    static size_t array_parallel_threshold(void)
+    {
+        return SETTING_LOAD(parallel_threshold);
+    }
+
+    // Integer kernels
+
+    static void run_sum_i32(const parallel_task *task, parallel_worker *worker,
+                            size_t chunk, size_t begin, size_t end)
+    {
+        int64_t sum = sum_i32((const int32_t *)task->x + begin, end - begin);
+        add_wide(&worker->low, &worker->high, (uint64_t)sum, sum < 0 ? -1 : 0);
+    }
+
+    static void run_sum_i64(const parallel_task *task, parallel_worker *worker,
+                            size_t chunk, size_t begin, size_t end)
+    {
+        sum_i64_wide((const int64_t *)task->x + begin, end - begin, &worker->low, &worker->high);
+    }
+
+    static void run_multiply_int(const parallel_task *task, parallel_worker *worker,
+                                 size_t chunk, size_t begin, size_t end)
+    {
+        multiply_int((const int *)task->x + begin, (int *)task->out + begin, end - begin, task->multiplier);
+    }
+
+    static void run_multiply_inplace(const parallel_task *task, parallel_worker *worker,
+                                     size_t chunk, size_t begin, size_t end)
+    {
+        multiply_inplace((int *)task->out + begin, end - begin, task->multiplier);
+    }
+
+    // Fast array sum implementation in C: the int32 kernel, wrapped to int
+    static int array_sum(int *buffer_in, int size)
+    {
+        parallel_task task = {.run = run_sum_i32, .x = buffer_in, .size = size > 0 ? (size_t)size : 0};
+        parallel_for(&task);
+        return (int)(int32_t)(uint32_t)task.low;
+    }
+
+    static void array_multiply(int *buffer_in, int *buffer_out, int size, int multiplier)
+    {
+        parallel_task task = {.run = run_multiply_int, .x = buffer_in, .out = buffer_out,
+                              .size = size > 0 ? (size_t)size : 0, .multiplier = multiplier};
+        parallel_for(&task);
+    }
+
+    // int32 values summed into int64: exact for any array below 2^32 elements
+    static int64_t array_sum_i32(const int32_t *buffer_in, size_t size)
+    {
+        parallel_task task = {.run = run_sum_i32, .x = buffer_in, .size = size};
+        parallel_for(&task);
+        return (int64_t)task.low;
+    }
+
+    // The result is the low 64 bits of the exact sum, i.e. the sum modulo
+    // 2^64; *overflow (if not NULL) is set to 1 when the exact sum does not
+    // fit in an int64, 0 otherwise.
+    static int64_t array_sum_i64(const int64_t *buffer_in, size_t size, int *overflow)
+    {
+        parallel_task task = {.run = run_sum_i64, .x = buffer_in, .size = size};
+        parallel_for(&task);
+        if (overflow) {
+            // fits when the high word is just the sign extension of the low one
+            *overflow = task.high != ((task.low >> 63) ? -1 : 0);
+        }
+        return (int64_t)task.low;
+    }
+
+    static void array_multiply_inplace(int *buffer, size_t size, int multiplier)
+    {
+        parallel_task task = {.run = run_multiply_inplace, .out = buffer, .size = size,
+                              .multiplier = multiplier};
+        parallel_for(&task);
+    }
+
+    // Floating-point sums split the input exactly as the pairwise
+    // recursion does, down to nodes of at most PARALLEL_CHUNK elements.
+    // Those leaves are summed in parallel and their partials combined
+    // along the same tree, so a sum is bit-identical to the
+    // single-threaded pairwise sum, whatever the thread count.
+
+    // Stores the first index of each leaf of a node of size elements
+    // (starting at offset) in bounds, if not NULL; returns the leaf count
+    static size_t pairwise_leaves(size_t size, size_t offset, size_t *bounds)
+    {
+        if (size <= PARALLEL_CHUNK) {
+            if (bounds) {
+                bounds[0] = offset;
+            }
+            return 1;
+        }
+        size_t half = pairwise_split(size);
+        size_t left = pairwise_leaves(half, offset, bounds);
+        return left + pairwise_leaves(size - half, offset + half, bounds ? bounds + left : NULL);
+    }
+
+    static double pairwise_combine(const double *partials, size_t size, size_t *next)
+    {
+        if (size <= PARALLEL_CHUNK) {
+            return partials[(*next)++];
+        }
+        size_t half = pairwise_split(size);
+        double left = pairwise_combine(partials, half, next);
+        return left + pairwise_combine(partials, size - half, next);
+    }
+
+    // Runs a sum task over the pairwise leaves on threads threads and
+    // stores the total in *sum; returns 0 if out of memory
+    static int parallel_pairwise_sum(parallel_task *task, int threads, double *sum)
+    {
+        size_t chunks = pairwise_leaves(task->size, 0, NULL), next = 0;
+        size_t *bounds = malloc((chunks + 1) * sizeof(size_t));
+        double *partials = malloc(chunks * sizeof(double));
+
+        if (bounds != NULL && partials != NULL) {
+            pairwise_leaves(task->size, 0, bounds);
+            bounds[chunks] = task->size;
+            task->bounds = bounds;
+            task->chunks = chunks;
+            task->partials = partials;
+            parallel_run(task, threads);
+            *sum = pairwise_combine(partials, task->size, &next);
+        }
+        free(bounds);
+        free(partials);
+        return bounds != NULL && partials != NULL;
+    }
+
+    #define DEFINE_PARALLEL_SUM(suffix, type)                                \
+    static void run_sum_##suffix(const parallel_task *task,                 \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        ((double *)task->partials)[chunk] = pairwise_sum_##suffix(          \
+            (const type *)task->x + begin, end - begin);                    \
+    }                                                                       \
+    static double array_sum_##suffix(const type *buffer_in, size_t size)    \
+    {                                                                       \
+        int threads = parallel_threads_for(size);                           \
+        parallel_task task = {.run = run_sum_##suffix, .x = buffer_in,      \
+                              .size = size};                                \
+        double sum;                                                         \
+        if (threads > 1 && parallel_pairwise_sum(&task, threads, &sum)) {   \
+            return sum;                                                     \
+        }                                                                   \
+        return pairwise_sum_##suffix(buffer_in, size);                      \
+    }
+
+    DEFINE_PARALLEL_SUM(f32, float)
+    DEFINE_PARALLEL_SUM(f64, double)
+
+    // Element-wise front ends; the scalars travel as double, which holds
+    // any float exactly
+    #define DEFINE_PARALLEL_ELEMENTWISE(suffix, type)                        \
+    static void run_scale_##suffix(const parallel_task *task,               \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        scale_##suffix((type *)task->out + begin, end - begin,              \
+                       (type)task->a);                                      \
+    }                                                                       \
+    static void array_scale_##suffix(type *x, size_t size, type a)          \
+    {                                                                       \
+        parallel_task task = {.run = run_scale_##suffix, .out = x,          \
+                              .size = size, .a = a};                        \
+        parallel_for(&task);                                                \
+    }                                                                       \
+    static void run_axpy_##suffix(const parallel_task *task,                \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        axpy_##suffix((type)task->a, (const type *)task->x + begin,         \
+                      (type *)task->out + begin, end - begin);              \
+    }                                                                       \
+    static void array_axpy_##suffix(type a, const type *x, type *y,         \
+                                    size_t size)                            \
+    {                                                                       \
+        parallel_task task = {.run = run_axpy_##suffix, .x = x, .out = y,   \
+                              .size = size, .a = a};                        \
+        parallel_for(&task);                                                \
+    }                                                                       \
+    static void run_scale_add_clamp_##suffix(const parallel_task *task,     \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        scale_add_clamp_##suffix((const type *)task->x + begin,             \
+                                 (type *)task->out + begin, end - begin,    \
+                                 (type)task->a, (type)task->b,              \
+                                 (type)task->lo, (type)task->hi);           \
+    }                                                                       \
+    static void array_scale_add_clamp_##suffix(const type *x, type *out,    \
+            size_t size, type scale, type offset, type lo, type hi)         \
+    {                                                                       \
+        parallel_task task = {.run = run_scale_add_clamp_##suffix, .x = x,  \
+                              .out = out, .size = size, .a = scale,         \
+                              .b = offset, .lo = lo, .hi = hi};             \
+        parallel_for(&task);                                                \
+    }                                                                       \
+    static void run_multiply_accumulate_##suffix(const parallel_task *task, \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        multiply_accumulate_##suffix((const type *)task->x + begin,         \
+                                     (const type *)task->y + begin,         \
+                                     (type *)task->out + begin,             \
+                                     end - begin);                          \
+    }                                                                       \
+    static void array_multiply_accumulate_##suffix(const type *a,           \
+            const type *b, type *acc, size_t size)                          \
+    {                                                                       \
+        parallel_task task = {.run = run_multiply_accumulate_##suffix,      \
+                              .x = a, .y = b, .out = acc, .size = size};    \
+        parallel_for(&task);                                                \
+    }
+
+    DEFINE_PARALLEL_ELEMENTWISE(f32, float)
+    DEFINE_PARALLEL_ELEMENTWISE(f64, double)
+
+    // Statistics: one partial per chunk, merged in chunk order, which the
+    // single-threaded path does too
+    #define DEFINE_PARALLEL_STATS(suffix, type)                              \
+    static void run_stats_##suffix(const parallel_task *task,               \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        ((array_stats *)task->partials)[chunk] = stats_##suffix(            \
+            (const type *)task->x + begin, end - begin);                    \
+    }                                                                       \
+    static array_stats array_stats_##suffix(const type *buffer_in,          \
+                                            size_t size)                    \
+    {                                                                       \
+        int threads = parallel_threads_for(size);                           \
+        size_t chunks = parallel_chunks(size);                              \
+        parallel_task task = {.run = run_stats_##suffix, .x = buffer_in,    \
+                              .size = size};                                \
+        array_stats stats = {0}, chunk;                                     \
+        if (threads > 1) {                                                  \
+            task.partials = malloc(chunks * sizeof(array_stats));           \
+        }                                                                   \
+        if (task.partials) {                                                \
+            parallel_run(&task, threads);                                   \
+        }                                                                   \
+        for (size_t c = 0; c < chunks; c++) {                               \
+            size_t begin = c * PARALLEL_CHUNK;                              \
+            if (task.partials) {                                            \
+                chunk = ((array_stats *)task.partials)[c];                  \
+            } else {                                                        \
+                chunk = stats_##suffix(buffer_in + begin,                   \
+                    size - begin > PARALLEL_CHUNK ? PARALLEL_CHUNK          \
+                                                  : size - begin);          \
+            }                                                               \
+            stats_merge(&stats, &chunk);                                    \
+        }                                                                   \
+        free(task.partials);                                                \
+        stats_finish(&stats);                                               \
+        return stats;                                                       \
+    }
+
+    DEFINE_PARALLEL_STATS(i32, int32_t)
+    DEFINE_PARALLEL_STATS(i64, int64_t)
+    DEFINE_PARALLEL_STATS(f32, float)
+    DEFINE_PARALLEL_STATS(f64, double)
+
+    static void array_stats_merge(array_stats *into, const array_stats *other)
+    {
+        stats_merge(into, other);
+        stats_finish(into);
+    }
+
+    // Prefix sums take two parallel passes: the first computes every
+    // chunk's total, from which the carry into each chunk follows in chunk
+    // order; the second scans the chunks independently.  The
+    // single-threaded path scans chunk after chunk with the same carries,
+    // so results do not depend on the thread count.
+    #define DEFINE_PARALLEL_SCAN(suffix, type, acc_type, out_type)           \
+    static void run_scan_total_##suffix(const parallel_task *task,          \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        ((acc_type *)task->partials)[chunk] = scan_##suffix(                \
+            (const type *)task->x + begin, NULL, end - begin, 0, 0);        \
+    }                                                                       \
+    static void run_scan_##suffix(const parallel_task *task,                \
+            parallel_worker *worker, size_t chunk,                          \
+            size_t begin, size_t end)                                       \
+    {                                                                       \
+        acc_type carry = ((acc_type *)task->partials)[chunk];               \
+        scan_##suffix((const type *)task->x + begin,                        \
+                      (out_type *)task->out + begin, end - begin,           \
+                      carry, task->exclusive);                              \
+    }                                                                       \
+    static void array_scan_##suffix(const type *buffer_in, out_type *out,   \
+                                    size_t size, int exclusive)             \
+    {                                                                       \
+        int threads = parallel_threads_for(size);                           \
+        size_t chunks = parallel_chunks(size);                              \
+        parallel_task task = {.run = run_scan_total_##suffix,               \
+                              .x = buffer_in, .out = out, .size = size,     \
+                              .exclusive = exclusive};                      \
+        acc_type carry = 0, *carries = NULL;                                \
+        if (threads > 1) {                                                  \
+            carries = malloc(chunks * sizeof(acc_type));                    \
+        }                                                                   \
+        if (carries == NULL) {                                              \
+            for (size_t begin = 0; begin < size; begin += PARALLEL_CHUNK) { \
+                carry += scan_##suffix(buffer_in + begin, out + begin,      \
+                    size - begin > PARALLEL_CHUNK ? PARALLEL_CHUNK          \
+                                                  : size - begin,           \
+                    carry, exclusive);                                      \
+            }                                                               \
+            return;                                                         \
+        }                                                                   \
+        task.partials = carries;                                            \
+        parallel_run(&task, threads);                                       \
+        for (size_t c = 0; c < chunks; c++) {                               \
+            acc_type total = carries[c];                                    \
+            carries[c] = carry;                                             \
+            carry += total;                                                 \
+        }                                                                   \
+        task.run = run_scan_##suffix;                                       \
+        parallel_run(&task, threads);                                       \
+        free(carries);                                                      \
+    }
+
+    DEFINE_PARALLEL_SCAN(i32, int32_t, uint64_t, int64_t)
+    DEFINE_PARALLEL_SCAN(i64, int64_t, uint64_t, int64_t)
+    DEFINE_PARALLEL_SCAN(f32, float, double, double)
+    DEFINE_PARALLEL_SCAN(f64, double, double, double)
+""",
+    libraries=LIBRARIES,
+    extra_compile_args=EXTRA_COMPILE_ARGS)
 
 if __name__ == "__main__":
     print("Building C extension module...")
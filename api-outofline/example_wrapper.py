@@ -0,0 +1,322 @@
+"""
+Zero-copy Python front end for the _example array kernels.
+Any buffer-protocol object (NumPy arrays, array.array, memoryview,
+bytearray) is handed to C with ffi.from_buffer, without copying or
+converting it element by element. Results are NumPy arrays viewing the
+memory C wrote into, or memoryviews when NumPy is not installed.
+Large arrays are split across native threads inside C; see set_threads.
+"""
+
+from collections import namedtuple
+
+from _example import ffi, lib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Element types the kernels understand: C type and buffer format
+DTYPES = {
+    "int32": ("int32_t", "i"),
+    "int64": ("int64_t", "q"),
+    "float32": ("float", "f"),
+    "float64": ("double", "d"),
+}
+
+_INT_FORMATS = "bhilqn"
+_FLOAT_FORMATS = "fd"
+_INT_MAX = 2**31 - 1
+
+# Output buffers are overwritten entirely, so skip clearing them
+_new_uninitialized = ffi.new_allocator(should_clear_after_alloc=False)
+
+
+def _dtype_of(view):
+    fmt = view.format.lstrip("@=<")
+    if len(fmt) == 1 and fmt in _INT_FORMATS and view.itemsize in (4, 8):
+        return f"int{view.itemsize * 8}"
+    if len(fmt) == 1 and fmt in _FLOAT_FORMATS:
+        return f"float{view.itemsize * 8}"
+    return None
+
+
+def as_buffer(obj, dtype=None, name="data", writable=False):
+    """Return (memoryview, dtype) for obj after checking its type and layout.
+
+    The element type is read from the buffer format. Raw byte buffers
+    (bytearray, bytes, memoryviews of them) carry no element type and need
+    dtype, one of DTYPES, to be reinterpreted; for typed buffers dtype, if
+    given, must match.
+    """
+    view = memoryview(obj)
+    if not view.c_contiguous:
+        raise ValueError(f"{name} must be C-contiguous")
+    if writable and view.readonly:
+        raise ValueError(f"{name} must be writable")
+    if dtype is not None and dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {sorted(DTYPES)}, got {dtype!r}")
+
+    actual = _dtype_of(view)
+    raw_bytes = view.format.lstrip("@=<") in ("B", "b", "c")
+    if actual is None and raw_bytes and dtype is not None:
+        itemsize = ffi.sizeof(DTYPES[dtype][0])
+        if view.nbytes % itemsize:
+            raise ValueError(f"{name} holds {view.nbytes} bytes, not a whole number of {dtype} values")
+        return view.cast("B").cast(DTYPES[dtype][1]), dtype
+    if actual is None:
+        raise TypeError(f"{name} must hold int32, int64, float32 or float64 values, got format '{view.format}'"
+                        + ("; pass dtype to reinterpret raw bytes" if raw_bytes else ""))
+    if dtype is not None and dtype != actual:
+        raise TypeError(f"{name} holds {actual} values, not {dtype}")
+    return view.cast("B").cast(DTYPES[actual][1]) if view.ndim != 1 else view, actual
+
+
+def _pointer(view, dtype, writable=False, ctype=None):
+    return ffi.from_buffer((ctype or DTYPES[dtype][0]) + "[]", view, require_writable=writable)
+
+
+def _shape_of(obj):
+    """Shape to give a result computed from obj, or None to leave it 1-D.
+
+    Raw bytes reinterpreted through dtype have no element shape to keep.
+    """
+    view = memoryview(obj)
+    return view.shape if view.ndim > 1 and _dtype_of(view) is not None else None
+
+
+def _wrap(cdata, count, dtype, shape=None):
+    """View count elements of C-allocated cdata as a NumPy array (or memoryview).
+
+    The view keeps cdata alive: no copy is made. With NumPy, the array
+    is given shape when one is passed.
+    """
+    raw = ffi.buffer(cdata, count * ffi.sizeof(DTYPES[dtype][0]))
+    if np is not None:
+        array = np.frombuffer(raw, dtype=dtype)
+        return array if shape is None else array.reshape(shape)
+    return memoryview(raw).cast(DTYPES[dtype][1])
+
+
+def empty(count, dtype="float64", shape=None):
+    """Uninitialized C-allocated array of count elements, as _wrap returns it."""
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {sorted(DTYPES)}, got {dtype!r}")
+    return _wrap(_new_uninitialized(DTYPES[dtype][0] + "[]", count), count, dtype, shape)
+
+
+def set_threads(threads=0):
+    """Set how many native threads the kernels use on large arrays.
+
+    0 means one per CPU. Returns the previous setting. Results are the
+    same whatever the thread count, floating-point sums included.
+    """
+    if threads < 0:
+        raise ValueError("threads must be 0 (one per CPU) or positive")
+    return lib.array_set_threads(threads)
+
+
+def threads():
+    """Number of threads a call on an array above the threshold uses."""
+    return lib.array_threads()
+
+
+def set_parallel_threshold(size):
+    """Split arrays of at least size elements across threads.
+
+    Smaller arrays run on the calling thread only, where starting threads
+    would cost more than it saves. Returns the previous threshold.
+    """
+    if size < 0:
+        raise ValueError("size must not be negative")
+    return lib.array_set_parallel_threshold(size)
+
+
+def parallel_threshold():
+    """Size in elements from which arrays are split across threads."""
+    return lib.array_parallel_threshold()
+
+
+def array_sum(data, dtype=None):
+    """Sum of a buffer of int32, int64, float32 or float64 values.
+
+    Integers are summed exactly and returned as int; an int64 total that
+    does not fit in 64 bits raises OverflowError. Floats are summed
+    pairwise and returned as float.
+    """
+    view, dtype = as_buffer(data, dtype)
+    count = len(view)
+    ptr = _pointer(view, dtype)
+    if dtype == "int32":
+        return lib.array_sum_i32(ptr, count)
+    if dtype == "int64":
+        overflow = ffi.new("int *")
+        total = lib.array_sum_i64(ptr, count, overflow)
+        if overflow[0]:
+            raise OverflowError("the int64 sum does not fit in 64 bits")
+        return total
+    if dtype == "float32":
+        return lib.array_sum_f32(ptr, count)
+    return lib.array_sum_f64(ptr, count)
+
+
+def array_multiply(data, multiplier, out=None, dtype=None):
+    """Multiply every element of an int32 buffer by multiplier.
+
+    The products go into out, any writable int32 buffer of the same length,
+    or into a new C-allocated array returned as a NumPy view with the shape
+    of data when out is None. Returns the array written to.
+    """
+    view, dtype = as_buffer(data, dtype)
+    if dtype != "int32":
+        raise TypeError(f"array_multiply works on int32 values, got {dtype}")
+    count = len(view)
+    if count > _INT_MAX:
+        raise OverflowError("array_multiply takes at most 2**31 - 1 elements")
+
+    # The original kernels are declared with int, not int32_t
+    if out is None:
+        cdata = _new_uninitialized("int[]", count)
+        lib.array_multiply(_pointer(view, dtype, ctype="int"), cdata, count, multiplier)
+        return _wrap(cdata, count, dtype, _shape_of(data))
+
+    out_view, _ = as_buffer(out, "int32", name="out", writable=True)
+    if len(out_view) != count:
+        raise ValueError("out must have the same length as data")
+    lib.array_multiply(_pointer(view, dtype, ctype="int"), _pointer(out_view, dtype, writable=True, ctype="int"),
+                       count, multiplier)
+    return out
+
+
+def array_multiply_inplace(data, multiplier):
+    """Multiply every element of a writable int32 buffer by multiplier, in place.
+
+    Returns data.
+    """
+    view, _ = as_buffer(data, "int32", writable=True)
+    lib.array_multiply_inplace(_pointer(view, "int32", writable=True, ctype="int"), len(view), multiplier)
+    return data
+
+
+# Element-wise kernels exist for float32 and float64; every operand of a
+# call must have the same type and length
+
+_FLOAT_SUFFIXES = {"float32": "f32", "float64": "f64"}
+
+
+def _float_operands(kernel, first, *others):
+    """Check that first and others are float buffers of one dtype and length.
+
+    Each operand is (obj, name, writable). Returns the C function for
+    that dtype, the common length and one pointer per operand.
+    """
+    operands = (first,) + others
+    views = []
+    dtype = None
+    for obj, name, writable in operands:
+        view, kind = as_buffer(obj, dtype, name=name, writable=writable)
+        if kind not in _FLOAT_SUFFIXES:
+            raise TypeError(f"{kernel} works on float32 or float64 values, got {kind} for {name}")
+        if views and len(view) != len(views[0][0]):
+            raise ValueError(f"{name} must have the same length as {operands[0][1]}")
+        dtype = kind
+        views.append((view, writable))
+    function = getattr(lib, f"array_{kernel}_{_FLOAT_SUFFIXES[dtype]}")
+    return function, dtype, len(views[0][0]), [_pointer(view, dtype, writable) for view, writable in views]
+
+
+def scale(x, a):
+    """x *= a in place, for a writable float32 or float64 buffer. Returns x."""
+    function, _, count, (x_ptr,) = _float_operands("scale", (x, "x", True))
+    function(x_ptr, count, a)
+    return x
+
+
+def axpy(a, x, y):
+    """y += a * x in place, in one pass over both buffers. Returns y."""
+    function, _, count, (x_ptr, y_ptr) = _float_operands("axpy", (x, "x", False), (y, "y", True))
+    function(a, x_ptr, y_ptr, count)
+    return y
+
+
+def scale_add_clamp(x, scale, offset=0.0, lo=float("-inf"), hi=float("inf"), out=None):
+    """min(max(x * scale + offset, lo), hi) element-wise, in one pass.
+
+    The result goes into out, which may be x itself for an in-place update,
+    or into a new C-allocated array (see array_multiply) when out is None.
+    Returns the array written to.
+    """
+    if lo > hi:
+        raise ValueError("lo must not be greater than hi")
+    if out is None:
+        view, dtype = as_buffer(x, name="x")
+        if dtype not in _FLOAT_SUFFIXES:
+            raise TypeError(f"scale_add_clamp works on float32 or float64 values, got {dtype} for x")
+        out = empty(len(view), dtype, _shape_of(x))
+    function, _, count, (x_ptr, out_ptr) = _float_operands("scale_add_clamp", (x, "x", False), (out, "out", True))
+    function(x_ptr, out_ptr, count, scale, offset, lo, hi)
+    return out
+
+
+def multiply_accumulate(a, b, acc):
+    """acc += a * b element-wise in place, in one pass. Returns acc."""
+    function, _, count, (a_ptr, b_ptr, acc_ptr) = _float_operands(
+        "multiply_accumulate", (a, "a", False), (b, "b", False), (acc, "acc", True))
+    function(a_ptr, b_ptr, acc_ptr, count)
+    return acc
+
+
+# Summary statistics and prefix sums exist for every dtype
+
+_SUFFIXES = {"int32": "i32", "int64": "i64", "float32": "f32", "float64": "f64"}
+
+Stats = namedtuple("Stats", ["count", "min", "max", "mean", "variance", "m2"])
+
+
+def _stats(cdata):
+    return Stats(cdata.count, cdata.min, cdata.max, cdata.mean, cdata.variance, cdata.m2)
+
+
+def array_stats(data, dtype=None):
+    """Count, min, max, mean and variance of a buffer, in one pass over memory.
+
+    variance is the population variance, m2 / count, where m2 is the sum
+    of squared deviations from the mean; m2 / (count - 1) is the sample
+    variance. NaN values make every statistic but count NaN, and an empty
+    buffer gives NaN statistics. Infinities give what NumPy gives: a mean
+    of +-inf (NaN if both signs occur) and a NaN variance and m2. Values
+    are converted to float, so int64 values beyond 2**53 are rounded.
+    """
+    view, dtype = as_buffer(data, dtype)
+    function = getattr(lib, f"array_stats_{_SUFFIXES[dtype]}")
+    return _stats(function(_pointer(view, dtype), len(view)))
+
+
+def merge_stats(first, *others):
+    """Combine Stats of disjoint pieces of data into the Stats of all of it."""
+    merged = ffi.new("array_stats *", tuple(first))
+    for stats in others:
+        lib.array_stats_merge(merged, ffi.new("array_stats *", tuple(stats)))
+    return _stats(merged)
+
+
+def prefix_sum(data, exclusive=False, out=None, dtype=None):
+    """Running sums of a buffer.
+
+    out[i] is data[0] + ... + data[i], or data[0] + ... + data[i - 1]
+    (with out[0] = 0) when exclusive. Integer input gives int64 sums,
+    which wrap around modulo 2**64, and float input float64 sums. The
+    sums go into out, which may be data itself if it already has that
+    type, or into a new C-allocated array when out is None. Returns the
+    array written to.
+    """
+    view, dtype = as_buffer(data, dtype)
+    out_dtype = "float64" if dtype.startswith("float") else "int64"
+    if out is None:
+        out = empty(len(view), out_dtype, _shape_of(data))
+    out_view, _ = as_buffer(out, out_dtype, name="out", writable=True)
+    if len(out_view) != len(view):
+        raise ValueError("out must have the same length as data")
+    function = getattr(lib, f"array_scan_{_SUFFIXES[dtype]}")
+    function(_pointer(view, dtype), _pointer(out_view, out_dtype, writable=True), len(view), 1 if exclusive else 0)
+    return out
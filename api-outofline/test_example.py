@@ -87,6 +87,54 @@ class TestCExtension(unittest.TestCase):
         expected = 6765
         self.assertEqual(result, expected)
     
+    def test_array_sum_i32_no_overflow(self):
+        """Test that int32 sums are accumulated in 64 bits."""
+        values = [2**31 - 1] * 100 + [-2**31] * 3
+        buffer_in = ffi.new("int32_t[]", values)
+        self.assertEqual(lib.array_sum_i32(buffer_in, len(values)), sum(values))
+    
+    def test_array_sum_i64_overflow_flag(self):
+        """Test that int64 sums report when the exact result does not fit."""
+        overflow = ffi.new("int *")
+        
+        values = [2**62] * 9 + [-2**62] * 9 + [7]
+        buffer_in = ffi.new("int64_t[]", values)
+        self.assertEqual(lib.array_sum_i64(buffer_in, len(values), overflow), 7)
+        self.assertEqual(overflow[0], 0)
+        
+        values = [2**62] * 10
+        buffer_in = ffi.new("int64_t[]", values)
+        result = lib.array_sum_i64(buffer_in, len(values), overflow)
+        self.assertEqual(overflow[0], 1)
+        self.assertEqual(result % 2**64, sum(values) % 2**64)
+        
+        buffer_in = ffi.new("int64_t[]", [-2**63, -1])
+        lib.array_sum_i64(buffer_in, 2, ffi.NULL)
+        lib.array_sum_i64(buffer_in, 2, overflow)
+        self.assertEqual(overflow[0], 1)
+    
+    def test_array_sum_float_accuracy(self):
+        """Test that pairwise float sums stay close to the exact sum."""
+        import math
+        import random
+        
+        rng = random.Random(3)
+        values = [rng.uniform(-1, 1) * 10 ** rng.randint(0, 8) for _ in range(100003)]
+        
+        buffer_in = ffi.new("double[]", values)
+        self.assertAlmostEqual(lib.array_sum_f64(buffer_in, len(values)), math.fsum(values), delta=1e-6)
+        
+        buffer_in = ffi.new("float[]", values)
+        exact = math.fsum(buffer_in[i] for i in range(len(values)))
+        self.assertAlmostEqual(lib.array_sum_f32(buffer_in, len(values)), exact, delta=1e-6)
+    
+    def test_array_sum_typed_empty(self):
+        """Test that every typed sum of an empty array is zero."""
+        self.assertEqual(lib.array_sum_i32(ffi.NULL, 0), 0)
+        self.assertEqual(lib.array_sum_i64(ffi.NULL, 0, ffi.NULL), 0)
+        self.assertEqual(lib.array_sum_f32(ffi.NULL, 0), 0.0)
+        self.assertEqual(lib.array_sum_f64(ffi.NULL, 0), 0.0)
+    
     def test_buffer_types(self):
         """Test that we can work with CFFI buffer types."""
         size = 5
@@ -99,6 +147,258 @@ class TestCExtension(unittest.TestCase):
         for i in range(size):
             self.assertEqual(buffer_in[i], i * 2)
 
+@unittest.skipUnless(EXTENSION_AVAILABLE, "Extension not built")
+class TestArrayWrapper(unittest.TestCase):
+    """Test the zero-copy buffer-protocol front end."""
+    
+    def setUp(self):
+        import example_wrapper
+        self.wrapper = example_wrapper
+    
+    def test_sum_accepts_buffer_objects(self):
+        """Test that array_sum takes array.array, memoryview and raw bytes."""
+        from array import array
+        values = array("i", range(100))
+        self.assertEqual(self.wrapper.array_sum(values), 4950)
+        self.assertEqual(self.wrapper.array_sum(memoryview(values)), 4950)
+        self.assertEqual(self.wrapper.array_sum(bytearray(values.tobytes()), dtype="int32"), 4950)
+        self.assertEqual(self.wrapper.array_sum(array("d", [0.5] * 8)), 4.0)
+        self.assertEqual(self.wrapper.array_sum(array("q", [2**40] * 4)), 2**42)
+    
+    def test_sum_rejects_bad_buffers(self):
+        """Test the dtype and contiguity checks."""
+        from array import array
+        with self.assertRaises(TypeError):
+            self.wrapper.array_sum(array("h", [1, 2, 3]))
+        with self.assertRaises(TypeError):
+            self.wrapper.array_sum(bytearray(8))
+        with self.assertRaises(TypeError):
+            self.wrapper.array_sum(array("i", [1, 2]), dtype="float32")
+        with self.assertRaises(ValueError):
+            self.wrapper.array_sum(memoryview(array("i", range(10)))[::2])
+        with self.assertRaises(OverflowError):
+            self.wrapper.array_sum(array("q", [2**62] * 4))
+    
+    def test_multiply_into_out(self):
+        """Test array_multiply writing into a caller's buffer."""
+        from array import array
+        out = array("i", [0] * 5)
+        result = self.wrapper.array_multiply(array("i", range(5)), 4, out=out)
+        self.assertIs(result, out)
+        self.assertEqual(list(out), [0, 4, 8, 12, 16])
+        with self.assertRaises(ValueError):
+            self.wrapper.array_multiply(array("i", range(5)), 4, out=bytes(20))
+    
+    def test_multiply_returns_view_of_c_memory(self):
+        """Test that a new result views C-allocated memory instead of a copy."""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy not installed")
+        data = np.arange(1000, dtype=np.int32)
+        result = self.wrapper.array_multiply(data, 3)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertFalse(result.flags.owndata)
+        self.assertEqual(result.dtype, np.int32)
+        np.testing.assert_array_equal(result, data * 3)
+        self.assertEqual(self.wrapper.array_sum(np.arange(12, dtype=np.float32).reshape(3, 4)), 66.0)
+    
+    def test_new_results_keep_the_input_shape(self):
+        """Test that results allocated by the wrapper take the shape of the input."""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy not installed")
+        ints = np.arange(12, dtype=np.int32).reshape(3, 4)
+        floats = np.linspace(-1.0, 1.0, 24).reshape(2, 3, 4)
+        np.testing.assert_array_equal(self.wrapper.array_multiply(ints, 2), ints * 2)
+        np.testing.assert_array_equal(self.wrapper.scale_add_clamp(floats, 2.0, hi=1.0), np.minimum(floats * 2.0, 1.0))
+        self.assertEqual(self.wrapper.prefix_sum(ints).shape, (3, 4))
+        np.testing.assert_array_equal(self.wrapper.prefix_sum(ints).ravel(), np.cumsum(ints))
+        raw = np.zeros((2, 8), dtype=np.uint8)
+        self.assertEqual(self.wrapper.prefix_sum(raw, dtype="int32").shape, (4,))
+    
+    def test_dtype_hint_only_for_raw_bytes(self):
+        """Test that only byte buffers are told to pass dtype."""
+        with self.assertRaisesRegex(TypeError, "pass dtype"):
+            self.wrapper.array_sum(bytearray(8))
+        with self.assertRaises(TypeError) as caught:
+            self.wrapper.array_sum(memoryview(bytearray(8)).cast("?"))
+        self.assertNotIn("pass dtype", str(caught.exception))
+
+@unittest.skipUnless(EXTENSION_AVAILABLE, "Extension not built")
+class TestFusedKernels(unittest.TestCase):
+    """Test the in-place and fused element-wise kernels."""
+    
+    def setUp(self):
+        import example_wrapper
+        self.wrapper = example_wrapper
+    
+    def test_in_place_kernels(self):
+        """Test scale, axpy and multiply_accumulate in both precisions."""
+        from array import array
+        for code in ("f", "d"):
+            x = array(code, [1.0, 2.0, 3.0])
+            y = array(code, [10.0, 20.0, 30.0])
+            self.assertIs(self.wrapper.scale(x, 2.0), x)
+            self.assertEqual(list(x), [2.0, 4.0, 6.0])
+            self.assertIs(self.wrapper.axpy(0.5, x, y), y)
+            self.assertEqual(list(y), [11.0, 22.0, 33.0])
+            self.wrapper.multiply_accumulate(x, x, y)
+            self.assertEqual(list(y), [15.0, 38.0, 69.0])
+        ints = array("i", range(5))
+        self.wrapper.array_multiply_inplace(ints, 3)
+        self.assertEqual(list(ints), [0, 3, 6, 9, 12])
+    
+    def test_scale_add_clamp(self):
+        """Test the clamp bounds, in-place output and NaN propagation."""
+        from array import array
+        x = array("d", [-2.0, 0.0, 1.0, 5.0, float("nan")])
+        result = self.wrapper.scale_add_clamp(x, 2.0, 1.0, lo=0.0, hi=4.0)
+        self.assertEqual(list(result[:4]), [0.0, 1.0, 3.0, 4.0])
+        self.assertNotEqual(result[4], result[4])
+        self.assertIs(self.wrapper.scale_add_clamp(x, 1.0, 0.0, 0.0, 1.0, out=x), x)
+        self.assertEqual(list(x[:4]), [0.0, 0.0, 1.0, 1.0])
+        with self.assertRaises(ValueError):
+            self.wrapper.scale_add_clamp(x, 1.0, 0.0, lo=1.0, hi=0.0)
+    
+    def test_operands_must_match(self):
+        """Test the dtype, length and writability checks."""
+        from array import array
+        x = array("d", [1.0, 2.0])
+        with self.assertRaises(TypeError):
+            self.wrapper.axpy(1.0, x, array("f", [0.0, 0.0]))
+        with self.assertRaises(ValueError):
+            self.wrapper.axpy(1.0, x, array("d", [0.0]))
+        with self.assertRaises(ValueError):
+            self.wrapper.scale(bytes(16), 2.0)
+        with self.assertRaises(TypeError):
+            self.wrapper.scale(array("i", [1, 2]), 2.0)
+
+@unittest.skipUnless(EXTENSION_AVAILABLE, "Extension not built")
+class TestParallelKernels(unittest.TestCase):
+    """Test the multi-threaded execution of the array kernels."""
+    
+    def setUp(self):
+        import example_wrapper
+        self.wrapper = example_wrapper
+        self.saved = (example_wrapper.set_threads(0), example_wrapper.set_parallel_threshold(0))
+    
+    def tearDown(self):
+        self.wrapper.set_threads(self.saved[0])
+        self.wrapper.set_parallel_threshold(self.saved[1])
+    
+    def run_kernels(self, values):
+        from array import array
+        floats = array("d", values)
+        ints = array("i", (int(v) for v in values))
+        return (self.wrapper.array_sum(floats),
+                self.wrapper.array_sum(array("f", values)),
+                self.wrapper.array_sum(ints),
+                self.wrapper.array_sum(array("q", (int(v) << 30 for v in values))),
+                bytes(self.wrapper.scale_add_clamp(floats, 0.5, 1.0, -100.0, 100.0)),
+                bytes(self.wrapper.array_multiply(ints, 3)),
+                self.wrapper.array_stats(floats),
+                bytes(self.wrapper.prefix_sum(floats)),
+                bytes(self.wrapper.prefix_sum(ints, exclusive=True)))
+    
+    def test_settings(self):
+        """Test that the settings round-trip and report the previous value."""
+        self.assertEqual(self.wrapper.set_threads(3), 0)
+        self.assertEqual(self.wrapper.threads(), 3)
+        self.assertEqual(self.wrapper.set_parallel_threshold(1000), 0)
+        self.assertEqual(self.wrapper.parallel_threshold(), 1000)
+        self.assertEqual(self.wrapper.set_threads(0), 3)
+        self.assertGreaterEqual(self.wrapper.threads(), 1)
+        with self.assertRaises(ValueError):
+            self.wrapper.set_threads(-1)
+    
+    def test_results_do_not_depend_on_threads(self):
+        """Test that every kernel gives identical results on 1 to 8 threads."""
+        import random
+        rng = random.Random(5)
+        values = [rng.uniform(-1, 1) * 10 ** rng.randint(0, 6) for _ in range(300007)]
+        
+        self.wrapper.set_parallel_threshold(2**62)
+        expected = self.run_kernels(values)
+        self.wrapper.set_parallel_threshold(0)
+        for threads in (1, 2, 3, 8):
+            self.wrapper.set_threads(threads)
+            self.assertEqual(self.run_kernels(values), expected)
+        self.assertEqual(expected[2], sum(int(v) for v in values))
+
+@unittest.skipUnless(EXTENSION_AVAILABLE, "Extension not built")
+class TestStatsAndScans(unittest.TestCase):
+    """Test the one-pass statistics and prefix-sum kernels."""
+    
+    def setUp(self):
+        import example_wrapper
+        self.wrapper = example_wrapper
+    
+    def test_stats_match_statistics_module(self):
+        """Test array_stats against the statistics module, for every dtype."""
+        import random
+        import statistics
+        from array import array
+        rng = random.Random(7)
+        values = [rng.randint(-1000, 1000) for _ in range(10007)]
+        for code in ("i", "q", "f", "d"):
+            stats = self.wrapper.array_stats(array(code, values))
+            self.assertEqual(stats.count, len(values))
+            self.assertEqual((stats.min, stats.max), (min(values), max(values)))
+            self.assertAlmostEqual(stats.mean, statistics.fmean(values), places=9)
+            self.assertAlmostEqual(stats.variance, statistics.pvariance(values), delta=1e-9 * stats.variance)
+            self.assertAlmostEqual(stats.m2 / (stats.count - 1), statistics.variance(values), delta=1e-9 * stats.variance)
+    
+    def test_stats_edge_cases(self):
+        """Test empty input, NaN propagation and merging pieces."""
+        import math
+        from array import array
+        empty = self.wrapper.array_stats(array("d"))
+        self.assertEqual(empty.count, 0)
+        self.assertTrue(math.isnan(empty.mean) and math.isnan(empty.min))
+        with_nan = self.wrapper.array_stats(array("d", [1.0] * 20 + [math.nan]))
+        self.assertTrue(all(math.isnan(v) for v in with_nan[1:5]))
+        
+        inf = math.inf
+        for values, mean in (([inf, 1.0], inf), ([-inf] + [2.0] * 20, -inf), ([inf] * 9, inf), ([inf, -inf], math.nan)):
+            stats = self.wrapper.array_stats(array("d", values))
+            self.assertEqual(str(stats.mean), str(mean))
+            self.assertTrue(math.isnan(stats.variance))
+            self.assertEqual((stats.min, stats.max), (min(values), max(values)))
+        
+        values = array("d", (i * 0.5 for i in range(1000)))
+        pieces = [self.wrapper.array_stats(values[i:i + 300]) for i in range(0, 1000, 300)]
+        merged = self.wrapper.merge_stats(*pieces)
+        whole = self.wrapper.array_stats(values)
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual((merged.min, merged.max), (whole.min, whole.max))
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance)
+    
+    def test_prefix_sums(self):
+        """Test inclusive and exclusive scans against itertools.accumulate."""
+        import itertools
+        from array import array
+        values = [(i * 7919) % 2001 - 1000 for i in range(1003)]
+        inclusive = list(itertools.accumulate(values))
+        for code in ("i", "q", "f", "d"):
+            data = array(code, values)
+            self.assertEqual(list(self.wrapper.prefix_sum(data)), inclusive)
+            self.assertEqual(list(self.wrapper.prefix_sum(data, exclusive=True)), [0] + inclusive[:-1])
+        self.assertEqual(len(self.wrapper.prefix_sum(array("d"))), 0)
+    
+    def test_prefix_sum_in_place(self):
+        """Test scanning into the input buffer and the out checks."""
+        from array import array
+        data = array("q", range(1, 11))
+        self.assertIs(self.wrapper.prefix_sum(data, exclusive=True, out=data), data)
+        self.assertEqual(list(data), [0, 1, 3, 6, 10, 15, 21, 28, 36, 45])
+        with self.assertRaises(TypeError):
+            self.wrapper.prefix_sum(array("i", [1, 2]), out=array("i", [0, 0]))
+        with self.assertRaises(ValueError):
+            self.wrapper.prefix_sum(array("d", [1.0, 2.0]), out=array("d", [0.0]))
+
 class TestBuildSystem(unittest.TestCase):
     """Test that the build system works correctly."""
     
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark the three builds of the Pi approximation kernel against each other:
+
+- _pi            source-built extension (api-c-sources)
+- _pi_cffi       extension statically linked against libpiapprox (main-mode)
+- _pi_cffi_dll   extension backed by the shared libpiapprox (main-mode)
+
+For each build that can be imported it measures the per-call overhead at
+tiny n, samples per second at large n, and how throughput scales with the
+number of Python threads. Results are written as JSON and can be compared
+against a saved baseline to catch regressions.
+
+Usage:
+    python bench_builds.py --output results.json
+    python bench_builds.py --compare baseline.json --threshold 0.10
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = ["_pi", "_pi_cffi", "_pi_cffi_dll"]
+
+DEFAULT_PATHS = [
+    os.path.join(REPO_ROOT, "api-c-sources"),
+    os.path.join(REPO_ROOT, "main-mode", "build"),
+    os.path.join(REPO_ROOT, "main-mode", "build", "Release"),
+]
+
+# Metrics where a larger value is better; all others are better when smaller
+HIGHER_IS_BETTER = ("samples_per_sec", "thread_scaling")
+
+
+def load_variants(paths, names):
+    """Import every requested build that can be found, keyed by module name."""
+    for path in reversed(paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    loaded = {}
+    for name in names:
+        try:
+            loaded[name] = importlib.import_module(name).lib
+        except ImportError as e:
+            print(f"  skipping {name}: {e}")
+    return loaded
+
+
+def measure(fn, warmup, repeats):
+    """Run fn warmup times, then time it repeats times; returns seconds per run."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        fn()
+        timings.append((time.perf_counter_ns() - start) / 1e9)
+    return timings
+
+
+def summarize(timings):
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+def bench_call_overhead(lib, calls, warmup, repeats):
+    """Nanoseconds per pi_approx_seeded(1, seed) call: almost pure FFI cost."""
+    fn = lib.pi_approx_seeded
+
+    def run():
+        for _ in range(calls):
+            fn(1, 42)
+
+    timings = [t * 1e9 / calls for t in measure(run, warmup, repeats)]
+    return summarize(timings)
+
+
+def bench_throughput(lib, samples, warmup, repeats):
+    """Samples per second for one large pi_approx64_seeded call."""
+    timings = measure(lambda: lib.pi_approx64_seeded(samples, 42), warmup, repeats)
+    return {"median": samples / statistics.median(timings), "max": samples / min(timings)}
+
+
+def bench_thread_scaling(lib, samples, thread_counts, warmup, repeats):
+    """Aggregate samples per second with the work split over Python threads.
+
+    CFFI releases the GIL around the calls, so this shows how well each
+    build scales when several threads call into it at once.
+    """
+    results = {}
+    for threads in thread_counts:
+        share = samples // threads
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            def run():
+                list(pool.map(lambda i: lib.pi_approx64_seeded(share, i), range(threads)))
+            timings = measure(run, warmup, repeats)
+        results[str(threads)] = share * threads / statistics.median(timings)
+    return results
+
+
+def run_benchmarks(libs, args):
+    thread_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    results = {}
+    for name, lib in libs.items():
+        print(f"\nBenchmarking {name}...")
+        overhead = bench_call_overhead(lib, args.calls, args.warmup, args.repeats)
+        print(f"  call overhead:  {overhead['median']:10.1f} ns/call")
+        throughput = bench_throughput(lib, args.samples, args.warmup, args.repeats)
+        print(f"  throughput:     {throughput['median'] / 1e6:10.1f} M samples/s")
+        scaling = bench_thread_scaling(lib, args.samples, thread_counts, args.warmup, args.repeats)
+        for threads, rate in scaling.items():
+            print(f"  {threads:>3} thread(s):  {rate / 1e6:10.1f} M samples/s")
+        results[name] = {
+            "call_overhead_ns": overhead,
+            "samples_per_sec": throughput,
+            "thread_scaling": scaling,
+        }
+    return results
+
+
+def flatten(results):
+    """Map 'variant.metric' names to the single number compared against a baseline."""
+    flat = {}
+    for name, metrics in results.items():
+        flat[f"{name}.call_overhead_ns"] = metrics["call_overhead_ns"]["median"]
+        flat[f"{name}.samples_per_sec"] = metrics["samples_per_sec"]["median"]
+        for threads, rate in metrics["thread_scaling"].items():
+            flat[f"{name}.thread_scaling.{threads}"] = rate
+    return flat
+
+
+def compare(current, baseline, threshold):
+    """Print current against baseline; returns the list of regressed metrics."""
+    now = flatten(current["results"])
+    before = flatten(baseline["results"])
+    regressions = []
+
+    print(f"\nComparison against baseline (threshold {threshold:.0%}):")
+    print(f"{'metric':45s} {'baseline':>14s} {'current':>14s} {'change':>9s}")
+    for key in sorted(now.keys() & before.keys()):
+        old, new = before[key], now[key]
+        change = (new - old) / old if old else 0.0
+        worse = -change if any(part in key for part in HIGHER_IS_BETTER) else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key:45s} {old:14.4g} {new:14.4g} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the _pi, _pi_cffi and _pi_cffi_dll builds")
+    parser.add_argument("--path", action="append", default=[],
+                        help="extra directory to search for the extensions (repeatable)")
+    parser.add_argument("--variants", nargs="+", default=VARIANTS, help="builds to benchmark")
+    parser.add_argument("--calls", type=int, default=100_000, help="calls per overhead measurement")
+    parser.add_argument("--samples", type=int, default=20_000_000, help="samples per throughput measurement")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs before measuring")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per measurement")
+    parser.add_argument("--output", default="bench_builds.json", help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    print("Pi Approximation Build Benchmark")
+    print("=" * 40)
+    libs = load_variants(args.path + DEFAULT_PATHS, args.variants)
+    if not libs:
+        print("No build could be imported. Build the extensions first:")
+        print("  api-c-sources: python pi_extension_build.py")
+        print("  main-mode:     cmake --build build --target python_extension")
+        return 1
+
+    current = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "settings": {"calls": args.calls, "samples": args.samples,
+                         "warmup": args.warmup, "repeats": args.repeats},
+        },
+        "results": run_benchmarks(libs, args),
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed beyond {args.threshold:.0%}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
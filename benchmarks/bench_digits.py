@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Measure how fast the series engine of the _pi extension produces digits
+of Pi, against two pure-Python baselines:
+
+- decimal      the Chudnovsky series summed term by term with the decimal
+               module, at a working precision of the requested digits
+- python_int   binary splitting of the same series on Python integers,
+               the approach mpmath uses when no gmpy backend is installed
+
+mpmath's own mp.pi is timed as well when mpmath is importable. Every
+result is checked against the C engine before its time is reported.
+
+Usage:
+    python bench_digits.py
+    python bench_digits.py --digits 1000 10000 100000 --output digits.json
+"""
+
+import argparse
+import decimal
+import json
+import math
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "api-c-sources"))
+
+# 640320^3 / 24, the constant in the denominator of every series term
+C3_OVER_24 = 10939058860032000
+DIGITS_PER_TERM = 14.181647462725477
+
+
+def decimal_pi(digits):
+    """Sum the Chudnovsky series with Decimal arithmetic."""
+    with decimal.localcontext() as ctx:
+        ctx.prec = digits + 10
+        a_k, a_sum, b_sum = decimal.Decimal(1), decimal.Decimal(1), decimal.Decimal(0)
+        for k in range(1, int(digits / DIGITS_PER_TERM) + 2):
+            a_k *= -decimal.Decimal((6 * k - 5) * (2 * k - 1) * (6 * k - 1)) / (k * k * k * C3_OVER_24)
+            a_sum += a_k
+            b_sum += k * a_k
+        total = 13591409 * a_sum + 545140134 * b_sum
+        pi = 426880 * decimal.Decimal(10005).sqrt() / total
+    return "3." + str(pi)[2:digits + 2]
+
+
+def _split(a, b):
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a * a * a * C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        return p, q, -t if a & 1 else t
+    m = (a + b) // 2
+    p1, q1, t1 = _split(a, m)
+    p2, q2, t2 = _split(m, b)
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+
+def python_int_pi(digits):
+    """Binary splitting of the Chudnovsky series on Python integers."""
+    guard = digits + 10
+    _, q, t = _split(0, int(guard / DIGITS_PER_TERM) + 2)
+    scaled = q * 426880 * math.isqrt(10005 * 10 ** (2 * guard)) // t
+    text = str(scaled)
+    return "3." + text[1:digits + 1]
+
+
+def mpmath_pi(digits):
+    import mpmath
+    mpmath.mp.dps = digits + 10
+    return "3." + mpmath.nstr(+mpmath.mp.pi, digits + 5, strip_zeros=False)[2:digits + 2]
+
+
+def make_methods(pi_digits):
+    methods = {"series": pi_digits, "decimal": decimal_pi, "python_int": python_int_pi}
+    try:
+        import mpmath  # noqa: F401
+        methods["mpmath"] = mpmath_pi
+    except ImportError:
+        pass
+    return methods
+
+
+def bench(method, digits, repeats, reference):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = method(digits)
+        timings.append(time.perf_counter() - start)
+    if result != reference:
+        raise AssertionError(f"{method.__name__} gave different digits at {digits} digits")
+    seconds = min(timings)
+    return {"seconds": seconds, "digits_per_sec": digits / seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Digits per second of the series engine vs pure-Python baselines")
+    parser.add_argument("--digits", type=int, nargs="+", default=[1_000, 10_000, 50_000, 100_000],
+                        help="digit counts to compute")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per measurement (best is kept)")
+    parser.add_argument("--max-decimal-digits", type=int, default=50_000,
+                        help="skip the (quadratic) decimal baseline above this many digits")
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    try:
+        from pi_wrapper import pi_digits
+    except ImportError:
+        print("The _pi extension is not built. Run: python api-c-sources/pi_extension_build.py")
+        return 1
+
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+
+    methods = make_methods(pi_digits)
+    results = {name: {} for name in methods}
+
+    print("Digits of Pi per second (best of", args.repeats, "runs)")
+    print(f"{'digits':>10s}" + "".join(f"{name:>16s}" for name in methods))
+    for digits in args.digits:
+        reference = pi_digits(digits)
+        row = f"{digits:10,d}"
+        for name, method in methods.items():
+            if name == "decimal" and digits > args.max_decimal_digits:
+                row += f"{'-':>16s}"
+                continue
+            result = bench(method, digits, args.repeats, reference)
+            results[name][str(digits)] = result
+            row += f"{result['digits_per_sec']:16,.0f}"
+        print(row, flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"repeats": args.repeats, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
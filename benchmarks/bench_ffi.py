@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Measure what one foreign call costs in every CFFI mode this repository
+demonstrates, and in ctypes, by calling the same trivial functions
+through each of them:
+
+- strlen(b"hello, world")   the C library
+- fibonacci(20)             api-outofline's extension
+- pi_approx(1)              libpiapprox, built from api-c-sources or main-mode
+
+Every mode runs in a fresh interpreter, so its startup cost (importing
+cffi or ctypes, loading the module or library, parsing declarations) is
+measured from a cold start. A function a mode cannot reach is reported as
+"-": ABI mode and ctypes only see exported symbols, and the compiled
+examples each expose their own functions.
+
+Usage:
+    python bench_ffi.py
+    python bench_ffi.py --calls 200000 --output ffi.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FUNCTIONS = ["strlen", "fibonacci", "pi_approx"]
+
+# mode -> (directory holding its compiled module, module name)
+EXTENSIONS = {
+    "api-outofline": ("api-outofline", "_example"),
+    "api-c-standard-library": ("api-c-standard-library", "_example"),
+    "api-c-sources": ("api-c-sources", "_pi"),
+    "main-mode-static": (os.path.join("main-mode", "build"), "_pi_cffi"),
+    "main-mode-shared": (os.path.join("main-mode", "build-shared"), "_pi_cffi_dll"),
+}
+
+MODES = ["abi-inline", "abi-outofline"] + list(EXTENSIONS) + ["ctypes"]
+
+LIBRARY_DIRS = [os.path.join(REPO_ROOT, "main-mode", d) for d in
+                ("build-shared", "build", os.path.join("build", "Release"), os.path.join("build-shared", "Release"))]
+LIBRARY_NAMES = {"win32": ["piapprox.dll"], "darwin": ["piapprox.dylib", "libpiapprox.dylib"]}.get(
+    sys.platform, ["piapprox.so", "libpiapprox.so"])
+
+# ffi.dlopen(None) is the C library everywhere but on Windows
+LIBC = "msvcrt" if sys.platform == "win32" else None
+
+LIBC_CDEF = "size_t strlen(const char *s);"
+PIAPPROX_CDEF = "float pi_approx(int n);"
+
+ARGS = {"strlen": (b"hello, world",), "fibonacci": (20,), "pi_approx": (1,)}
+
+# Libraries opened in ABI mode are closed when their object is collected,
+# even while function pointers taken from them are still in use
+_opened = []
+
+
+def find_piapprox(paths):
+    for directory in paths + LIBRARY_DIRS:
+        for name in LIBRARY_NAMES:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def build_abi_module(directory):
+    """Generate the out-of-line ABI modules (plain .py files, no compiler)."""
+    from cffi import FFI
+    for name, cdef in (("_bench_libc", LIBC_CDEF), ("_bench_piapprox", PIAPPROX_CDEF)):
+        ffibuilder = FFI()
+        ffibuilder.set_source(name, None)
+        ffibuilder.cdef(cdef)
+        ffibuilder.compile(tmpdir=directory)
+
+
+# -- worker side: runs in its own interpreter, one mode per process ----------
+
+def _dlopen(ffi, name):
+    lib = ffi.dlopen(name)
+    _opened.append(lib)
+    return lib
+
+
+def setup_mode(mode, library, abi_dir):
+    """Import and load everything the mode needs; returns {function: callable}."""
+    functions = {}
+    if mode == "abi-inline":
+        from cffi import FFI
+        ffi = FFI()
+        ffi.cdef(LIBC_CDEF)
+        functions["strlen"] = _dlopen(ffi, LIBC).strlen
+        if library:
+            ffi_pi = FFI()
+            ffi_pi.cdef(PIAPPROX_CDEF)
+            functions["pi_approx"] = _dlopen(ffi_pi, library).pi_approx
+    elif mode == "abi-outofline":
+        sys.path.insert(0, abi_dir)
+        import _bench_libc
+        functions["strlen"] = _dlopen(_bench_libc.ffi, LIBC).strlen
+        if library:
+            import _bench_piapprox
+            functions["pi_approx"] = _dlopen(_bench_piapprox.ffi, library).pi_approx
+    elif mode == "ctypes":
+        import ctypes
+        libc = ctypes.CDLL(LIBC)
+        libc.strlen.argtypes = [ctypes.c_char_p]
+        libc.strlen.restype = ctypes.c_size_t
+        functions["strlen"] = libc.strlen
+        if library:
+            lib = ctypes.CDLL(library)
+            lib.pi_approx.argtypes = [ctypes.c_int]
+            lib.pi_approx.restype = ctypes.c_float
+            functions["pi_approx"] = lib.pi_approx
+    else:
+        directory, module_name = EXTENSIONS[mode]
+        sys.path.insert(0, os.path.join(REPO_ROOT, directory))
+        import importlib
+        lib = importlib.import_module(module_name).lib
+        for name in FUNCTIONS:
+            if hasattr(lib, name):
+                functions[name] = getattr(lib, name)
+    return functions
+
+
+def time_calls(fn, args, calls, warmup, repeats):
+    """Median and best nanoseconds per call over repeats loops of calls calls."""
+    loop = range(calls)
+    for _ in range(warmup):
+        for _ in loop:
+            fn(*args)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in loop:
+            fn(*args)
+        timings.append((time.perf_counter_ns() - start) / calls)
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+def worker(args):
+    start = time.perf_counter()
+    try:
+        functions = setup_mode(args.worker, args.library, args.abi_dir)
+    except ImportError as e:
+        print(json.dumps({"error": str(e)}))
+        return 0
+    result = {"startup_ms": (time.perf_counter() - start) * 1000, "functions": {}}
+    for name, fn in functions.items():
+        result["functions"][name] = time_calls(fn, ARGS[name], args.calls, args.warmup, args.repeats)
+    print(json.dumps(result))
+    return 0
+
+
+# -- driver side -------------------------------------------------------------
+
+def run_mode(mode, args, library, abi_dir):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", mode,
+               "--calls", str(args.calls), "--warmup", str(args.warmup),
+               "--repeats", str(args.repeats), "--abi-dir", abi_dir]
+    if library:
+        command += ["--library", library]
+    output = subprocess.run(command, capture_output=True, text=True)
+    if output.returncode != 0:
+        stderr = output.stderr.strip()
+        return {"error": stderr.splitlines()[-1] if stderr else f"worker exited with status {output.returncode}"}
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def print_table(results):
+    width = max(len(m) for m in results) + 2
+    print(f"\n{'mode':{width}s}{'startup ms':>12s}" + "".join(f"{name + ' ns':>16s}" for name in FUNCTIONS))
+    for mode, result in results.items():
+        if "error" in result:
+            print(f"{mode:{width}s}  not available: {result['error']}")
+            continue
+        row = f"{mode:{width}s}{result['startup_ms']:12.1f}"
+        for name in FUNCTIONS:
+            timing = result["functions"].get(name)
+            row += f"{timing['median']:16.1f}" if timing else f"{'-':>16s}"
+        print(row)
+
+    print(f"\n{'mode':{width}s}" + "".join(f"{name + ' calls/s':>22s}" for name in FUNCTIONS))
+    for mode, result in results.items():
+        if "error" in result:
+            continue
+        row = f"{mode:{width}s}"
+        for name in FUNCTIONS:
+            timing = result["functions"].get(name)
+            row += f"{1e9 / timing['median']:22,.0f}" if timing else f"{'-':>22s}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call cost of every CFFI mode and ctypes")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES, help="modes to measure")
+    parser.add_argument("--path", action="append", default=[],
+                        help="extra directory to search for the shared libpiapprox (repeatable)")
+    parser.add_argument("--calls", type=int, default=100_000, help="calls per timed loop")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed loops before measuring")
+    parser.add_argument("--repeats", type=int, default=5, help="timed loops per function (median is kept)")
+    parser.add_argument("--output", help="optional JSON file for the results")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--library", help=argparse.SUPPRESS)
+    parser.add_argument("--abi-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args)
+
+    library = find_piapprox(args.path)
+    print("FFI Call Overhead Benchmark")
+    print("=" * 40)
+    print(f"libpiapprox: {library or 'not found (build main-mode with -DBUILD_SHARED_LIB=ON)'}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as abi_dir:
+        build_abi_module(abi_dir)
+        for mode in args.modes:
+            print(f"  measuring {mode}...", flush=True)
+            results[mode] = run_mode(mode, args, library, abi_dir)
+
+    print_table(results)
+    print("\nTimes include the Python loop around each call; startup is measured in a fresh interpreter.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "library": library,
+                    "settings": {"calls": args.calls, "warmup": args.warmup, "repeats": args.repeats},
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Compare quasi-Monte Carlo sampling (Sobol, Halton) with the pseudo-random
+Monte Carlo kernel of the _pi extension.
+
+For each sample count the script runs every method with several
+independent seeds (scrambled sequences for QMC) and reports the
+root-mean-square error against Pi and the time per run. The error column
+shows how many samples each method needs for a given accuracy.
+
+Usage:
+    python bench_qmc.py
+    python bench_qmc.py --max-exponent 8 --runs 20 --output qmc.json
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "api-c-sources"))
+
+
+def make_methods(lib):
+    return {
+        "monte_carlo": lambda n, seed: lib.pi_approx64_seeded(n, seed).estimate,
+        "sobol": lambda n, seed: lib.pi_approx_qmc(n, lib.PI_QMC_SOBOL, 1, seed).estimate,
+        "halton": lambda n, seed: lib.pi_approx_qmc(n, lib.PI_QMC_HALTON, 1, seed).estimate,
+    }
+
+
+def bench(method, n, runs):
+    errors = []
+    timings = []
+    for seed in range(1, runs + 1):
+        start = time.perf_counter()
+        estimate = method(n, seed)
+        timings.append(time.perf_counter() - start)
+        errors.append((estimate - math.pi) ** 2)
+    return {"rmse": math.sqrt(statistics.fmean(errors)), "seconds": statistics.median(timings)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare QMC and Monte Carlo sampling for pi_approx")
+    parser.add_argument("--min-exponent", type=int, default=3, help="smallest n is 10**min_exponent")
+    parser.add_argument("--max-exponent", type=int, default=7, help="largest n is 10**max_exponent")
+    parser.add_argument("--runs", type=int, default=10, help="independent seeds per measurement")
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    try:
+        from _pi import lib
+    except ImportError:
+        print("The _pi extension is not built. Run: python api-c-sources/pi_extension_build.py")
+        return 1
+
+    methods = make_methods(lib)
+    results = {name: {} for name in methods}
+
+    print("Quasi-Monte Carlo vs Monte Carlo (RMSE over", args.runs, "seeds, median time per run)")
+    print(f"{'n':>12s}" + "".join(f"{name:>26s}" for name in methods))
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        n = 10 ** exponent
+        row = f"{n:12,d}"
+        for name, method in methods.items():
+            result = bench(method, n, args.runs)
+            results[name][str(n)] = result
+            row += f"{result['rmse']:14.2e} {result['seconds'] * 1e3:9.2f}ms"
+        print(row)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
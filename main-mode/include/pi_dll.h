@@ -2,6 +2,9 @@
 #ifndef PI_H
 #define PI_H
 
+#include <stddef.h>
+#include <stdint.h>
+
 #ifdef _WIN32
     #ifdef BUILDING_PI_DLL
         #define PI_API __declspec(dllexport)
@@ -12,6 +15,74 @@
     #define PI_API
 #endif
 
+/* Exact outcome of a 64-bit run */
+typedef struct {
+  int64_t hits;
+  int64_t samples;
+  double estimate;
+} pi_result;
+
+/* Outcome of an adaptive-precision run */
+typedef struct {
+  int64_t hits;
+  int64_t samples;
+  double estimate;
+  double half_width;
+  int converged;
+} pi_until_result;
+
+/* Low-discrepancy sequences for pi_approx_qmc */
+typedef enum {
+  PI_QMC_SOBOL = 0,
+  PI_QMC_HALTON = 1
+} pi_qmc_sequence;
+
+/* Largest digit count accepted by pi_series_digits */
+#define PI_SERIES_MAX_DIGITS 5000000
+
+/* Entry points counted by pi_stats, as indices into pi_stats.entries */
+typedef enum {
+  PI_STATS_APPROX = 0,
+  PI_STATS_APPROX_SEEDED = 1,
+  PI_STATS_APPROX_PARALLEL = 2,
+  PI_STATS_APPROX64 = 3,
+  PI_STATS_APPROX64_SEEDED = 4,
+  PI_STATS_APPROX_UNTIL = 5,
+  PI_STATS_APPROX_UNTIL_SEEDED = 6,
+  PI_STATS_APPROX_QMC = 7,
+  PI_STATS_SERIES_DIGITS = 8
+} pi_stats_entry;
+
+#define PI_STATS_ENTRIES 9
+
+/* Counters of one entry point since load or the last pi_stats_reset.
+   For pi_series_digits, samples counts the digits produced */
+typedef struct {
+  uint64_t calls;
+  uint64_t samples;
+  uint64_t hits;
+  uint64_t nanoseconds;
+} pi_entry_stats;
+
+typedef struct {
+  pi_entry_stats entries[PI_STATS_ENTRIES];
+} pi_stats;
+
 PI_API float pi_approx(int n);
+PI_API float pi_approx_seeded(int n, uint64_t seed);
+PI_API double pi_approx_parallel(int64_t n, int threads, uint64_t seed);
+PI_API void pi_set_num_threads(int threads);
+PI_API int pi_get_num_threads(void);
+PI_API pi_result pi_approx64(int64_t n);
+PI_API pi_result pi_approx64_seeded(int64_t n, uint64_t seed);
+PI_API const char *pi_simd_kernel(void);
+PI_API pi_until_result pi_approx_until(double tolerance, double confidence, int64_t max_samples);
+PI_API pi_until_result pi_approx_until_seeded(double tolerance, double confidence, int64_t max_samples, uint64_t seed);
+PI_API pi_result pi_approx_qmc(int64_t n, pi_qmc_sequence sequence, int scramble, uint64_t seed);
+PI_API int pi_series_digits(int64_t digits, char *out, size_t out_size);
+PI_API void pi_stats_snapshot(pi_stats *out);
+PI_API void pi_stats_reset(pi_stats *previous);
+PI_API int pi_stats_enable(int enabled);
+PI_API const char *pi_stats_entry_name(int entry);
 
 #endif /* PI_H */
@@ -0,0 +1,55 @@
+"""
+Training workload for the profile-guided build (scripts/build_pgo.sh).
+Runs a representative mix of calls through the CFFI extension of an
+instrumented libpiapprox, so that the profile reflects how the library is
+used in production: many small and medium estimates, some large and
+parallel ones, adaptive runs, QMC and a few series computations.
+"""
+
+import os
+import sys
+import time
+
+# Add current directory to Python path so we can import the built extension
+sys.path.insert(0, os.getcwd())
+
+import _pi_cffi
+
+lib = _pi_cffi.lib
+ffi = _pi_cffi.ffi
+
+
+def main():
+    start = time.perf_counter()
+
+    # Short calls dominate real traffic: per-call overhead paths
+    for seed in range(20000):
+        lib.pi_approx_seeded(64, seed)
+    for seed in range(2000):
+        lib.pi_approx64_seeded(10000, seed)
+    for n in (1000, 10000, 100000):
+        lib.pi_approx(n)
+
+    # Large estimates: the sampling kernel and its tail handling
+    for seed in range(8):
+        lib.pi_approx64_seeded(10000000 + seed * 12345, seed)
+    for threads in (0, 1, 2):
+        lib.pi_approx_parallel(20000000, threads, 42)
+
+    # Adaptive precision and quasi-Monte Carlo
+    for tolerance in (0.01, 0.001, 0.0003):
+        lib.pi_approx_until_seeded(tolerance, 0.95, 10**9, 7)
+    for sequence in (lib.PI_QMC_SOBOL, lib.PI_QMC_HALTON):
+        for scramble in (0, 1):
+            lib.pi_approx_qmc(2000000, sequence, scramble, 3)
+
+    # Exact digits: bignum arithmetic at a few sizes
+    for digits in (100, 1000, 20000):
+        buf = ffi.new("char[]", digits + 3)
+        lib.pi_series_digits(digits, buf, len(buf))
+
+    print(f"Training workload finished in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+One import for every build of libpiapprox.
+
+    import piapprox
+
+    piapprox.approx(10_000_000, seed=42)   # estimate of Pi
+    piapprox.backend()                     # 'static', 'shared', 'abi' or 'numpy'
+
+Nothing is loaded at import time. On first use the backends are probed in
+order of speed and the first that loads is kept for the process:
+
+- static   the API-mode extension over the static library (_pi_cffi)
+- shared   the API-mode extension over the shared library (_pi_cffi_dll)
+- abi      ABI-mode ffi.dlopen() of the shared library itself
+- numpy    a vectorized NumPy implementation, when nothing is built
+
+Extensions and libraries are looked up on sys.path, then in the
+directories of PIAPPROX_PATH, the current directory and the CMake build
+directories of main-mode. PIAPPROX_BACKEND=<name> forces one backend.
+
+Every backend is reproducible for a given seed, but each C backend and
+the NumPy one draw different random streams, so their estimates for the
+same seed differ.
+"""
+
+import _thread
+import os
+
+BACKENDS = ("static", "shared", "abi", "numpy")
+
+_lock = _thread.allocate_lock()
+_active = None
+
+
+def __getattr__(name):
+    # Result lives with the backends so that importing the package stays cheap
+    if name == "Result":
+        from ._backends import Result
+        return Result
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _backend():
+    global _active
+    if _active is None:
+        with _lock:
+            if _active is None:
+                from . import _backends
+                _active = _backends.select(os.environ.get("PIAPPROX_BACKEND") or None)
+    return _active
+
+
+def backend():
+    """Name of the backend in use, probing for it if needed."""
+    return _backend().name
+
+
+def use(name=None):
+    """Switch to the named backend (None probes again); returns its name.
+
+    Raises ImportError if that backend cannot be loaded, leaving the
+    current one in place.
+    """
+    global _active
+    if name is not None and name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {name!r}")
+    from . import _backends
+    chosen = _backends.select(name)
+    with _lock:
+        _active = chosen
+    return chosen.name
+
+
+def approx64(n, seed=None):
+    """Exact hit and sample counts of n samples, with the estimate as a double."""
+    from ._backends import Result
+    hits, samples = _backend().approx64(n, seed)
+    return Result(hits, samples, 4 * hits / samples if samples > 0 else 0.0)
+
+
+def approx(n, seed=None):
+    """Monte Carlo estimate of Pi from n samples."""
+    return approx64(n, seed).estimate
+
+
+def approx_parallel(n, threads=0, seed=None):
+    """Estimate of Pi with the samples split across threads (0: library default).
+
+    The result depends only on n and seed, not on the thread count. The
+    NumPy backend runs single-threaded.
+    """
+    return _backend().approx_parallel(n, threads, seed)
+
+
+def digits(count):
+    """'3.' followed by the first count decimals of Pi."""
+    return _backend().digits(count)
+
+
+def kernel():
+    """Sampling kernel of the active backend ('avx512', 'avx2', 'sse2', 'scalar' or 'numpy')."""
+    return _backend().kernel()
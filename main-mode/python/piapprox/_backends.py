@@ -0,0 +1,214 @@
+"""
+Backend probing for the piapprox package.
+Imported only once a backend is first needed, so that importing piapprox
+itself loads nothing beyond what the interpreter has already imported.
+"""
+
+import importlib
+import importlib.machinery
+import importlib.util
+import math
+import os
+import random
+import sys
+from collections import namedtuple
+
+_MAIN_MODE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Declarations used in ABI mode: a subset of include/pi.h, with nothing
+# left for the compiler to fill in since no compiler is involved
+_ABI_CDEF = """
+    typedef struct {
+        int64_t hits;
+        int64_t samples;
+        double estimate;
+    } pi_result;
+
+    double pi_approx_parallel(int64_t n, int threads, uint64_t seed);
+    pi_result pi_approx64(int64_t n);
+    pi_result pi_approx64_seeded(int64_t n, uint64_t seed);
+    const char *pi_simd_kernel(void);
+    #define PI_SERIES_MAX_DIGITS 5000000
+    int pi_series_digits(int64_t digits, char *out, size_t out_size);
+"""
+
+# PI_SERIES_MAX_DIGITS, for the backend that has no library to ask
+_MAX_DIGITS = 5_000_000
+
+# CMake builds the shared library without the usual "lib" prefix
+_LIBRARY_NAMES = {
+    "win32": ["piapprox.dll"],
+    "darwin": ["piapprox.dylib", "libpiapprox.dylib"],
+}.get(sys.platform, ["piapprox.so", "libpiapprox.so"])
+
+Result = namedtuple("Result", ["hits", "samples", "estimate"])
+
+
+def search_dirs():
+    """Directories searched after sys.path, in order."""
+    dirs = [d for d in os.environ.get("PIAPPROX_PATH", "").split(os.pathsep) if d]
+    dirs.append(os.getcwd())
+    for build in ("build", "build-shared"):
+        for config in ("", "Release", "Debug"):
+            dirs.append(os.path.join(_MAIN_MODE, build, config))
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+class CffiBackend:
+    """Any CFFI module of libpiapprox: API-mode extension or ABI-mode library."""
+
+    def __init__(self, name, ffi, lib):
+        self.name = name
+        self.ffi = ffi
+        self.lib = lib
+
+    def approx64(self, n, seed):
+        if seed is None:
+            result = self.lib.pi_approx64(n)
+        else:
+            result = self.lib.pi_approx64_seeded(n, seed)
+        return result.hits, result.samples
+
+    def approx_parallel(self, n, threads, seed):
+        return self.lib.pi_approx_parallel(n, threads, random.getrandbits(64) if seed is None else seed)
+
+    def digits(self, count):
+        limit = self.lib.PI_SERIES_MAX_DIGITS
+        if not 1 <= count <= limit:
+            raise ValueError(f"digits must be between 1 and {limit}, got {count}")
+        buf = self.ffi.new("char[]", count + 3)
+        status = self.lib.pi_series_digits(count, buf, len(buf))
+        if status == -2:
+            raise MemoryError(f"not enough memory for {count} digits")
+        return self.ffi.string(buf).decode()
+
+    def kernel(self):
+        return self.ffi.string(self.lib.pi_simd_kernel()).decode()
+
+
+class NumpyBackend:
+    """Vectorized fallback: the same Monte Carlo method, in NumPy chunks."""
+
+    name = "numpy"
+    chunk_size = 1 << 20
+
+    def __init__(self):
+        import numpy
+        self.np = numpy
+
+    def approx64(self, n, seed):
+        rng = self.np.random.default_rng(seed)
+        hits, left = 0, n
+        while left > 0:
+            points = rng.random((2, min(left, self.chunk_size)))
+            hits += int(self.np.count_nonzero(points[0] * points[0] + points[1] * points[1] < 1.0))
+            left -= points.shape[1]
+        return hits, max(n, 0)
+
+    def approx_parallel(self, n, threads, seed):
+        hits, samples = self.approx64(n, seed)
+        return 4 * hits / samples if samples > 0 else 0.0
+
+    def digits(self, count):
+        if not 1 <= count <= _MAX_DIGITS:
+            raise ValueError(f"digits must be between 1 and {_MAX_DIGITS}, got {count}")
+        return python_digits(count)
+
+    def kernel(self):
+        return "numpy"
+
+
+# 640320^3 / 24 and the digits gained per term of the Chudnovsky series
+_C3_OVER_24 = 10939058860032000
+_DIGITS_PER_TERM = 14.181647462725477
+
+
+def _split(a, b):
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a * a * a * _C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        return p, q, -t if a & 1 else t
+    m = (a + b) // 2
+    p1, q1, t1 = _split(a, m)
+    p2, q2, t2 = _split(m, b)
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+
+def python_digits(count):
+    """Chudnovsky series by binary splitting on Python integers."""
+    guard = count + 10
+    _, q, t = _split(0, int(guard / _DIGITS_PER_TERM) + 2)
+    value = q * 426880 * math.isqrt(10005 * 10 ** (2 * guard)) // t
+    # Lift the interpreter's int-to-str digit limit for this conversion only
+    limit = sys.get_int_max_str_digits() if hasattr(sys, "get_int_max_str_digits") else None
+    if limit is not None:
+        sys.set_int_max_str_digits(0)
+    try:
+        text = str(value)
+    finally:
+        if limit is not None:
+            sys.set_int_max_str_digits(limit)
+    return "3." + text[1:count + 1]
+
+
+def _import_extension(name):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        pass
+    spec = importlib.machinery.PathFinder.find_spec(name, search_dirs())
+    if spec is None:
+        raise ImportError(f"{name} is not built")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+def _load_extension(backend_name, module_name):
+    module = _import_extension(module_name)
+    return CffiBackend(backend_name, module.ffi, module.lib)
+
+
+def _load_abi():
+    from cffi import FFI
+    ffi = FFI()
+    ffi.cdef(_ABI_CDEF)
+    candidates = [os.path.join(d, name) for d in search_dirs() for name in _LIBRARY_NAMES]
+    for path in candidates:
+        if os.path.exists(path):
+            try:
+                return CffiBackend("abi", ffi, ffi.dlopen(path))
+            except OSError:
+                continue
+    try:
+        # last resort: the system search path (LD_LIBRARY_PATH, PATH, ...)
+        return CffiBackend("abi", ffi, ffi.dlopen("piapprox"))
+    except OSError:
+        raise ImportError("libpiapprox shared library not found") from None
+
+
+_LOADERS = {
+    "static": lambda: _load_extension("static", "_pi_cffi"),
+    "shared": lambda: _load_extension("shared", "_pi_cffi_dll"),
+    "abi": _load_abi,
+    "numpy": NumpyBackend,
+}
+
+
+def select(name=None):
+    """Load the named backend, or the first available one when name is None."""
+    if name is not None and name not in _LOADERS:
+        raise ValueError(f"backend must be one of {tuple(_LOADERS)}, got {name!r}")
+    names = list(_LOADERS) if name is None else [name]
+    errors = []
+    for candidate in names:
+        try:
+            return _LOADERS[candidate]()
+        except ImportError as e:
+            errors.append(f"{candidate}: {e}")
+    raise ImportError("no piapprox backend is available (" + "; ".join(errors) + ")")
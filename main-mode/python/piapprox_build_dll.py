@@ -1,4 +1,5 @@
 from cffi import FFI
+import sys
 import os
 
 ffibuilder = FFI()
@@ -6,15 +7,86 @@ ffibuilder = FFI()
 # cdef() expects a single string declaring the C types, functions and
 # globals needed to use the shared object. It must be in valid C syntax.
 ffibuilder.cdef("""
+    typedef struct {
+        int64_t hits;
+        int64_t samples;
+        double estimate;
+    } pi_result;
+
+    typedef struct {
+        int64_t hits;
+        int64_t samples;
+        double estimate;
+        double half_width;
+        int converged;
+    } pi_until_result;
+
+    typedef enum {
+        PI_QMC_SOBOL = 0,
+        PI_QMC_HALTON = 1
+    } pi_qmc_sequence;
+
+    #define PI_SERIES_MAX_DIGITS 5000000
+
+    typedef enum {
+        PI_STATS_APPROX = 0,
+        PI_STATS_APPROX_SEEDED = 1,
+        PI_STATS_APPROX_PARALLEL = 2,
+        PI_STATS_APPROX64 = 3,
+        PI_STATS_APPROX64_SEEDED = 4,
+        PI_STATS_APPROX_UNTIL = 5,
+        PI_STATS_APPROX_UNTIL_SEEDED = 6,
+        PI_STATS_APPROX_QMC = 7,
+        PI_STATS_SERIES_DIGITS = 8
+    } pi_stats_entry;
+
+    #define PI_STATS_ENTRIES 9
+
+    typedef struct {
+        uint64_t calls;
+        uint64_t samples;
+        uint64_t hits;
+        uint64_t nanoseconds;
+    } pi_entry_stats;
+
+    typedef struct {
+        pi_entry_stats entries[9];
+    } pi_stats;
+
     float pi_approx(int n);
+    float pi_approx_seeded(int n, uint64_t seed);
+    double pi_approx_parallel(int64_t n, int threads, uint64_t seed);
+    void pi_set_num_threads(int threads);
+    int pi_get_num_threads(void);
+    pi_result pi_approx64(int64_t n);
+    pi_result pi_approx64_seeded(int64_t n, uint64_t seed);
+    const char *pi_simd_kernel(void);
+    pi_until_result pi_approx_until(double tolerance, double confidence, int64_t max_samples);
+    pi_until_result pi_approx_until_seeded(double tolerance, double confidence, int64_t max_samples, uint64_t seed);
+    pi_result pi_approx_qmc(int64_t n, pi_qmc_sequence sequence, int scramble, uint64_t seed);
+    int pi_series_digits(int64_t digits, char *out, size_t out_size);
+    void pi_stats_snapshot(pi_stats *out);
+    void pi_stats_reset(pi_stats *previous);
+    int pi_stats_enable(int enabled);
+    const char *pi_stats_entry_name(int entry);
 """)
 
+# A library configured with -DPI_ENABLE_OPENMP=ON needs the OpenMP
+# runtime at link time (the python_extension target sets this variable)
+extra_link_args = []
+if os.environ.get("PI_ENABLE_OPENMP") == "1" and sys.platform != "win32":
+    extra_link_args.append('-fopenmp')
+# An instrumented (PI_PGO=GENERATE) library needs the profiling runtime
+if os.environ.get("PI_PGO") == "GENERATE":
+    extra_link_args.append('-fprofile-generate')
+
 # For shared library approach, we'll link against the DLL
 ffibuilder.set_source("_pi_cffi_dll",
 """
      #include "pi_dll.h"   // the C header of the library
 """,
      libraries=['piapprox'],           # library name, for the linker (looks for piapprox.dll)
+     extra_link_args=extra_link_args,
      library_dirs=['.', '../build', '../build/Release', '../build/Debug'],  # look for library in build directories
      include_dirs=['../include'])     # look for headers
 
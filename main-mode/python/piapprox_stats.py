@@ -0,0 +1,56 @@
+"""
+Python view of the libpiapprox call counters (pi_stats).
+Works with either CFFI extension: _pi_cffi (static library) or
+_pi_cffi_dll (shared library), whichever is passed or importable.
+"""
+
+from collections import namedtuple
+
+EntryStats = namedtuple("EntryStats", ["calls", "samples", "hits", "nanoseconds"])
+
+
+def _extension(module):
+    if module is not None:
+        return module
+    try:
+        import _pi_cffi as module
+    except ImportError:
+        import _pi_cffi_dll as module
+    return module
+
+
+def _to_dict(module, stats):
+    names = (module.ffi.string(module.lib.pi_stats_entry_name(i)).decode()
+             for i in range(module.lib.PI_STATS_ENTRIES))
+    return {name: EntryStats(e.calls, e.samples, e.hits, e.nanoseconds)
+            for name, e in zip(names, stats.entries)}
+
+
+def snapshot(module=None):
+    """Return {entry point name: EntryStats} with the current counter values."""
+    module = _extension(module)
+    stats = module.ffi.new("pi_stats *")
+    module.lib.pi_stats_snapshot(stats)
+    return _to_dict(module, stats)
+
+
+def reset(module=None):
+    """Zero every counter and return the values that were cleared, as snapshot() would."""
+    module = _extension(module)
+    stats = module.ffi.new("pi_stats *")
+    module.lib.pi_stats_reset(stats)
+    return _to_dict(module, stats)
+
+
+def enable(enabled=True, module=None):
+    """Switch counting on or off; returns whether it was on before."""
+    return bool(_extension(module).lib.pi_stats_enable(1 if enabled else 0))
+
+
+def report(stats):
+    """Format a snapshot as a table, one line per entry point that was called."""
+    lines = [f"{'entry point':24s}{'calls':>10s}{'samples':>16s}{'hits':>16s}{'ms':>12s}"]
+    for name, e in stats.items():
+        if e.calls:
+            lines.append(f"{name:24s}{e.calls:10d}{e.samples:16d}{e.hits:16d}{e.nanoseconds / 1e6:12.3f}")
+    return "\n".join(lines)
@@ -19,6 +19,8 @@ try:
         
         print("Testing Pi Approximation Function (Static Library Version)")
         print("=" * 55)
+        kernel = _pi_cffi.ffi.string(_pi_cffi.lib.pi_simd_kernel()).decode()
+        print(f"Sampling kernel: {kernel}")
         
         # Test with different numbers of iterations
         test_cases = [1000, 10000, 100000, 1000000]
@@ -31,6 +33,48 @@ try:
         print("\nNote: This is a Monte Carlo approximation, so results will vary each run.")
         print("Generally, more iterations should give better approximations.")
 
+        # The seeded variant is reentrant and reproducible
+        first = _pi_cffi.lib.pi_approx_seeded(1000000, 42)
+        second = _pi_cffi.lib.pi_approx_seeded(1000000, 42)
+        print(f"\nSeeded (seed=42): {first:.6f} | Reproducible: {first == second}")
+
+        # One call spreads the work over every core (threads=0)
+        parallel = _pi_cffi.lib.pi_approx_parallel(10000000, 0, 42)
+        single = _pi_cffi.lib.pi_approx_parallel(10000000, 1, 42)
+        print(f"Parallel (10M samples): {parallel:.6f} | Same as 1 thread: {parallel == single}")
+
+        # threads=0 follows the library-wide setting, adjustable at run time
+        default_threads = _pi_cffi.lib.pi_get_num_threads()
+        _pi_cffi.lib.pi_set_num_threads(2)
+        tuned = _pi_cffi.lib.pi_approx_parallel(10000000, 0, 42)
+        print(f"Threads: default {default_threads}, now {_pi_cffi.lib.pi_get_num_threads()} | Same result: {tuned == single}")
+        _pi_cffi.lib.pi_set_num_threads(0)
+
+        # 64-bit counters and a double-precision estimate
+        result = _pi_cffi.lib.pi_approx64_seeded(10000000, 42)
+        print(f"64-bit (10M samples): {result.estimate:.9f} | Hits: {result.hits} of {result.samples}")
+
+        # Let the library choose n: sample until the 95% interval is tight enough
+        for tolerance in [0.01, 0.001, 0.0001]:
+            result = _pi_cffi.lib.pi_approx_until(tolerance, 0.95, 10**10)
+            print(f"Tolerance: {tolerance:8.4f} | Pi approx: {result.estimate:.6f} | Samples used: {result.samples}")
+
+        # Low-discrepancy points converge much faster than random ones
+        for name, sequence in [("Sobol", _pi_cffi.lib.PI_QMC_SOBOL), ("Halton", _pi_cffi.lib.PI_QMC_HALTON)]:
+            result = _pi_cffi.lib.pi_approx_qmc(1000000, sequence, 1, 42)
+            print(f"QMC {name:6s} (1M points): {result.estimate:.6f} | Error: {abs(result.estimate - 3.14159265):.6f}")
+
+        # The series engine is exact: digits are written into our buffer
+        buf = _pi_cffi.ffi.new("char[]", 53)
+        _pi_cffi.lib.pi_series_digits(50, buf, len(buf))
+        print(f"Series (50 digits): {_pi_cffi.ffi.string(buf).decode()}")
+
+        # Every entry point above was counted: calls, samples, hits, time
+        import piapprox_stats
+        print("\nCall counters:")
+        print(piapprox_stats.report(piapprox_stats.reset(_pi_cffi)))
+        print(f"After reset: {sum(e.calls for e in piapprox_stats.snapshot(_pi_cffi).values())} calls")
+
     if __name__ == "__main__":
         test_pi_approximation()
 
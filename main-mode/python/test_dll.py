@@ -14,9 +14,10 @@ sys.path.insert(0, '.')
 sys.path.insert(0, os.path.dirname(__file__))
 
 try:
-    from _pi_cffi_dll import lib
+    from _pi_cffi_dll import ffi, lib
     print("Testing Pi Approximation Function (DLL Version)")
     print("=" * 50)
+    print(f"Sampling kernel: {ffi.string(lib.pi_simd_kernel()).decode()}")
     
     # Test different iteration counts
     test_values = [1000, 10000, 100000, 1000000]
@@ -27,6 +28,49 @@ try:
         print(f"Iterations: {iterations:8d} | Pi approx: {pi_estimate:.6f} | Error: {error:.6f}")
     
     print("\nNote: This is a Monte Carlo approximation, so results will vary each run.")
+    
+    # The seeded variant is reentrant and reproducible
+    first = lib.pi_approx_seeded(1000000, 42)
+    second = lib.pi_approx_seeded(1000000, 42)
+    print(f"Seeded (seed=42): {first:.6f} | Reproducible: {first == second}")
+    
+    # One call spreads the work over every core (threads=0)
+    parallel = lib.pi_approx_parallel(10000000, 0, 42)
+    single = lib.pi_approx_parallel(10000000, 1, 42)
+    print(f"Parallel (10M samples): {parallel:.6f} | Same as 1 thread: {parallel == single}")
+    
+    # threads=0 follows the library-wide setting, adjustable at run time
+    default_threads = lib.pi_get_num_threads()
+    lib.pi_set_num_threads(2)
+    tuned = lib.pi_approx_parallel(10000000, 0, 42)
+    print(f"Threads: default {default_threads}, now {lib.pi_get_num_threads()} | Same result: {tuned == single}")
+    lib.pi_set_num_threads(0)
+    
+    # 64-bit counters and a double-precision estimate
+    result = lib.pi_approx64_seeded(10000000, 42)
+    print(f"64-bit (10M samples): {result.estimate:.9f} | Hits: {result.hits} of {result.samples}")
+    
+    # Let the library choose n: sample until the 95% interval is tight enough
+    for tolerance in [0.01, 0.001, 0.0001]:
+        result = lib.pi_approx_until(tolerance, 0.95, 10**10)
+        print(f"Tolerance: {tolerance:8.4f} | Pi approx: {result.estimate:.6f} | Samples used: {result.samples}")
+    
+    # Low-discrepancy points converge much faster than random ones
+    for name, sequence in [("Sobol", lib.PI_QMC_SOBOL), ("Halton", lib.PI_QMC_HALTON)]:
+        result = lib.pi_approx_qmc(1000000, sequence, 1, 42)
+        print(f"QMC {name:6s} (1M points): {result.estimate:.6f} | Error: {abs(result.estimate - 3.14159265359):.6f}")
+    
+    # The series engine is exact: digits are written into our buffer
+    buf = ffi.new("char[]", 53)
+    lib.pi_series_digits(50, buf, len(buf))
+    print(f"Series (50 digits): {ffi.string(buf).decode()}")
+    
+    # Every entry point above was counted: calls, samples, hits, time
+    import _pi_cffi_dll
+    import piapprox_stats
+    print("\nCall counters:")
+    print(piapprox_stats.report(piapprox_stats.reset(_pi_cffi_dll)))
+    print(f"After reset: {sum(e.calls for e in piapprox_stats.snapshot(_pi_cffi_dll).values())} calls")
     print("The DLL (piapprox.dll) is loaded dynamically and can be shared by other applications.")
     
 except ImportError as e:
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for the piapprox package.
+It finds whichever build of libpiapprox is available (or falls back to
+NumPy) by itself, then runs the same calls through every backend that
+loads on this machine.
+"""
+
+import time
+
+start = time.perf_counter()
+import piapprox
+import_ms = (time.perf_counter() - start) * 1000
+
+print("Testing the piapprox package")
+print("=" * 50)
+start = time.perf_counter()
+active = piapprox.backend()
+print(f"Import: {import_ms:.2f} ms | Backend: {active} (probed in {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+# 5000 digits is past the interpreter's default int-to-str limit of 4300
+reference = piapprox.digits(50)
+long_reference = piapprox.digits(5000)
+assert reference.startswith("3.14159265358979"), f"Expected the digits of Pi, got {reference}"
+assert len(long_reference) == 5002, f"Expected 5000 digits, got {len(long_reference) - 2}"
+for name in piapprox.BACKENDS:
+    try:
+        piapprox.use(name)
+    except ImportError as e:
+        print(f"{name:7s} | not available: {e}")
+        continue
+    result = piapprox.approx64(1000000, seed=42)
+    assert piapprox.approx(1000000, seed=42) == result.estimate, f"Expected {name} to be reproducible"
+    assert piapprox.digits(50) == reference, f"Expected {name} to agree on 50 digits"
+    assert piapprox.digits(5000) == long_reference, f"Expected {name} to agree on 5000 digits"
+    for count in (0, 10**12):
+        try:
+            piapprox.digits(count)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Expected {name} to reject {count} digits")
+    print(f"{name:7s} | kernel {piapprox.kernel():7s} | Pi approx: {result.estimate:.6f} | "
+          f"Reproducible, digits agree, bad counts rejected")
+
+piapprox.use(active)
+print(f"Series (50 digits): {reference}")
+print("All piapprox tests passed!")
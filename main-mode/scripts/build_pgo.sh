@@ -0,0 +1,74 @@
+#!/bin/bash
+# Profile-guided + link-time optimized build of libpiapprox (Linux/macOS)
+#
+#   1. plain Release build (the baseline)          -> build-release/
+#   2. instrumented build                          -> build-pgo/
+#   3. training workload through the CFFI extension, profiles in build-pgo/pgo-data/
+#   4. rebuild with the profiles and IPO/LTO        -> build-pgo/
+#   5. benchmark both builds and report the change
+#
+# Both variants are static builds linked into the _pi_cffi extension.
+# Set PYTHON to choose the interpreter (default: python3).
+
+PYTHON=${PYTHON:-python3}
+MAIN_MODE=$(cd "$(dirname "$0")/.." && pwd)
+PGO_DIR="$MAIN_MODE/build-pgo/pgo-data"
+BENCH="$MAIN_MODE/../benchmarks/bench_builds.py"
+
+echo "Building profile-guided + LTO libpiapprox"
+echo "========================================="
+
+if ! command -v cmake &> /dev/null; then
+    echo "ERROR: CMake is not installed"
+    exit 1
+fi
+
+cd "$MAIN_MODE"
+
+configure() {
+    local dir=$1
+    shift
+    cmake -S . -B "$dir" -DCMAKE_BUILD_TYPE=Release -DBUILD_SHARED_LIB=OFF \
+        -DBUILD_PYTHON_EXTENSION=ON -DPYTHON_EXECUTABLE="$(command -v "$PYTHON")" "$@" > /dev/null
+}
+
+fail() {
+    echo "ERROR: $1"
+    exit 1
+}
+
+echo
+echo "Step 1: Plain Release build (baseline)..."
+configure build-release -DPI_PGO=OFF -DPI_ENABLE_IPO=OFF || fail "CMake configuration failed"
+cmake --build build-release --target python_extension > /dev/null || fail "Release build failed"
+
+echo
+echo "Step 2: Instrumented build..."
+rm -rf "$PGO_DIR"
+configure build-pgo -DPI_PGO=GENERATE -DPI_PGO_DIR="$PGO_DIR" -DPI_ENABLE_IPO=OFF || fail "CMake configuration failed"
+cmake --build build-pgo --target python_extension --clean-first > /dev/null || fail "Instrumented build failed"
+
+echo
+echo "Step 3: Running the training workload..."
+(cd build-pgo && "$PYTHON" ../python/pgo_training.py) || fail "Training workload failed"
+
+# Clang writes raw profiles that have to be merged first
+if ls "$PGO_DIR"/*.profraw &> /dev/null; then
+    llvm-profdata merge -output="$PGO_DIR/default.profdata" "$PGO_DIR"/*.profraw || fail "llvm-profdata merge failed"
+fi
+
+echo
+echo "Step 4: Rebuilding with profile data and IPO/LTO..."
+configure build-pgo -DPI_PGO=USE -DPI_ENABLE_IPO=ON || fail "CMake configuration failed"
+cmake --build build-pgo --target python_extension --clean-first > /dev/null || fail "Optimized build failed"
+
+echo
+echo "Step 5: Benchmarking Release against PGO + LTO..."
+"$PYTHON" "$BENCH" --path build-release --variants _pi_cffi --output build-release/bench.json \
+    || fail "Benchmark of the Release build failed"
+"$PYTHON" "$BENCH" --path build-pgo --variants _pi_cffi --output build-pgo/bench.json \
+    --compare build-release/bench.json --threshold "${PI_PGO_THRESHOLD:-0.10}"
+
+echo
+echo "Optimized build: build-pgo/ (library and _pi_cffi extension)"
+echo "Positive changes in samples/s and negative changes in ns/call are speedups."
@@ -3,19 +3,470 @@
 #include "pi_dll.h"
 #include <stdlib.h>
 #include <math.h>
+#include "pi_kernel.h"
+#include "pi_stats.h"
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <pthread.h>
+#include <unistd.h>
+#endif
+
+#ifdef PI_ENABLE_OPENMP
+#include <omp.h>
+#endif
+
+/* Private generator seeding.  Every call seeds its own lanes of the
+   vectorized kernel from a 64-bit seed, so concurrent callers never
+   share (or lock) libc's rand() state */
+static uint64_t splitmix64(uint64_t *x){
+
+  uint64_t z = (*x += 0x9E3779B97F4A7C15ULL);
+  z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+  z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+  return z ^ (z >> 31); }
+
+/* Counts the points of the unit square that land inside the quarter
+   circle, using the best SIMD kernel this CPU supports */
+static int64_t pi_count_hits(uint64_t seed, int64_t n){
+
+  pi_lanes lanes;
+
+  pi_lanes_seed(&lanes, seed);
+
+  return pi_kernel_count_hits(&lanes, n); }
+
+/* Seed for the unseeded entry points.  It is drawn from rand(), so
+   srand() still controls them, with four rand() calls per run
+   instead of two per sample */
+static uint64_t pi_rand_seed(void){
+
+  uint64_t seed = 0;
+  int i;
+
+  for(i=0;i<4;i++)
+    seed = (seed << 16) ^ (uint64_t)rand();
+
+  return seed; }
 
 /* Returns a very crude approximation of Pi
    given a int: a number of iteration */
 PI_API float pi_approx(int n){
 
-  double i,x,y,sum=0;
+  uint64_t start = pi_stats_now();
+  int64_t hits = pi_count_hits(pi_rand_seed(), n);
+
+  pi_stats_record(PI_STATS_APPROX, start, n, hits);
+  return 4*(float)hits/(float)n; }
+
+/* Reentrant variant of pi_approx: the same seed always gives the same
+   result, and calls from several threads run fully in parallel */
+PI_API float pi_approx_seeded(int n, uint64_t seed){
+
+  uint64_t start = pi_stats_now();
+  int64_t hits = pi_count_hits(seed, n);
+
+  pi_stats_record(PI_STATS_APPROX_SEEDED, start, n, hits);
+  return 4*(float)hits/(float)n; }
+
+/* Name of the sampling kernel picked at load time */
+PI_API const char *pi_simd_kernel(void){
+
+  return pi_kernel_name(); }
+
+/* Integer hit and sample counters plus the estimate in full double
+   precision; the counters are exact however large n gets */
+static pi_result pi_make_result(int64_t hits, int64_t n){
+
+  pi_result result;
+
+  result.hits = hits;
+  result.samples = n > 0 ? n : 0;
+  result.estimate = n > 0 ? 4*(double)hits/(double)n : 0.0;
+  return result; }
+
+/* 64-bit counterpart of pi_approx: n is not capped at INT_MAX and the
+   result is neither counted in a double nor rounded to a float */
+static pi_result pi_approx64_run(int entry, int64_t n, uint64_t seed){
+
+  uint64_t start = pi_stats_now();
+  pi_result result = pi_make_result(n > 0 ? pi_count_hits(seed, n) : 0, n);
+
+  pi_stats_record(entry, start, result.samples, result.hits);
+  return result; }
+
+PI_API pi_result pi_approx64(int64_t n){
+
+  return pi_approx64_run(PI_STATS_APPROX64, n, pi_rand_seed()); }
+
+PI_API pi_result pi_approx64_seeded(int64_t n, uint64_t seed){
+
+  return pi_approx64_run(PI_STATS_APPROX64_SEEDED, n, seed); }
+
+/* pi_approx_parallel draws its samples in fixed-size blocks, each with
+   its own stream seeded from (seed, block index).  The estimate therefore
+   depends only on n and seed, never on how many threads shared the work,
+   nor on whether the blocks run on OpenMP or on native threads */
+#define PI_BLOCK_SIZE 1048576
+#define PI_MAX_THREADS 256
+
+/* Thread count used when a caller passes threads <= 0; 0 means the
+   platform default (one per CPU, or OMP_NUM_THREADS with OpenMP) */
+static volatile int pi_default_threads = 0;
+
+static uint64_t pi_block_seed(uint64_t seed, int64_t block){
+
+  uint64_t x = seed ^ ((uint64_t)block * 0xD1B54A32D192ED03ULL);
+  return splitmix64(&x); }
+
+static int64_t pi_block_hits(uint64_t seed, int64_t n, int64_t block){
+
+  int64_t len = n - block*PI_BLOCK_SIZE;
+
+  if (len > PI_BLOCK_SIZE)
+    len = PI_BLOCK_SIZE;
+
+  return pi_count_hits(pi_block_seed(seed, block), len); }
+
+#ifdef PI_ENABLE_OPENMP
+PI_API int pi_get_num_threads(void){
+
+  return pi_default_threads > 0 ? pi_default_threads : omp_get_max_threads(); }
+
+/* OpenMP build: the blocks are shared out by the OpenMP runtime and the
+   hit counts combined with a reduction */
+static int64_t pi_parallel_hits(int64_t n, int threads, uint64_t seed){
+
+  int64_t nblocks = (n + PI_BLOCK_SIZE - 1) / PI_BLOCK_SIZE, hits = 0, b;
+
+  if (threads <= 0)
+    threads = pi_get_num_threads();
+  if (threads > nblocks)
+    threads = (int)nblocks;
+
+#pragma omp parallel for num_threads(threads) schedule(static) reduction(+:hits)
+  for(b=0;b<nblocks;b++)
+    hits += pi_block_hits(seed, n, b);
+
+  return hits; }
+#else
+typedef struct {
+  uint64_t seed;
+  int64_t n;
+  int64_t first_block, block_step;
+  int64_t hits;
+} pi_worker;
+
+static void pi_worker_run(pi_worker *w){
+
+  int64_t b, nblocks = (w->n + PI_BLOCK_SIZE - 1) / PI_BLOCK_SIZE;
+
+  w->hits = 0;
+
+  for(b=w->first_block;b<nblocks;b+=w->block_step)
+    w->hits += pi_block_hits(w->seed, w->n, b); }
+
+#ifdef _WIN32
+static DWORD WINAPI pi_worker_main(LPVOID arg){
+
+  pi_worker_run((pi_worker *)arg);
+  return 0; }
+
+static int pi_cpu_count(void){
+
+  SYSTEM_INFO info;
+  GetSystemInfo(&info);
+  return (int)info.dwNumberOfProcessors; }
+#else
+static void *pi_worker_main(void *arg){
+
+  pi_worker_run((pi_worker *)arg);
+  return NULL; }
+
+static int pi_cpu_count(void){
+
+  long count = sysconf(_SC_NPROCESSORS_ONLN);
+  return count > 0 ? (int)count : 1; }
+#endif
+
+PI_API int pi_get_num_threads(void){
+
+  return pi_default_threads > 0 ? pi_default_threads : pi_cpu_count(); }
+
+/* Splits n samples across native threads (threads <= 0 means
+   pi_get_num_threads()) and adds up the exact hit counts.  The
+   calling thread does its share of the work; a thread that cannot be
+   started runs inline */
+static int64_t pi_parallel_hits(int64_t n, int threads, uint64_t seed){
+
+  pi_worker workers[PI_MAX_THREADS];
+#ifdef _WIN32
+  HANDLE handles[PI_MAX_THREADS];
+#else
+  pthread_t handles[PI_MAX_THREADS];
+#endif
+  int started[PI_MAX_THREADS];
+  int64_t nblocks = (n + PI_BLOCK_SIZE - 1) / PI_BLOCK_SIZE, hits = 0;
+  int t;
+
+  if (threads <= 0)
+    threads = pi_get_num_threads();
+  if (threads > PI_MAX_THREADS)
+    threads = PI_MAX_THREADS;
+  if (threads > nblocks)
+    threads = (int)nblocks;
+
+  for(t=0;t<threads;t++){
+
+    workers[t].seed = seed;
+    workers[t].n = n;
+    workers[t].first_block = t;
+    workers[t].block_step = threads;
+    workers[t].hits = 0;
+    started[t] = 0; }
+
+  for(t=1;t<threads;t++){
+#ifdef _WIN32
+    handles[t] = CreateThread(NULL, 0, pi_worker_main, &workers[t], 0, NULL);
+    started[t] = handles[t] != NULL;
+#else
+    started[t] = pthread_create(&handles[t], NULL, pi_worker_main, &workers[t]) == 0;
+#endif
+    if (!started[t])
+      pi_worker_run(&workers[t]); }
+
+  pi_worker_run(&workers[0]);
+
+  for(t=0;t<threads;t++){
+
+    if (started[t]){
+#ifdef _WIN32
+      WaitForSingleObject(handles[t], INFINITE);
+      CloseHandle(handles[t]);
+#else
+      pthread_join(handles[t], NULL);
+#endif
+    }
+
+    hits += workers[t].hits; }
+
+  return hits; }
+#endif
+
+PI_API double pi_approx_parallel(int64_t n, int threads, uint64_t seed){
+
+  uint64_t start = pi_stats_now();
+  int64_t hits;
+
+  if (n <= 0){
+    pi_stats_record(PI_STATS_APPROX_PARALLEL, start, 0, 0);
+    return 0.0; }
+
+  hits = pi_parallel_hits(n, threads, seed);
+
+  pi_stats_record(PI_STATS_APPROX_PARALLEL, start, n, hits);
+  return 4*(double)hits/(double)n; }
+
+/* Sets the thread count pi_approx_parallel uses when called with
+   threads <= 0; a value <= 0 restores the platform default */
+PI_API void pi_set_num_threads(int threads){
+
+  pi_default_threads = threads > 0 ? threads : 0; }
+
+/* Inverse of the standard normal CDF (Acklam's rational approximation,
+   relative error below 1.2e-9), used to turn a confidence level into
+   the z factor of an interval */
+static double pi_normal_quantile(double p){
+
+  static const double a[] = {-3.969683028665376e+01, 2.209460984245205e+02,
+                             -2.759285104469687e+02, 1.383577518672690e+02,
+                             -3.066479806614716e+01, 2.506628277459239e+00};
+  static const double b[] = {-5.447609879822406e+01, 1.615858368580409e+02,
+                             -1.556989798598866e+02, 6.680131188771972e+01,
+                             -1.328068155288572e+01};
+  static const double c[] = {-7.784894002430293e-03, -3.223964580411365e-01,
+                             -2.400758277161838e+00, -2.549732539343734e+00,
+                              4.374664141464968e+00, 2.938163982698783e+00};
+  static const double d[] = { 7.784695709041462e-03, 3.224671290700398e-01,
+                              2.445134137142996e+00, 3.754408661907416e+00};
+  double q, r;
+
+  if (p <= 0.0)
+    return -HUGE_VAL;
+  if (p >= 1.0)
+    return HUGE_VAL;
+
+  if (p < 0.02425){
+    q = sqrt(-2*log(p));
+    return (((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) /
+           ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1); }
+
+  if (p > 1 - 0.02425){
+    q = sqrt(-2*log(1-p));
+    return -(((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) /
+            ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1); }
+
+  q = p - 0.5;
+  r = q*q;
+  return (((((a[0]*r+a[1])*r+a[2])*r+a[3])*r+a[4])*r+a[5])*q /
+         (((((b[0]*r+b[1])*r+b[2])*r+b[3])*r+b[4])*r+1); }
+
+/* Adaptive precision: samples in chunks until the half-width of the
+   confidence interval drops to tolerance, or max_samples is reached.
+   The Bernoulli variance p*(1-p) is known exactly from the running
+   counters, so each chunk is sized to what the current variance says
+   is still missing (at least PI_UNTIL_MIN_CHUNK, at most doubling the
+   run so far so that a poor early variance cannot overshoot far) */
+#define PI_UNTIL_MIN_CHUNK 16384
+
+static pi_until_result pi_until_run(double tolerance, double confidence, int64_t max_samples, uint64_t seed){
+
+  pi_until_result result;
+  double p, missing, z = pi_normal_quantile(0.5 + confidence/2);
+  int64_t hits = 0, samples = 0, chunk = PI_UNTIL_MIN_CHUNK, index = 0;
+
+  result.half_width = HUGE_VAL;
+
+  while (samples < max_samples){
+
+    if (chunk > max_samples - samples)
+      chunk = max_samples - samples;
+
+    hits += pi_count_hits(pi_block_seed(seed, index++), chunk);
+    samples += chunk;
+
+    p = (double)hits/(double)samples;
+    result.half_width = z*4*sqrt(p*(1-p)/(double)samples);
+
+    if (result.half_width <= tolerance)
+      break;
+
+    missing = 16*z*z*p*(1-p)/(tolerance*tolerance) - (double)samples;
+
+    if (missing < PI_UNTIL_MIN_CHUNK)
+      chunk = PI_UNTIL_MIN_CHUNK;
+    else if (missing > (double)samples)
+      chunk = samples;
+    else
+      chunk = (int64_t)ceil(missing); }
+
+  result.hits = hits;
+  result.samples = samples;
+  result.estimate = samples > 0 ? 4*(double)hits/(double)samples : 0.0;
+  result.converged = result.half_width <= tolerance;
+  return result; }
+
+PI_API pi_until_result pi_approx_until_seeded(double tolerance, double confidence, int64_t max_samples, uint64_t seed){
+
+  uint64_t start = pi_stats_now();
+  pi_until_result result = pi_until_run(tolerance, confidence, max_samples, seed);
+
+  pi_stats_record(PI_STATS_APPROX_UNTIL_SEEDED, start, result.samples, result.hits);
+  return result; }
+
+PI_API pi_until_result pi_approx_until(double tolerance, double confidence, int64_t max_samples){
+
+  uint64_t start = pi_stats_now();
+  pi_until_result result = pi_until_run(tolerance, confidence, max_samples, pi_rand_seed());
+
+  pi_stats_record(PI_STATS_APPROX_UNTIL, start, result.samples, result.hits);
+  return result; }
+
+/* Quasi-Monte Carlo sampling.  Points come from a low-discrepancy
+   sequence instead of the generator, so the error shrinks close to 1/n
+   rather than 1/sqrt(n).  Sobol points use the 2-D direction numbers
+   (van der Corput in x, the x+1 polynomial in y) generated in Gray-code
+   order; Halton points use bases 2 and 3.  Scrambling randomizes the
+   sequence while keeping its uniformity: a random digital shift (XOR)
+   for Sobol, a random Cranley-Patterson rotation for Halton */
+static double pi_qmc_unit(uint64_t bits){
+
+  return (double)(bits >> 11) * (1.0 / 9007199254740992.0); }
+
+static int64_t pi_count_hits_sobol(int64_t n, int scramble, uint64_t seed){
+
+  uint64_t v0[64], v1[64], x0, x1;
+  int64_t i, hits = 0;
+  double x, y;
+  int k, c;
+
+  for(k=0;k<64;k++){
+
+    v0[k] = 1ULL << (63 - k);
+    v1[k] = k == 0 ? v0[0] : v1[k-1] ^ (v1[k-1] >> 1); }
+
+  x0 = scramble ? splitmix64(&seed) : 0;
+  x1 = scramble ? splitmix64(&seed) : 0;
+
+  for(i=0;i<n;i++){
+
+    x = pi_qmc_unit(x0);
+    y = pi_qmc_unit(x1);
+
+    hits += (x*x + y*y < 1.0);
+
+    /* next point: flip the direction of the lowest zero bit of i */
+    for(c=0;(uint64_t)i >> c & 1;c++)
+      ;
+    x0 ^= v0[c];
+    x1 ^= v1[c]; }
+
+  return hits; }
+
+/* Halton radical inverses are advanced incrementally, in exact integer
+   arithmetic: base 2 as a bit-reversed counter, base 3 as 40 ternary
+   digits scaled by 3^40 (just below 2^64) */
+#define PI_HALTON3_DIGITS 40
+
+static int64_t pi_count_hits_halton(int64_t n, int scramble, uint64_t seed){
+
+  uint64_t bits2 = 0, value3 = 0, mask, power3[PI_HALTON3_DIGITS];
+  unsigned char digits3[PI_HALTON3_DIGITS] = {0};
+  int64_t i, hits = 0;
+  double x, y, shift_x = 0.0, shift_y = 0.0, scale3;
+  int k;
+
+  for(k=PI_HALTON3_DIGITS-1,mask=1;k>=0;k--,mask*=3)
+    power3[k] = mask;
+  scale3 = 1.0 / ((double)power3[0] * 3.0);
+
+  if (scramble){
+    shift_x = pi_qmc_unit(splitmix64(&seed));
+    shift_y = pi_qmc_unit(splitmix64(&seed)); }
 
   for(i=0;i<n;i++){
 
-    x=rand();
-    y=rand();
+    x = pi_qmc_unit(bits2) + shift_x;
+    y = (double)value3 * scale3 + shift_y;
+    if (x >= 1.0) x -= 1.0;
+    if (y >= 1.0) y -= 1.0;
+
+    hits += (x*x + y*y < 1.0);
+
+    /* add one to the index, carrying from the most significant bit
+       of the mirrored value downwards */
+    for(mask=1ULL<<63;bits2 & mask;mask>>=1)
+      bits2 ^= mask;
+    bits2 |= mask;
+
+    for(k=0;k<PI_HALTON3_DIGITS && digits3[k]==2;k++){
+      digits3[k] = 0;
+      value3 -= 2*power3[k]; }
+    if (k < PI_HALTON3_DIGITS){
+      digits3[k]++;
+      value3 += power3[k]; } }
+
+  return hits; }
+
+PI_API pi_result pi_approx_qmc(int64_t n, pi_qmc_sequence sequence, int scramble, uint64_t seed){
+
+  uint64_t start = pi_stats_now();
+  int64_t hits = 0;
 
-    if (sqrt(x*x+y*y) < sqrt((double)RAND_MAX*RAND_MAX))
-      sum++; }
+  if (n > 0)
+    hits = sequence == PI_QMC_HALTON ? pi_count_hits_halton(n, scramble, seed)
+                                     : pi_count_hits_sobol(n, scramble, seed);
 
-  return 4*(float)sum/(float)n; }
+  pi_stats_record(PI_STATS_APPROX_QMC, start, n, hits);
+  return pi_make_result(hits, n); }
@@ -0,0 +1,189 @@
+/* filename: pi_kernel.c - scalar kernel and runtime CPU dispatch */
+#include <stdlib.h>
+#include <string.h>
+#include "pi_kernel.h"
+
+#if defined(PI_KERNEL_X86) && defined(_MSC_VER)
+#include <intrin.h>
+#include <immintrin.h>
+#endif
+
+static uint64_t pi_kernel_splitmix64(uint64_t *x){
+
+  uint64_t z = (*x += 0x9E3779B97F4A7C15ULL);
+  z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+  z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+  return z ^ (z >> 31); }
+
+void pi_lanes_seed(pi_lanes *lanes, uint64_t seed){
+
+  int k;
+
+  for(k=0;k<PI_KERNEL_LANES;k++){
+
+    lanes->s0[k] = pi_kernel_splitmix64(&seed);
+    lanes->s1[k] = pi_kernel_splitmix64(&seed); } }
+
+static uint64_t pi_lane_next(pi_lanes *lanes, int k){
+
+  uint64_t s1 = lanes->s0[k];
+  const uint64_t s0 = lanes->s1[k];
+  lanes->s0[k] = s0;
+  s1 ^= s1 << 23;
+  lanes->s1[k] = s1 ^ s0 ^ (s1 >> 17) ^ (s0 >> 26);
+  return lanes->s1[k] + s0; }
+
+/* Uniform double in [0, 1) taken from the top 52 bits: the exponent of
+   1.0 is or-ed in and 1.0 subtracted, which SIMD code can do too */
+static double pi_lane_unit(pi_lanes *lanes, int k){
+
+  uint64_t bits = (pi_lane_next(lanes, k) >> 12) | 0x3FF0000000000000ULL;
+  double d;
+  memcpy(&d, &bits, sizeof d);
+  return d - 1.0; }
+
+/* Finishes the n < PI_KERNEL_LANES samples a vector loop leaves over,
+   one on each of the first n lanes */
+int64_t pi_kernel_tail(pi_lanes *lanes, int64_t n){
+
+  int64_t hits = 0;
+  double x, y;
+  int k;
+
+  for(k=0;k<n;k++){
+
+    x = pi_lane_unit(lanes, k);
+    y = pi_lane_unit(lanes, k);
+
+    hits += (x*x + y*y < 1.0); }
+
+  return hits; }
+
+int64_t pi_kernel_count_hits_scalar(pi_lanes *lanes, int64_t n){
+
+  int64_t i, steps = n / PI_KERNEL_LANES, hits = 0;
+  double x, y;
+  int k;
+
+  for(i=0;i<steps;i++){
+
+    for(k=0;k<PI_KERNEL_LANES;k++){
+
+      x = pi_lane_unit(lanes, k);
+      y = pi_lane_unit(lanes, k);
+
+      hits += (x*x + y*y < 1.0); } }
+
+  return hits + pi_kernel_tail(lanes, n % PI_KERNEL_LANES); }
+
+/* Runtime dispatch.  The kernel is resolved once, from CPUID, when the
+   library is loaded (or on first use where load-time constructors are
+   not available).  Setting PI_SIMD_KERNEL to scalar, sse2, avx2 or
+   avx512 forces a kernel, as long as the CPU supports it */
+typedef struct {
+  const char *name;
+  pi_kernel_fn fn;
+  int supported;
+} pi_kernel_entry;
+
+static pi_kernel_fn volatile pi_kernel_selected = NULL;
+static const char *pi_kernel_selected_name = "scalar";
+
+static void pi_kernel_cpu_features(int *sse2, int *avx2, int *avx512){
+
+  *sse2 = *avx2 = *avx512 = 0;
+
+#if defined(PI_KERNEL_X86) && defined(__GNUC__)
+  __builtin_cpu_init();
+  *sse2 = __builtin_cpu_supports("sse2");
+  *avx2 = __builtin_cpu_supports("avx2");
+  *avx512 = __builtin_cpu_supports("avx512f");
+#elif defined(PI_KERNEL_X86) && defined(_MSC_VER)
+  {
+    int info[4];
+    int ymm = 0, zmm = 0;
+    unsigned long long xcr0;
+
+    __cpuid(info, 0);
+    if (info[0] < 7)
+      return;
+
+    __cpuid(info, 1);
+    *sse2 = (info[3] >> 26) & 1;
+
+    /* the OS must save the wider registers before they can be used */
+    if (((info[2] >> 27) & 1) && ((info[2] >> 28) & 1)){
+
+      xcr0 = _xgetbv(0);
+      ymm = (xcr0 & 0x06) == 0x06;
+      zmm = (xcr0 & 0xE6) == 0xE6; }
+
+    __cpuidex(info, 7, 0);
+    *avx2 = ymm && ((info[1] >> 5) & 1);
+    *avx512 = zmm && ((info[1] >> 16) & 1);
+  }
+#endif
+}
+
+static void pi_kernel_resolve(void){
+
+  pi_kernel_entry kernels[4];
+  int count = 0, sse2, avx2, avx512, i;
+  const char *forced = getenv("PI_SIMD_KERNEL");
+  pi_kernel_entry *chosen = NULL;
+
+  pi_kernel_cpu_features(&sse2, &avx2, &avx512);
+
+  /* best first */
+#ifdef PI_KERNEL_X86
+  kernels[count].name = "avx512";
+  kernels[count].fn = pi_kernel_count_hits_avx512;
+  kernels[count++].supported = avx512;
+  kernels[count].name = "avx2";
+  kernels[count].fn = pi_kernel_count_hits_avx2;
+  kernels[count++].supported = avx2;
+  kernels[count].name = "sse2";
+  kernels[count].fn = pi_kernel_count_hits_sse2;
+  kernels[count++].supported = sse2;
+#else
+  (void)sse2; (void)avx2; (void)avx512;
+#endif
+  kernels[count].name = "scalar";
+  kernels[count].fn = pi_kernel_count_hits_scalar;
+  kernels[count++].supported = 1;
+
+  for(i=0;i<count && !chosen;i++)
+    if (kernels[i].supported && (!forced || !*forced || strcmp(forced, kernels[i].name) == 0))
+      chosen = &kernels[i];
+
+  /* unknown or unsupported override: fall back to the best kernel */
+  for(i=0;i<count && !chosen;i++)
+    if (kernels[i].supported)
+      chosen = &kernels[i];
+
+  pi_kernel_selected_name = chosen->name;
+  pi_kernel_selected = chosen->fn; }
+
+#if defined(__GNUC__)
+__attribute__((constructor))
+static void pi_kernel_init(void){
+
+  pi_kernel_resolve(); }
+#endif
+
+int64_t pi_kernel_count_hits(pi_lanes *lanes, int64_t n){
+
+  pi_kernel_fn fn = pi_kernel_selected;
+
+  if (!fn){
+    pi_kernel_resolve();
+    fn = pi_kernel_selected; }
+
+  return fn(lanes, n); }
+
+const char *pi_kernel_name(void){
+
+  if (!pi_kernel_selected)
+    pi_kernel_resolve();
+
+  return pi_kernel_selected_name; }
@@ -0,0 +1,32 @@
+/* filename: pi_kernel.h - vectorized sampling kernels (internal) */
+#ifndef PI_KERNEL_H
+#define PI_KERNEL_H
+
+#include <stdint.h>
+
+/* Every kernel advances the same eight interleaved xorshift128+ streams
+   and draws one point per lane and step, so all instruction sets give
+   bit-identical hit counts for the same seed */
+#define PI_KERNEL_LANES 8
+
+typedef struct {
+  uint64_t s0[PI_KERNEL_LANES];
+  uint64_t s1[PI_KERNEL_LANES];
+} pi_lanes;
+
+typedef int64_t (*pi_kernel_fn)(pi_lanes *lanes, int64_t n);
+
+void pi_lanes_seed(pi_lanes *lanes, uint64_t seed);
+int64_t pi_kernel_tail(pi_lanes *lanes, int64_t n);
+
+int64_t pi_kernel_count_hits(pi_lanes *lanes, int64_t n);
+const char *pi_kernel_name(void);
+
+int64_t pi_kernel_count_hits_scalar(pi_lanes *lanes, int64_t n);
+#ifdef PI_KERNEL_X86
+int64_t pi_kernel_count_hits_sse2(pi_lanes *lanes, int64_t n);
+int64_t pi_kernel_count_hits_avx2(pi_lanes *lanes, int64_t n);
+int64_t pi_kernel_count_hits_avx512(pi_lanes *lanes, int64_t n);
+#endif
+
+#endif /* PI_KERNEL_H */
@@ -0,0 +1,52 @@
+/* filename: pi_kernel_avx2.c - AVX2 sampling kernel, 4 lanes per register */
+#include <immintrin.h>
+#include "pi_kernel.h"
+
+static __m256i pi_avx2_next(__m256i *s0, __m256i *s1){
+
+  __m256i a = *s0;
+  const __m256i b = *s1;
+  *s0 = b;
+  a = _mm256_xor_si256(a, _mm256_slli_epi64(a, 23));
+  *s1 = _mm256_xor_si256(_mm256_xor_si256(a, b),
+                         _mm256_xor_si256(_mm256_srli_epi64(a, 17), _mm256_srli_epi64(b, 26)));
+  return _mm256_add_epi64(*s1, b); }
+
+static __m256d pi_avx2_unit(__m256i bits){
+
+  bits = _mm256_or_si256(_mm256_srli_epi64(bits, 12), _mm256_set1_epi64x(0x3FF0000000000000LL));
+  return _mm256_sub_pd(_mm256_castsi256_pd(bits), _mm256_set1_pd(1.0)); }
+
+int64_t pi_kernel_count_hits_avx2(pi_lanes *lanes, int64_t n){
+
+  __m256i s0[2], s1[2], hits[2];
+  __m256d x, y, inside;
+  const __m256d one = _mm256_set1_pd(1.0);
+  int64_t i, steps = n / PI_KERNEL_LANES, total = 0, partial[4];
+  int q;
+
+  for(q=0;q<2;q++){
+
+    s0[q] = _mm256_loadu_si256((const __m256i *)&lanes->s0[4*q]);
+    s1[q] = _mm256_loadu_si256((const __m256i *)&lanes->s1[4*q]);
+    hits[q] = _mm256_setzero_si256(); }
+
+  for(i=0;i<steps;i++){
+
+    for(q=0;q<2;q++){
+
+      x = pi_avx2_unit(pi_avx2_next(&s0[q], &s1[q]));
+      y = pi_avx2_unit(pi_avx2_next(&s0[q], &s1[q]));
+      inside = _mm256_cmp_pd(_mm256_add_pd(_mm256_mul_pd(x, x), _mm256_mul_pd(y, y)), one, _CMP_LT_OQ);
+
+      /* an all-ones mask is -1, so subtracting it counts a hit */
+      hits[q] = _mm256_sub_epi64(hits[q], _mm256_castpd_si256(inside)); } }
+
+  for(q=0;q<2;q++){
+
+    _mm256_storeu_si256((__m256i *)&lanes->s0[4*q], s0[q]);
+    _mm256_storeu_si256((__m256i *)&lanes->s1[4*q], s1[q]);
+    _mm256_storeu_si256((__m256i *)partial, hits[q]);
+    total += partial[0] + partial[1] + partial[2] + partial[3]; }
+
+  return total + pi_kernel_tail(lanes, n % PI_KERNEL_LANES); }
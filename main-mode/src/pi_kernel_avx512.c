@@ -0,0 +1,44 @@
+/* filename: pi_kernel_avx512.c - AVX-512 sampling kernel, 8 lanes per register */
+#include <immintrin.h>
+#include "pi_kernel.h"
+
+static __m512i pi_avx512_next(__m512i *s0, __m512i *s1){
+
+  __m512i a = *s0;
+  const __m512i b = *s1;
+  *s0 = b;
+  a = _mm512_xor_si512(a, _mm512_slli_epi64(a, 23));
+  *s1 = _mm512_xor_si512(_mm512_xor_si512(a, b),
+                         _mm512_xor_si512(_mm512_srli_epi64(a, 17), _mm512_srli_epi64(b, 26)));
+  return _mm512_add_epi64(*s1, b); }
+
+static __m512d pi_avx512_unit(__m512i bits){
+
+  bits = _mm512_or_si512(_mm512_srli_epi64(bits, 12), _mm512_set1_epi64(0x3FF0000000000000LL));
+  return _mm512_sub_pd(_mm512_castsi512_pd(bits), _mm512_set1_pd(1.0)); }
+
+int64_t pi_kernel_count_hits_avx512(pi_lanes *lanes, int64_t n){
+
+  __m512i s0, s1, hits = _mm512_setzero_si512();
+  const __m512i ones = _mm512_set1_epi64(1);
+  const __m512d one = _mm512_set1_pd(1.0);
+  __m512d x, y;
+  __mmask8 inside;
+  int64_t i, steps = n / PI_KERNEL_LANES, total;
+
+  s0 = _mm512_loadu_si512((const void *)lanes->s0);
+  s1 = _mm512_loadu_si512((const void *)lanes->s1);
+
+  for(i=0;i<steps;i++){
+
+    x = pi_avx512_unit(pi_avx512_next(&s0, &s1));
+    y = pi_avx512_unit(pi_avx512_next(&s0, &s1));
+    inside = _mm512_cmp_pd_mask(_mm512_add_pd(_mm512_mul_pd(x, x), _mm512_mul_pd(y, y)), one, _CMP_LT_OQ);
+
+    hits = _mm512_mask_add_epi64(hits, inside, hits, ones); }
+
+  _mm512_storeu_si512((void *)lanes->s0, s0);
+  _mm512_storeu_si512((void *)lanes->s1, s1);
+  total = _mm512_reduce_add_epi64(hits);
+
+  return total + pi_kernel_tail(lanes, n % PI_KERNEL_LANES); }
@@ -0,0 +1,52 @@
+/* filename: pi_kernel_sse2.c - SSE2 sampling kernel, 2 lanes per register */
+#include <emmintrin.h>
+#include "pi_kernel.h"
+
+static __m128i pi_sse2_next(__m128i *s0, __m128i *s1){
+
+  __m128i a = *s0;
+  const __m128i b = *s1;
+  *s0 = b;
+  a = _mm_xor_si128(a, _mm_slli_epi64(a, 23));
+  *s1 = _mm_xor_si128(_mm_xor_si128(a, b),
+                      _mm_xor_si128(_mm_srli_epi64(a, 17), _mm_srli_epi64(b, 26)));
+  return _mm_add_epi64(*s1, b); }
+
+static __m128d pi_sse2_unit(__m128i bits){
+
+  bits = _mm_or_si128(_mm_srli_epi64(bits, 12), _mm_set1_epi64x(0x3FF0000000000000LL));
+  return _mm_sub_pd(_mm_castsi128_pd(bits), _mm_set1_pd(1.0)); }
+
+int64_t pi_kernel_count_hits_sse2(pi_lanes *lanes, int64_t n){
+
+  __m128i s0[4], s1[4], hits[4];
+  __m128d x, y, inside;
+  const __m128d one = _mm_set1_pd(1.0);
+  int64_t i, steps = n / PI_KERNEL_LANES, total = 0, partial[2];
+  int q;
+
+  for(q=0;q<4;q++){
+
+    s0[q] = _mm_loadu_si128((const __m128i *)&lanes->s0[2*q]);
+    s1[q] = _mm_loadu_si128((const __m128i *)&lanes->s1[2*q]);
+    hits[q] = _mm_setzero_si128(); }
+
+  for(i=0;i<steps;i++){
+
+    for(q=0;q<4;q++){
+
+      x = pi_sse2_unit(pi_sse2_next(&s0[q], &s1[q]));
+      y = pi_sse2_unit(pi_sse2_next(&s0[q], &s1[q]));
+      inside = _mm_cmplt_pd(_mm_add_pd(_mm_mul_pd(x, x), _mm_mul_pd(y, y)), one);
+
+      /* an all-ones mask is -1, so subtracting it counts a hit */
+      hits[q] = _mm_sub_epi64(hits[q], _mm_castpd_si128(inside)); } }
+
+  for(q=0;q<4;q++){
+
+    _mm_storeu_si128((__m128i *)&lanes->s0[2*q], s0[q]);
+    _mm_storeu_si128((__m128i *)&lanes->s1[2*q], s1[q]);
+    _mm_storeu_si128((__m128i *)partial, hits[q]);
+    total += partial[0] + partial[1]; }
+
+  return total + pi_kernel_tail(lanes, n % PI_KERNEL_LANES); }
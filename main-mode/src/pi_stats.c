@@ -0,0 +1,160 @@
+/* filename: pi_stats.c - per-entry-point call counters */
+#if !defined(_WIN32) && !defined(_POSIX_C_SOURCE)
+#define _POSIX_C_SOURCE 199309L
+#endif
+
+#include <string.h>
+#ifdef BUILDING_PI_DLL
+#include "pi_dll.h"
+#else
+#include "pi.h"
+#ifndef PI_API
+#define PI_API
+#endif
+#endif
+#include "pi_stats.h"
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
+/* Relaxed atomics: the counters are only ever added to, so no ordering
+   with the surrounding code is needed and an update costs one locked
+   add, with no lock and no system call */
+#ifdef _MSC_VER
+#include <intrin.h>
+#define PI_ATOMIC_ADD(p, v) _InterlockedExchangeAdd64((volatile __int64 *)(p), (__int64)(v))
+#define PI_ATOMIC_LOAD(p) ((uint64_t)_InterlockedOr64((volatile __int64 *)(p), 0))
+#define PI_ATOMIC_EXCHANGE(p, v) ((uint64_t)_InterlockedExchange64((volatile __int64 *)(p), (__int64)(v)))
+#define PI_ATOMIC_STORE_INT(p, v) _InterlockedExchange((volatile long *)(p), (long)(v))
+#define PI_ATOMIC_LOAD_INT(p) (*(volatile long *)(p))
+#else
+#define PI_ATOMIC_ADD(p, v) __atomic_fetch_add((p), (uint64_t)(v), __ATOMIC_RELAXED)
+#define PI_ATOMIC_LOAD(p) __atomic_load_n((p), __ATOMIC_RELAXED)
+#define PI_ATOMIC_EXCHANGE(p, v) __atomic_exchange_n((p), (uint64_t)(v), __ATOMIC_RELAXED)
+#define PI_ATOMIC_STORE_INT(p, v) __atomic_store_n((p), (v), __ATOMIC_RELAXED)
+#define PI_ATOMIC_LOAD_INT(p) __atomic_load_n((p), __ATOMIC_RELAXED)
+#endif
+
+/* One cache line per entry point, so that threads busy in different
+   entry points never contend for the same line */
+typedef struct {
+  uint64_t calls;
+  uint64_t samples;
+  uint64_t hits;
+  uint64_t nanoseconds;
+  uint64_t pad[4];
+} pi_stats_counter;
+
+static pi_stats_counter pi_counters[PI_STATS_ENTRIES];
+#ifdef _MSC_VER
+static long pi_stats_on = 1;
+#else
+static int pi_stats_on = 1;
+#endif
+
+static const char *const pi_stats_names[PI_STATS_ENTRIES] = {
+  "pi_approx",
+  "pi_approx_seeded",
+  "pi_approx_parallel",
+  "pi_approx64",
+  "pi_approx64_seeded",
+  "pi_approx_until",
+  "pi_approx_until_seeded",
+  "pi_approx_qmc",
+  "pi_series_digits"
+};
+
+/* Monotonic clock in nanoseconds */
+uint64_t pi_stats_now(void){
+
+#ifdef _WIN32
+  static LARGE_INTEGER frequency;
+  LARGE_INTEGER now;
+
+  if (!PI_ATOMIC_LOAD_INT(&pi_stats_on))
+    return 0;
+  if (frequency.QuadPart == 0)
+    QueryPerformanceFrequency(&frequency);
+  QueryPerformanceCounter(&now);
+  return (uint64_t)(now.QuadPart / frequency.QuadPart) * 1000000000ULL +
+         (uint64_t)(now.QuadPart % frequency.QuadPart) * 1000000000ULL / (uint64_t)frequency.QuadPart;
+#else
+  struct timespec now;
+
+  if (!PI_ATOMIC_LOAD_INT(&pi_stats_on))
+    return 0;
+  clock_gettime(CLOCK_MONOTONIC, &now);
+  return (uint64_t)now.tv_sec * 1000000000ULL + (uint64_t)now.tv_nsec;
+#endif
+}
+
+void pi_stats_record(int entry, uint64_t start, int64_t samples, int64_t hits){
+
+  pi_stats_counter *counter = &pi_counters[entry];
+  uint64_t end;
+
+  /* start is 0 when counting was off as the call began */
+  if (start == 0 || !PI_ATOMIC_LOAD_INT(&pi_stats_on))
+    return;
+
+  end = pi_stats_now();
+
+  PI_ATOMIC_ADD(&counter->calls, 1);
+  if (samples > 0)
+    PI_ATOMIC_ADD(&counter->samples, samples);
+  if (hits > 0)
+    PI_ATOMIC_ADD(&counter->hits, hits);
+  if (end > start)
+    PI_ATOMIC_ADD(&counter->nanoseconds, end - start); }
+
+/* Copies every counter into out.  Each counter is read atomically; the
+   set as a whole is not, so a call finishing meanwhile may show up in
+   some counters of its entry point and not yet in others */
+PI_API void pi_stats_snapshot(pi_stats *out){
+
+  int i;
+
+  for(i=0;i<PI_STATS_ENTRIES;i++){
+
+    out->entries[i].calls = PI_ATOMIC_LOAD(&pi_counters[i].calls);
+    out->entries[i].samples = PI_ATOMIC_LOAD(&pi_counters[i].samples);
+    out->entries[i].hits = PI_ATOMIC_LOAD(&pi_counters[i].hits);
+    out->entries[i].nanoseconds = PI_ATOMIC_LOAD(&pi_counters[i].nanoseconds); } }
+
+/* Zeroes every counter.  When previous is not NULL it receives the
+   values that were cleared, so that periodic readers lose no update
+   between reading and resetting */
+PI_API void pi_stats_reset(pi_stats *previous){
+
+  pi_stats cleared;
+  int i;
+
+  for(i=0;i<PI_STATS_ENTRIES;i++){
+
+    cleared.entries[i].calls = PI_ATOMIC_EXCHANGE(&pi_counters[i].calls, 0);
+    cleared.entries[i].samples = PI_ATOMIC_EXCHANGE(&pi_counters[i].samples, 0);
+    cleared.entries[i].hits = PI_ATOMIC_EXCHANGE(&pi_counters[i].hits, 0);
+    cleared.entries[i].nanoseconds = PI_ATOMIC_EXCHANGE(&pi_counters[i].nanoseconds, 0); }
+
+  if (previous != NULL)
+    memcpy(previous, &cleared, sizeof cleared); }
+
+/* Switches counting on (the default) or off, returning the previous
+   setting; while off the entry points skip the clock reads entirely */
+PI_API int pi_stats_enable(int enabled){
+
+  int previous = PI_ATOMIC_LOAD_INT(&pi_stats_on) != 0;
+
+  PI_ATOMIC_STORE_INT(&pi_stats_on, enabled != 0);
+  return previous; }
+
+/* Name of the entry point counted in entries[entry], or NULL */
+PI_API const char *pi_stats_entry_name(int entry){
+
+  if (entry < 0 || entry >= PI_STATS_ENTRIES)
+    return NULL;
+
+  return pi_stats_names[entry]; }
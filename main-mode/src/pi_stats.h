@@ -0,0 +1,13 @@
+/* filename: pi_stats.h - per-entry-point call counters (internal) */
+#ifndef PI_STATS_INTERNAL_H
+#define PI_STATS_INTERNAL_H
+
+#include <stdint.h>
+
+/* Every public entry point reads the clock on entry and hands the start
+   time, the samples it drew and the hits it counted to pi_stats_record
+   on exit.  Both are no-ops while counting is switched off */
+uint64_t pi_stats_now(void);
+void pi_stats_record(int entry, uint64_t start, int64_t samples, int64_t hits);
+
+#endif /* PI_STATS_INTERNAL_H */